@@ -1,18 +1,16 @@
 import logging
 from typing import Any, Dict, List
 
-from lark import Lark, LarkError
+from lark import LarkError
+from odd_collector_sdk.grammar_parser import parse_cache
 from odd_models.models import DataSetField, DataSetFieldType
 from oddrn_generator import AthenaGenerator
 
 from .athena_field_type_transformer import AthenaFieldTypeTransformer
 
 athena_field_type_transformer = AthenaFieldTypeTransformer()
-parser = Lark.open(
-    "grammar/athena_field_type_grammar.lark",
-    rel_to=__file__,
-    parser="lalr",
-    start="type",
+parser = parse_cache.LazyParser(
+    "grammar/athena_field_type_grammar.lark", rel_to=__file__, parser="lalr"
 )
 
 TYPES_ATHENA_TO_ODD = {
@@ -39,7 +37,7 @@ TYPES_ATHENA_TO_ODD = {
 
 
 def __parse(field_type: str) -> Dict[str, Any]:
-    column_tree = parser.parse(field_type)
+    column_tree = parse_cache.parse(parser, field_type)
     return athena_field_type_transformer.transform(column_tree)
 
 
@@ -1,12 +1,12 @@
 from itertools import chain
-from typing import Any, Dict, Iterable
+from typing import Any, Dict, Iterable, Iterator
 
 import boto3
 from more_itertools import chunked, flatten
 from odd_collector_aws.domain.paginator_config import PaginatorConfig
 from odd_collector_aws.domain.plugin import GluePlugin
-from odd_collector_sdk.domain.adapter import AbstractAdapter
-from odd_models.models import DataEntity, DataEntityList
+from odd_collector_sdk.domain.adapter import StreamingAdapter
+from odd_models.models import DataEntity
 from oddrn_generator import GlueGenerator
 
 from .mappers.columns import map_column_stats
@@ -18,7 +18,7 @@ SDK_DATASET_COL_STATS_MAX_RESULTS = 100
 SDK_DATA_TRANSFORMERS_MAX_RESULTS = 100
 
 
-class Adapter(AbstractAdapter):
+class Adapter(StreamingAdapter):
     def __init__(self, config: GluePlugin) -> None:
         self._glue_client = boto3.client(
             "glue",
@@ -41,20 +41,15 @@ class Adapter(AbstractAdapter):
     def get_data_source_oddrn(self) -> str:
         return self._oddrn_generator.get_data_source_oddrn()
 
-    def get_data_entities(self) -> Iterable[DataEntity]:
-        return flatten([self.__get_tables(dn) for dn in self.__get_database_names()])
-
-    def get_data_entity_list(self) -> DataEntityList:
-        items = chain(
-            self.get_data_entities(),
+    def get_data_entities(self) -> Iterator[DataEntity]:
+        return chain(
+            self.get_tables(),
             self.get_transformers(),
             self.get_transformers_runs(),
         )
 
-        return DataEntityList(
-            data_source_oddrn=self.get_data_source_oddrn(),
-            items=list(items),
-        )
+    def get_tables(self) -> Iterable[DataEntity]:
+        return flatten(self.__get_tables(dn) for dn in self.__get_database_names())
 
     def get_transformers(self) -> Iterable[DataEntity]:
         return self.__fetch_paginator(
@@ -73,7 +68,7 @@ class Adapter(AbstractAdapter):
     ) -> Iterable[DataEntity]:
         if transformer is None:
             return flatten(
-                [self.get_transformers_runs(t) for t in self.get_transformers()]
+                self.get_transformers_runs(t) for t in self.get_transformers()
             )
 
         return self.__fetch_paginator(
@@ -111,7 +106,7 @@ class Adapter(AbstractAdapter):
             )
         )
 
-        return [self.__process_table_raw_data(rt) for rt in raw_tables]
+        return (self.__process_table_raw_data(rt) for rt in raw_tables)
 
     def __fetch_paginator(self, conf: PaginatorConfig) -> Iterable:
         paginator = self._glue_client.get_paginator(operation_name=conf.op_name)
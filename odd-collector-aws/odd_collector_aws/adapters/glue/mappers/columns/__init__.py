@@ -1,7 +1,8 @@
 import logging
 from typing import Any, Dict, Iterable, List, Tuple
 
-from lark import Lark, LarkError
+from lark import LarkError
+from odd_collector_sdk.grammar_parser import parse_cache
 from odd_models.models import DataSetField, DataSetFieldType
 from oddrn_generator import GlueGenerator
 
@@ -9,8 +10,8 @@ from .field_stat_schema import FIELD_TYPE_SCHEMA
 from .glue_field_type_transformer import GlueFieldTypeTransformer
 
 glue_field_type_transformer = GlueFieldTypeTransformer()
-parser = Lark.open(
-    "grammar/glue_field_type_grammar.lark", rel_to=__file__, parser="lalr", start="type"
+parser = parse_cache.LazyParser(
+    "grammar/glue_field_type_grammar.lark", rel_to=__file__, parser="lalr"
 )
 
 TYPES_GLUE_TO_ODD = {
@@ -41,7 +42,7 @@ def __map_glue_type(glue_type: str) -> str:
 
 
 def __parse(field_type: str) -> Dict[str, Any]:
-    column_tree = parser.parse(field_type)
+    column_tree = parse_cache.parse(parser, field_type)
     return glue_field_type_transformer.transform(column_tree)
 
 
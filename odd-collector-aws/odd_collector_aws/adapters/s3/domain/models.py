@@ -1,6 +1,6 @@
 import datetime
 from dataclasses import dataclass, field
-from typing import Any, Optional, Union
+from typing import Any, Iterable, Optional, Union
 
 
 @dataclass
@@ -32,10 +32,11 @@ class File:
 @dataclass
 class Folder:
     path: str
-    objects: list[Union["Folder", File]] = field(default_factory=list)
+    # lazy iterator when listed by FileSystem.list_objects
+    objects: Iterable[Union["Folder", File]] = field(default_factory=list)
 
 
 @dataclass
 class Bucket:
     name: str
-    objects: list[Union[Folder, File]] = field(default_factory=list)
+    objects: Iterable[Union[Folder, File]] = field(default_factory=list)
@@ -1,6 +1,17 @@
-from typing import Union
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, Tuple, Union
 
+import pyarrow as pa
 from odd_collector_aws.domain.plugin import S3Plugin
+from odd_collector_sdk.schema_cache import SchemaCache, fingerprint
+from odd_collector_sdk.schema_sampling import (
+    common_schema,
+    group_files,
+    pick_samples,
+    sampled_metadata,
+)
+from pyarrow._fs import FileInfo
 
 from ...domain.dataset_config import DatasetConfig
 from ...filesystem.pyarrow_fs import FileSystem as PyarrowFs
@@ -9,15 +20,37 @@ from .domain.models import Bucket, File, Folder
 from .logger import logger
 from .utils import file_format
 
+# Events of walking through a folder: file's schema being read, start or end of a folder
+Event = Tuple[str, Union[Future, str, None]]
+
 
 class FileSystem:
     """
     FileSystem hides pyarrow.fs implementation details.
+
+    Schemas of files are read concurrently by `workers` threads sharing one S3
+    filesystem, while folders are being listed. Objects are streamed in the listing order, at most
+    `workers * PREFETCH_PER_WORKER` schemas are read ahead of the consumer.
+
+    With `schema_sample_size` set, only a few files of a group of similar files of one
+    directory are read, see odd_collector_sdk.schema_sampling.
+
+    With `schema_cache_path` set, schemas are cached between runs, and only files whose
+    size or modification time changed are opened.
     """
 
+    PREFETCH_PER_WORKER = 4
+
     def __init__(self, config: S3Plugin):
         self.fs = PyarrowFs(config)
         self.filename_filter = config.filename_filter
+        self.workers = config.workers
+        self.schema_sample_size = config.schema_sample_size
+        self.schema_cache = (
+            SchemaCache(config.schema_cache_path, config.name, config.schema_cache_size)
+            if config.schema_cache_path
+            else None
+        )
 
     def get_folder_as_file(self, dataset_config: DatasetConfig) -> File:
         """
@@ -50,6 +83,8 @@ class FileSystem:
     def get_bucket(self, dataset_config: DatasetConfig) -> Bucket:
         """
         Get bucket with all related objects.
+        Objects of folders are lazy iterators, which must be consumed in order,
+        depth first, as map_bucket does.
         @param dataset_config:
         @return: Bucket
         """
@@ -57,30 +92,144 @@ class FileSystem:
         if dataset_config.folder_as_dataset:
             bucket.objects.append(self.get_folder_as_file(dataset_config))
         else:
-            objects = self.list_objects(path=dataset_config.full_path)
-            bucket.objects.extend(objects)
+            bucket.objects = self.list_objects(path=dataset_config.full_path)
 
         return bucket
 
-    def list_objects(self, path: str) -> list[Union[File, Folder]]:
+    def list_objects(self, path: str) -> Iterator[Union[File, Folder]]:
         """
-        Recursively get objects for path.
+        Recursively get objects for path, reading schemas of files concurrently.
         @param path: s3 path
-        @return: list of either File or Folder
+        @return: iterator of either File or Folder
         """
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            events = self._prefetch(
+                self._walk(path, executor), self.workers * self.PREFETCH_PER_WORKER
+            )
+            yield from self._build(events)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if self.schema_cache:
+                self.schema_cache.flush()
+
+    def _walk(self, path: str, executor: ThreadPoolExecutor) -> Iterator[Event]:
         logger.debug(f"Getting objects for {path=}")
-        objects = []
 
-        for obj in self.fs.get_file_info(path):
+        objects = self.fs.get_file_info(path)
+        files = [
+            obj
+            for obj in objects
+            if obj.is_file and self.filename_filter.is_allowed(obj.base_name)
+        ]
+        sampled = (
+            self._sample_schemas(files, executor) if self.schema_sample_size else {}
+        )
+
+        for obj in objects:
             if obj.is_file:
                 if not self.filename_filter.is_allowed(obj.base_name):
                     continue
 
-                objects.append(self.get_file(obj.path, obj.base_name))
+                if obj.path in sampled:
+                    future = Future()
+                    future.set_result(self._sampled_file(obj, *sampled[obj.path]))
+                    yield "file", future
+                else:
+                    yield "file", executor.submit(self._get_file, obj)
+            else:
+                yield "folder", remove_protocol(obj.path)
+                yield from self._walk(obj.path, executor)
+                yield "end", None
+
+    def _sample_schemas(
+        self, files: list[FileInfo], executor: ThreadPoolExecutor
+    ) -> dict[str, tuple[File, int]]:
+        """
+        Reads schemas of sampled files of every group of similar files.
+        @return: sample with common schema and size of the group, by group's file paths
+        """
+        pending = []
+        for group in group_files(files, lambda f: f.base_name):
+            if len(group) <= self.schema_sample_size:
+                continue
+            samples = pick_samples(
+                group,
+                self.schema_sample_size,
+                path=lambda f: f.path,
+                mtime=lambda f: f.mtime_ns or 0,
+            )
+            futures = [executor.submit(self._get_file, f) for f in samples]
+            pending.append((group, futures))
+
+        sampled = {}
+        for group, futures in pending:
+            sample = common_schema([future.result() for future in futures])
+            if sample is None:
+                logger.debug(
+                    f"Sampled schemas of {len(group)} files like {group[0].path} "
+                    "differ, reading all of them"
+                )
+                continue
+            sampled.update((f.path, (sample, len(group))) for f in group)
+        return sampled
+
+    def _sampled_file(self, obj: FileInfo, sample: File, group_size: int) -> File:
+        return File.dataset(
+            path=remove_protocol(obj.path),
+            name=obj.base_name,
+            schema=sample.schema,
+            file_format=sample.format,
+            metadata=sampled_metadata(sample.path, self.schema_sample_size, group_size),
+        )
+
+    @staticmethod
+    def _prefetch(events: Iterator[Event], size: int) -> Iterator[Event]:
+        """Walks ahead of the consumer until `size` files are being read."""
+        buffer: deque[Event] = deque()
+        files = 0
+        for event in events:
+            buffer.append(event)
+            files += event[0] == "file"
+            while files >= size:
+                head = buffer.popleft()
+                files -= head[0] == "file"
+                yield head
+        yield from buffer
+
+    def _build(self, events: Iterator[Event]) -> Iterator[Union[File, Folder]]:
+        """Turns events back into objects, folder's objects share the same events."""
+        for kind, value in events:
+            if kind == "file":
+                yield value.result()
+            elif kind == "folder":
+                yield Folder(value, self._build(events))
             else:
-                objects.append(self.get_folder(obj.path))
+                return
 
-        return objects
+    def _get_file(self, obj: FileInfo) -> File:
+        """Get File from the schema cache, reading it only if it has changed."""
+        if not self.schema_cache:
+            return self.get_file(obj.path, obj.base_name)
+
+        key = fingerprint(obj.size, obj.mtime_ns)
+        path = remove_protocol(obj.path)
+        if cached := self.schema_cache.get(path, key):
+            schema, file_fmt = cached
+            return File.dataset(
+                path=path,
+                name=obj.base_name,
+                schema=pa.ipc.read_schema(pa.py_buffer(schema)),
+                file_format=file_fmt,
+                metadata={},
+            )
+
+        file = self.get_file(obj.path, obj.base_name)
+        if file.schema is not None:
+            self.schema_cache.put(
+                path, key, file.schema.serialize().to_pybytes(), file.format
+            )
+        return file
 
     def get_file(self, path: str, file_name: str = None) -> File:
         """
@@ -120,5 +269,13 @@ class FileSystem:
         @return: Folder class with objects and path
         """
         path = remove_protocol(path)
-        objects = self.list_objects(path) if recursive else []
+        objects = list(self._materialize(self.list_objects(path))) if recursive else []
         return Folder(path, objects)
+
+    def _materialize(
+        self, objects: Iterator[Union[File, Folder]]
+    ) -> Iterator[Union[File, Folder]]:
+        for obj in objects:
+            if isinstance(obj, Folder):
+                obj.objects = list(self._materialize(obj.objects))
+            yield obj
@@ -1,4 +1,4 @@
-from collections import deque
+from typing import Iterable, Iterator, Union
 
 from odd_collector_aws.adapters.s3.domain.models import Bucket, File, Folder
 from odd_models import DataEntity, DataEntityGroup, DataEntityType, DataSet
@@ -37,11 +37,32 @@ def map_file(file: File, generator: S3Generator) -> DataEntity:
     return data_entity
 
 
-def map_folder(folder: Folder, generator: S3Generator) -> tuple[str, deque[DataEntity]]:
+def _map_group(
+    data_entity: DataEntity,
+    objects: Iterable[Union[File, Folder]],
+    generator: S3Generator,
+) -> Iterator[DataEntity]:
+    entities_list = data_entity.data_entity_group.entities_list
+
+    for obj in objects:
+        if isinstance(obj, File):
+            file_entity = map_file(obj, generator)
+            entities_list.append(file_entity.oddrn)
+            yield file_entity
+        if isinstance(obj, Folder):
+            folder_entity = None
+            for folder_entity in map_folder(obj, generator):
+                yield folder_entity
+            entities_list.append(folder_entity.oddrn)
+
+    yield data_entity
+
+
+def map_folder(folder: Folder, generator: S3Generator) -> Iterator[DataEntity]:
+    """Yields entities of folder's objects recursively, folder's entity is the last one."""
     bucket, *keys = folder.path.split("/")
     generator.set_oddrn_paths(keys="/".join(keys))
 
-    res = deque()
     data_entity = DataEntity(
         oddrn=generator.get_oddrn_by_path("keys"),
         name=folder.path,
@@ -49,41 +70,18 @@ def map_folder(folder: Folder, generator: S3Generator) -> tuple[str, deque[DataE
         data_entity_group=DataEntityGroup(entities_list=[]),
     )
 
-    res.appendleft(data_entity)
-
-    for obj in folder.objects:
-        if isinstance(obj, File):
-            file_entity = map_file(obj, generator)
-            data_entity.data_entity_group.entities_list.append(file_entity.oddrn)
-            res.appendleft(file_entity)
-        if isinstance(obj, Folder):
-            oddrn, items = map_folder(obj, generator)
-            res = items + res
-            data_entity.data_entity_group.entities_list.append(oddrn)
-
-    return data_entity.oddrn, res
+    yield from _map_group(data_entity, folder.objects, generator)
 
 
-def map_bucket(bucket: Bucket, generator: S3Generator) -> deque[DataEntity]:
+def map_bucket(bucket: Bucket, generator: S3Generator) -> Iterator[DataEntity]:
+    """Yields entities of bucket's objects recursively, bucket's entity is the last one."""
     generator.set_oddrn_paths(buckets=bucket.name)
 
-    res = deque()
     data_entity = DataEntity(
         oddrn=bucket.name,
         name=bucket.name,
         type=DataEntityType.DAG,
         data_entity_group=DataEntityGroup(entities_list=[]),
     )
-    res.appendleft(data_entity)
-
-    for obj in bucket.objects:
-        if isinstance(obj, File):
-            file_entity = map_file(obj, generator)
-            res.appendleft(file_entity)
-            data_entity.data_entity_group.entities_list.append(file_entity.oddrn)
-        if isinstance(obj, Folder):
-            dir_oddrn, items = map_folder(obj, generator)
-            res = items + res
-            data_entity.data_entity_group.entities_list.append(dir_oddrn)
 
-    return res
+    yield from _map_group(data_entity, bucket.objects, generator)
@@ -1,10 +1,10 @@
 from typing import Any
 
 from funcy import lflatten
-from lark import Lark
 from odd_collector_aws.adapters.s3.mapper.s3_field_type_transformer import (
     field_type_transformer,
 )
+from odd_collector_sdk.grammar_parser import parse_cache
 from odd_models.models import DataSetField, DataSetFieldType, Type
 from oddrn_generator import S3Generator
 from pyarrow import Schema
@@ -50,14 +50,14 @@ TYPE_MAP: dict[str, Type] = {
     "unknown": Type.TYPE_UNKNOWN,
 }
 
-parser = Lark.open(
-    "grammar/s3_field_type_grammar.lark", rel_to=__file__, parser="lalr", start="type"
+parser = parse_cache.LazyParser(
+    "grammar/s3_field_type_grammar.lark", rel_to=__file__, parser="lalr"
 )
 
 
 def parse(field_type: str) -> dict[str, Any]:
     try:
-        column_tree = parser.parse(field_type)
+        column_tree = parse_cache.parse(parser, field_type)
         return field_type_transformer.transform(column_tree)
     except Exception as exc:
         logger.warning(f"Could not map field type: {field_type}. {exc}")
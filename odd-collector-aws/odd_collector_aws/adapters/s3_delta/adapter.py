@@ -28,7 +28,7 @@ class Adapter(BaseAdapter):
     def get_data_entity_list(self) -> DataEntityList:
         logger.debug(f"Getting data entity list for {self.config.delta_tables}")
 
-        tables = self.client.get_table(self.config.delta_tables)
+        tables = self.client.get_tables([self.config.delta_tables])
         data_entities = lmap(partial(map_delta_table, self.generator), tables)
 
         return DataEntityList(
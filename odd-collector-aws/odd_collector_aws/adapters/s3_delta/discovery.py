@@ -0,0 +1,56 @@
+import time
+from typing import Iterable, Iterator, Optional
+
+from odd_collector_aws.domain.plugin import DeltaTableConfig
+from odd_collector_aws.filesystem.pyarrow_fs import FileSystem
+
+from ...utils.remove_s3_protocol import remove_protocol
+from .logger import logger
+
+DELTA_LOG = "_delta_log"
+
+
+def find_tables(
+    fs: FileSystem,
+    configs: Iterable[DeltaTableConfig],
+    max_depth: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Iterator[DeltaTableConfig]:
+    """
+    Find Delta tables from listings alone, without trying to open every folder as
+    a table. A folder having `_delta_log` subfolder is a table root and isn't
+    descended into, other folders are searched depth first in the listing order.
+    @param max_depth: how deep to search below configured folders, unlimited if None
+    @param deadline: time.monotonic() value after which search stops
+    """
+    stack = [(config, 0) for config in reversed(list(configs))]
+    while stack:
+        if deadline is not None and time.monotonic() > deadline:
+            logger.warning(
+                f"Time budget for delta tables discovery is exceeded, {len(stack)}"
+                " folders weren't searched"
+            )
+            return
+
+        config, depth = stack.pop()
+        try:
+            objects = fs.get_file_info(remove_protocol(config.path))
+        except Exception as e:
+            logger.warning(f"Failed to list {config.path}: {e}")
+            continue
+
+        folders = [obj for obj in objects if not obj.is_file and obj.base_name]
+        if any(folder.base_name == DELTA_LOG for folder in folders):
+            yield config
+            continue
+
+        if max_depth is not None and depth >= max_depth:
+            logger.debug(f"Max depth is reached at {config.path}")
+            continue
+
+        logger.debug(f"Path {config.path} is not a delta table, searching subfolders")
+        allowed = [folder for folder in folders if config.allow(folder.path)]
+        stack.extend(
+            (config.append_prefix(folder.base_name), depth + 1)
+            for folder in reversed(allowed)
+        )
@@ -67,6 +67,11 @@ class S3DeltaPlugin(AwsPlugin):
     endpoint_url: Optional[str] = None
     aws_storage_allow_http: Optional[bool] = False
     delta_tables: DeltaTableConfig
+    workers: int = 4  # number of delta tables loaded concurrently
+    # how deep to search for delta tables below the prefix, unlimited if not set
+    max_depth: Optional[int] = None
+    # seconds to search for delta tables per run, unlimited if not set
+    discovery_time_budget: Optional[float] = None
 
 
 class S3Plugin(AwsPlugin):
@@ -75,6 +80,13 @@ class S3Plugin(AwsPlugin):
     datasets: Optional[list[DatasetConfig]] = None
     dataset_config: DatasetConfig
     filename_filter: Optional[Filter] = Filter()
+    workers: int = 8  # number of files whose schemas are read concurrently
+    # read schemas of only this many files of a directory having the same extension,
+    # and reuse them for the rest of files if they are the same
+    schema_sample_size: Optional[int] = None
+    # path to SQLite file caching schemas of unchanged files between runs
+    schema_cache_path: Optional[str] = None
+    schema_cache_size: int = 1_000_000  # max number of cached schemas
 
     @field_validator("datasets", mode="before")
     @classmethod
@@ -0,0 +1,162 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from odd_collector_aws.adapters.s3 import file_system
+from odd_collector_aws.adapters.s3.domain.models import File, Folder
+from odd_collector_aws.adapters.s3.mapper.bucket import map_bucket
+from odd_collector_aws.domain.plugin import S3Plugin
+from odd_collector_aws.filesystem.pyarrow_fs import FileSystem as PyarrowFs
+from odd_models.models import DataEntityType
+from oddrn_generator.generators import S3Generator
+from pyarrow.fs import LocalFileSystem, SubTreeFileSystem
+
+FILES = [
+    "bucket/data/a.parquet",
+    "bucket/data/year=1/b.parquet",
+    "bucket/data/year=2/c.parquet",
+    "bucket/data/year=2/nested/d.parquet",
+    "bucket/data/year=3/e.parquet",
+]
+
+
+@pytest.fixture()
+def local_fs(tmp_path, monkeypatch):
+    table = pa.table({"id": [1, 2], "name": ["a", "b"]})
+    for path in FILES:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, tmp_path / path)
+
+    class LocalFs(PyarrowFs):
+        def __init__(self, config):
+            self.fs = SubTreeFileSystem(str(tmp_path), LocalFileSystem())
+
+        def get_file_info(self, path: str):
+            # S3 lists keys in lexicographical order
+            return sorted(super().get_file_info(path), key=lambda info: info.path)
+
+    monkeypatch.setattr(file_system, "PyarrowFs", LocalFs)
+
+
+@pytest.fixture()
+def config() -> S3Plugin:
+    return S3Plugin(
+        type="s3",
+        name="s3_adapter",
+        workers=2,
+        dataset_config={"bucket": "bucket", "prefix": "data"},
+    )
+
+
+def walk(objects) -> list[str]:
+    paths = []
+    for obj in objects:
+        if isinstance(obj, Folder):
+            paths.append(obj.path)
+            paths.extend(walk(obj.objects))
+        else:
+            assert obj.schema.names == ["id", "name"]
+            paths.append(obj.path)
+    return paths
+
+
+def test_objects_are_streamed_in_listing_order(local_fs, config):
+    fs = file_system.FileSystem(config)
+    fs.PREFETCH_PER_WORKER = 1
+
+    bucket = fs.get_bucket(config.dataset_config)
+
+    assert walk(bucket.objects) == [
+        "bucket/data/a.parquet",
+        "bucket/data/year=1",
+        "bucket/data/year=1/b.parquet",
+        "bucket/data/year=2",
+        "bucket/data/year=2/c.parquet",
+        "bucket/data/year=2/nested",
+        "bucket/data/year=2/nested/d.parquet",
+        "bucket/data/year=3",
+        "bucket/data/year=3/e.parquet",
+    ]
+
+
+def test_map_bucket_groups_streamed_objects(local_fs, config):
+    bucket = file_system.FileSystem(config).get_bucket(config.dataset_config)
+    generator = S3Generator()
+
+    entities = {entity.name: entity for entity in map_bucket(bucket, generator)}
+
+    assert len([e for e in entities.values() if e.type == DataEntityType.FILE]) == 5
+    year_2 = entities["bucket/data/year=2"]
+    assert year_2.data_entity_group.entities_list == [
+        entities["c.parquet"].oddrn,
+        entities["bucket/data/year=2/nested"].oddrn,
+    ]
+    assert len(entities["bucket"].data_entity_group.entities_list) == 4
+
+
+def test_get_folder_returns_materialized_objects(local_fs, config):
+    folder = file_system.FileSystem(config).get_folder("bucket/data/year=2")
+
+    assert isinstance(folder.objects, list)
+    nested = folder.objects[1]
+    assert isinstance(nested, Folder) and isinstance(nested.objects, list)
+    assert isinstance(nested.objects[0], File)
+
+
+def test_schemas_of_similar_files_are_sampled(tmp_path, local_fs, config, monkeypatch):
+    for i in range(10):
+        table = pa.table({"id": [i], "name": [str(i)]})
+        pq.write_table(table, tmp_path / f"bucket/data/year=3/{i}.parquet")
+    config.schema_sample_size = 3
+    fs = file_system.FileSystem(config)
+    read = []
+    get_file = fs.get_file
+    monkeypatch.setattr(
+        fs, "get_file", lambda *args: read.append(args[0]) or get_file(*args)
+    )
+
+    folder = fs.get_folder("bucket/data/year=3")
+
+    assert len(read) == 3
+    assert len(folder.objects) == 11
+    assert all(f.metadata["SchemaGroupSize"] == 11 for f in folder.objects)
+    assert all(f.schema.names == ["id", "name"] for f in folder.objects)
+
+
+def test_files_are_read_when_sampled_schemas_differ(tmp_path, local_fs, config):
+    for i in range(10):
+        pq.write_table(
+            pa.table({f"column_{i}": [i]}), tmp_path / f"bucket/data/year=3/{i}.parquet"
+        )
+    config.schema_sample_size = 3
+
+    folder = file_system.FileSystem(config).get_folder("bucket/data/year=3")
+
+    assert len({tuple(f.schema.names) for f in folder.objects}) == 11
+    assert not any(f.metadata for f in folder.objects)
+
+
+def test_schemas_of_unchanged_files_are_cached(tmp_path, local_fs, config, monkeypatch):
+    config.schema_cache_path = str(tmp_path / "cache" / "schemas.sqlite")
+    read = []
+
+    def get_folder():
+        fs = file_system.FileSystem(config)
+        get_file = fs.get_file
+        monkeypatch.setattr(
+            fs, "get_file", lambda *args: read.append(args[0]) or get_file(*args)
+        )
+        return fs.get_folder("bucket/data")
+
+    get_folder()
+    assert len(read) == 5
+
+    pq.write_table(
+        pa.table({"id": [1], "name": ["a"], "value": [1.0]}),
+        tmp_path / "bucket/data/year=1/b.parquet",
+    )
+    read.clear()
+    folder = get_folder()
+
+    assert read == ["bucket/data/year=1/b.parquet"]
+    assert folder.objects[0].schema.names == ["id", "name"]
+    assert folder.objects[1].objects[0].schema.names == ["id", "name", "value"]
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+from odd_collector_aws.adapters.s3_delta.discovery import find_tables
+from odd_collector_aws.domain.plugin import DeltaTableConfig
+from odd_collector_aws.filesystem.pyarrow_fs import FileSystem
+from pyarrow.fs import LocalFileSystem, SubTreeFileSystem
+
+FOLDERS = [
+    "bucket/lake/events/_delta_log",
+    "bucket/lake/events/date=2023-01-01",
+    "bucket/lake/raw/orders/_delta_log",
+    "bucket/lake/raw/users_pii/_delta_log",
+    "bucket/lake/raw/logs/2023/01",
+    "bucket/lake/raw/nested/deep/table/_delta_log",
+]
+
+
+class LocalFs(FileSystem):
+    def __init__(self, root):
+        self.fs = SubTreeFileSystem(str(root), LocalFileSystem())
+        self.listed = []
+
+    def get_file_info(self, path: str):
+        self.listed.append(path)
+        return sorted(super().get_file_info(path), key=lambda info: info.path)
+
+
+@pytest.fixture()
+def fs(tmp_path) -> LocalFs:
+    for folder in FOLDERS:
+        (tmp_path / folder).mkdir(parents=True)
+    return LocalFs(tmp_path)
+
+
+def prefixes(configs) -> list[str]:
+    return [config.prefix for config in configs]
+
+
+def test_tables_are_found_from_listings(fs):
+    config = DeltaTableConfig(bucket="bucket", prefix="lake")
+
+    assert prefixes(find_tables(fs, [config])) == [
+        "lake/events",
+        "lake/raw/nested/deep/table",
+        "lake/raw/orders",
+        "lake/raw/users_pii",
+    ]
+    assert not any(path.startswith("bucket/lake/events/") for path in fs.listed)
+
+
+def test_configured_table_root_is_found(fs):
+    config = DeltaTableConfig(bucket="bucket", prefix="lake/events")
+
+    assert prefixes(find_tables(fs, [config])) == ["lake/events"]
+    assert fs.listed == ["bucket/lake/events"]
+
+
+def test_filter_and_max_depth_are_applied(fs):
+    config = DeltaTableConfig(
+        bucket="bucket", prefix="lake", filter={"exclude": ["_pii"]}
+    )
+
+    assert prefixes(find_tables(fs, [config], max_depth=2)) == [
+        "lake/events",
+        "lake/raw/orders",
+    ]
+
+
+def test_search_stops_after_deadline(fs):
+    config = DeltaTableConfig(bucket="bucket", prefix="lake")
+
+    assert list(find_tables(fs, [config], deadline=time.monotonic() - 1)) == []
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pyarrow as pa
+from odd_collector_aws.adapters.s3_delta.stats import StatsCache, get_stats
+
+
+class Table:
+    table_uri = "s3://bucket/table"
+
+    def __init__(self, actions: pa.RecordBatch, version: int = 0) -> None:
+        self.actions = actions
+        self._version = version
+        self.reads = 0
+
+    def version(self) -> int:
+        return self._version
+
+    def get_add_actions(self, flatten: bool = False) -> pa.RecordBatch:
+        self.reads += 1
+        return self.actions
+
+
+ACTIONS = pa.record_batch(
+    {
+        "path": ["a.parquet", "b.parquet", "c.parquet"],
+        "size_bytes": [10, 20, 30],
+        "modification_time": pa.array(
+            [datetime(2023, 1, 2), datetime(2023, 1, 3), datetime(2023, 1, 1)],
+            pa.timestamp("ms"),
+        ),
+        "num_records": pa.array([1, None, 5], pa.int64()),
+    }
+)
+
+
+def test_stats_are_aggregated_from_add_actions():
+    assert get_stats(Table(ACTIONS)) == {
+        "size_bytes": 60,
+        "num_records": 6,
+        "modification_time": datetime(2023, 1, 3),
+    }
+
+
+def test_missing_stats_are_none():
+    actions = pa.record_batch({"path": ["a.parquet"], "size_bytes": [10]})
+
+    assert get_stats(Table(actions)) == {
+        "size_bytes": 10,
+        "num_records": None,
+        "modification_time": None,
+    }
+
+
+def test_stats_are_computed_again_only_for_new_version():
+    cache = StatsCache()
+    table = Table(ACTIONS)
+
+    cache.get(table)
+    cache.get(table)
+    assert table.reads == 1
+
+    table._version = 1
+    cache.get(table)
+    assert table.reads == 2
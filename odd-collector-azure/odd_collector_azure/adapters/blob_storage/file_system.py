@@ -1,10 +1,18 @@
 from typing import Callable, Union
 
+import pyarrow as pa
 import pyarrow.dataset as ds
 from adlfs import AzureBlobFileSystem
 from funcy import iffy, lmap
 from odd_collector_azure.adapters.blob_storage.dataset_config import DatasetConfig
 from odd_collector_azure.domain.plugin import BlobPlugin
+from odd_collector_sdk.schema_cache import SchemaCache, fingerprint
+from odd_collector_sdk.schema_sampling import (
+    common_schema,
+    group_files,
+    pick_samples,
+    sampled_metadata,
+)
 from pyarrow._fs import FileInfo, FileSelector
 
 from .domain.models import Container, File, Folder
@@ -12,6 +20,10 @@ from .logger import logger
 from .utils import file_format
 
 
+def base_name(file: dict) -> str:
+    return file["name"].rsplit("/", 1)[-1]
+
+
 class FileSystem:
     """
     FileSystem hides pyarrow.fs implementation details.
@@ -29,6 +41,11 @@ class FileSystem:
 
         self.config = config
         self.fs = AzureBlobFileSystem(**params)
+        self.schema_cache = (
+            SchemaCache(config.schema_cache_path, config.name, config.schema_cache_size)
+            if config.schema_cache_path
+            else None
+        )
 
     def get_file_info(
         self, path: str, file_filter: Callable[[str], bool]
@@ -106,6 +123,8 @@ class FileSystem:
                 file_filter=self.config.file_filter.is_allowed,
             )
             container.objects.extend(objects)
+            if self.schema_cache:
+                self.schema_cache.flush()
 
         return container
 
@@ -118,18 +137,89 @@ class FileSystem:
         @return: list of either File or Folder
         """
         logger.debug(f"Getting objects for {path=}")
+        file_info = self.get_file_info(path, file_filter)
+        sampled = (
+            self._sample_schemas([x for x in file_info if x["type"] == "file"])
+            if self.config.schema_sample_size
+            else {}
+        )
         return lmap(
             iffy(
                 lambda x: True if x["type"] == "file" else False,
-                lambda x: self.get_file(
-                    x["name"],
-                    x["name"].rsplit("/", 1)[-1] if x["type"] == "file" else None,
+                lambda x: (
+                    self._sampled_file(x, *sampled[x["name"]])
+                    if x["name"] in sampled
+                    else self._get_file(x)
                 ),
                 lambda x: self.get_folder(x["name"], file_filter),
             ),
-            self.get_file_info(path, file_filter),
+            file_info,
         )
 
+    def _sample_schemas(self, files: list[dict]) -> dict[str, tuple[File, int]]:
+        """
+        Reads schemas of sampled files of every group of similar files.
+        @return: sample with common schema and size of the group, by group's file paths
+        """
+        sampled = {}
+        for group in group_files(files, base_name):
+            if len(group) <= self.config.schema_sample_size:
+                continue
+
+            samples = pick_samples(
+                group,
+                self.config.schema_sample_size,
+                path=lambda f: f["name"],
+                mtime=lambda f: (
+                    f.get("last_modified") is not None,
+                    f.get("last_modified"),
+                ),
+            )
+            sample = common_schema([self._get_file(f) for f in samples])
+            if sample is None:
+                logger.debug(
+                    f"Sampled schemas of {len(group)} files like {group[0]['name']} "
+                    "differ, reading all of them"
+                )
+                continue
+            sampled.update((f["name"], (sample, len(group))) for f in group)
+        return sampled
+
+    def _sampled_file(self, obj: dict, sample: File, group_size: int) -> File:
+        return File.dataset(
+            path=obj["name"],
+            name=base_name(obj),
+            schema=sample.schema,
+            file_format=sample.format,
+            metadata=sampled_metadata(
+                sample.path, self.config.schema_sample_size, group_size
+            ),
+        )
+
+    def _get_file(self, obj: dict) -> File:
+        """Get File from the schema cache, reading it only if it has changed."""
+        path, file_name = obj["name"], base_name(obj)
+        if not self.schema_cache:
+            return self.get_file(path, file_name)
+
+        key = fingerprint(obj.get("etag"), obj.get("size"), obj.get("last_modified"))
+        if cached := self.schema_cache.get(path, key):
+            schema, file_fmt = cached
+            return File.dataset(
+                path=path,
+                name=file_name,
+                schema=pa.ipc.read_schema(pa.py_buffer(schema)),
+                file_format=file_fmt,
+                metadata={},
+            )
+
+        file = self.get_file(path, file_name)
+        if file.schema is not None:
+            self.schema_cache.put(
+                path, key, file.schema.serialize().to_pybytes(), file.format
+            )
+        return file
+
     def get_file(self, path: str, file_name: str = None) -> File:
         """
         Get File with schema and metadata.
@@ -3,8 +3,8 @@ import re
 from typing import Any, Dict, List
 
 from funcy import lflatten
-from lark import Lark
 from odd_collector_azure.adapters.blob_storage.blob_generator import BlobGenerator
+from odd_collector_sdk.grammar_parser import parse_cache
 from odd_models.models import (
     DataEntity,
     DataEntityType,
@@ -63,17 +63,14 @@ TYPE_MAP: Dict[str, Type] = {
     "unknown": Type.TYPE_UNKNOWN,
 }
 field_type_transformer = AzureFieldTypeTransformer()
-parser = Lark.open(
-    "grammar/blob_storage_field_type_grammar.lark",
-    rel_to=__file__,
-    parser="lalr",
-    start="type",
+parser = parse_cache.LazyParser(
+    "grammar/blob_storage_field_type_grammar.lark", rel_to=__file__, parser="lalr"
 )
 
 
 def __parse(field_type: str) -> Dict[str, Any]:
     try:
-        column_tree = parser.parse(field_type)
+        column_tree = parse_cache.parse(parser, field_type)
         return field_type_transformer.transform(column_tree)
     except Exception as exc:
         logging.warning(f"Could not map field type: {field_type}")
@@ -38,6 +38,12 @@ class BlobPlugin(Plugin):
     connection_string: Optional[SecretStr]
     file_filter: Optional[Filter] = Filter()
     dataset_config: DatasetConfig
+    # read schemas of only this many files of a directory having the same extension,
+    # and reuse them for the rest of files if they are the same
+    schema_sample_size: Optional[int] = None
+    # path to SQLite file caching schemas of unchanged files between runs
+    schema_cache_path: Optional[str] = None
+    schema_cache_size: int = 1_000_000  # max number of cached schemas
     datasets: Optional[list[DatasetConfig]] = None
 
     @validator("datasets", pre=True)
@@ -1,7 +1,16 @@
 from typing import Union
 
+import pyarrow as pa
 from odd_collector_gcp.domain.dataset_config import DatasetConfig
 from odd_collector_gcp.domain.plugin import GCSPlugin
+from odd_collector_sdk.schema_cache import SchemaCache, fingerprint
+from odd_collector_sdk.schema_sampling import (
+    common_schema,
+    group_files,
+    pick_samples,
+    sampled_metadata,
+)
+from pyarrow._fs import FileInfo
 
 from ...filesystem.pyarrow_fs import FileSystem as PyarrowFs
 from .domain.models import Bucket, File, Folder
@@ -17,6 +26,12 @@ class FileSystem(PyarrowFs):
     def __init__(self, config: GCSPlugin):
         self.fs = PyarrowFs(config.parameters)
         self.filename_filter = config.filename_filter
+        self.schema_sample_size = config.schema_sample_size
+        self.schema_cache = (
+            SchemaCache(config.schema_cache_path, config.name, config.schema_cache_size)
+            if config.schema_cache_path
+            else None
+        )
 
     def get_folder_as_file(self, dataset_config: DatasetConfig) -> File:
         """
@@ -58,6 +73,8 @@ class FileSystem(PyarrowFs):
         else:
             objects = self.list_objects(path=dataset_config.full_path)
             bucket.objects.extend(objects)
+            if self.schema_cache:
+                self.schema_cache.flush()
 
         return bucket
 
@@ -70,17 +87,86 @@ class FileSystem(PyarrowFs):
         logger.debug(f"Getting objects for {path=}")
         objects = []
 
-        for obj in self.fs.get_file_info(path):
+        infos = self.fs.get_file_info(path)
+        files = [
+            obj
+            for obj in infos
+            if obj.is_file and self.filename_filter.is_allowed(obj.base_name)
+        ]
+        sampled = self._sample_schemas(files) if self.schema_sample_size else {}
+
+        for obj in infos:
             if obj.is_file:
                 if not self.filename_filter.is_allowed(obj.base_name):
                     continue
 
-                objects.append(self.get_file(obj.path, obj.base_name))
+                if obj.path in sampled:
+                    objects.append(self._sampled_file(obj, *sampled[obj.path]))
+                else:
+                    objects.append(self._get_file(obj))
             else:
                 objects.append(self.get_folder(obj.path))
 
         return objects
 
+    def _sample_schemas(self, files: list[FileInfo]) -> dict[str, tuple[File, int]]:
+        """
+        Reads schemas of sampled files of every group of similar files.
+        @return: sample with common schema and size of the group, by group's file paths
+        """
+        sampled = {}
+        for group in group_files(files, lambda f: f.base_name):
+            if len(group) <= self.schema_sample_size:
+                continue
+
+            samples = pick_samples(
+                group,
+                self.schema_sample_size,
+                path=lambda f: f.path,
+                mtime=lambda f: f.mtime_ns or 0,
+            )
+            sample = common_schema([self._get_file(f) for f in samples])
+            if sample is None:
+                logger.debug(
+                    f"Sampled schemas of {len(group)} files like {group[0].path} "
+                    "differ, reading all of them"
+                )
+                continue
+            sampled.update((f.path, (sample, len(group))) for f in group)
+        return sampled
+
+    def _sampled_file(self, obj: FileInfo, sample: File, group_size: int) -> File:
+        return File.dataset(
+            path=obj.path,
+            name=obj.base_name,
+            schema=sample.schema,
+            file_format=sample.format,
+            metadata=sampled_metadata(sample.path, self.schema_sample_size, group_size),
+        )
+
+    def _get_file(self, obj: FileInfo) -> File:
+        """Get File from the schema cache, reading it only if it has changed."""
+        if not self.schema_cache:
+            return self.get_file(obj.path, obj.base_name)
+
+        key = fingerprint(obj.size, obj.mtime_ns)
+        if cached := self.schema_cache.get(obj.path, key):
+            schema, file_fmt = cached
+            return File.dataset(
+                path=obj.path,
+                name=obj.base_name,
+                schema=pa.ipc.read_schema(pa.py_buffer(schema)),
+                file_format=file_fmt,
+                metadata={},
+            )
+
+        file = self.get_file(obj.path, obj.base_name)
+        if file.schema is not None:
+            self.schema_cache.put(
+                obj.path, key, file.schema.serialize().to_pybytes(), file.format
+            )
+        return file
+
     def get_file(self, path: str, file_name: str = None) -> File:
         """
         Get File with schema and metadata.
@@ -2,7 +2,7 @@ import re
 from typing import Any, Dict
 
 from funcy import lflatten
-from lark import Lark
+from odd_collector_sdk.grammar_parser import parse_cache
 from odd_models.models import DataEntity, DataEntityType, DataSet, DataSetField, Type
 from oddrn_generator.generators import GCSGenerator
 from oddrn_generator.utils import escape
@@ -57,14 +57,14 @@ TYPE_MAP: Dict[str, Type] = {
     "unknown": Type.TYPE_UNKNOWN,
 }
 field_type_transformer = GCSFieldTypeTransformer()
-parser = Lark.open(
-    "grammar/gcs_field_type_grammar.lark", rel_to=__file__, parser="lalr", start="type"
+parser = parse_cache.LazyParser(
+    "grammar/gcs_field_type_grammar.lark", rel_to=__file__, parser="lalr"
 )
 
 
 def __parse(field_type: str) -> Dict[str, Any]:
     try:
-        column_tree = parser.parse(field_type)
+        column_tree = parse_cache.parse(parser, field_type)
         return field_type_transformer.transform(column_tree)
     except Exception as exc:
         logger.warning(f"Could not map field type: {field_type}")
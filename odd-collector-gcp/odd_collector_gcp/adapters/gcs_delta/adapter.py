@@ -1,4 +1,4 @@
-from funcy import lmap, mapcat, partial
+from funcy import lmap, partial
 from odd_collector_gcp.domain.plugin import GCSDeltaPlugin
 from odd_collector_sdk.domain.adapter import BaseAdapter
 from odd_models.models import DataEntityList
@@ -27,7 +27,7 @@ class Adapter(BaseAdapter):
     def get_data_entity_list(self) -> DataEntityList:
         logger.debug(f"Getting data entity list for {self.config.delta_tables}")
 
-        tables = mapcat(self.client.get_table, self.config.delta_tables)
+        tables = self.client.get_tables(self.config.delta_tables)
         data_entities = lmap(partial(map_delta_table, self.generator), tables)
 
         return DataEntityList(
@@ -1,23 +1,19 @@
+import time
 import traceback as tb
-from typing import Any, Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, Optional
 
 from deltalake import DeltaTable
-from funcy import last, partial, silent, walk
+from funcy import silent
 from odd_collector_gcp.domain.plugin import DeltaTableConfig, GCSDeltaPlugin
 from odd_collector_gcp.filesystem.pyarrow_fs import FileSystem
 
 from ...utils.dates import add_utc_timezone, from_ms
-from ...utils.remove_gcs_protocol import remove_protocol
 from ..gcs.domain.parameters import GCSAdapterParams
+from .discovery import DELTA_LOG, find_tables
 from .logger import logger
 from .models.table import DTable
-
-
-def handle_values(
-    obj: dict, handler: tuple[str, callable]
-) -> tuple[str, Optional[any]]:
-    key, callback = handler
-    return key, silent(callback)(obj.get(key))
+from .stats import StatsCache
 
 
 class IsNotDeltaTable(Exception):
@@ -27,7 +23,11 @@ class IsNotDeltaTable(Exception):
 class DeltaClient:
     def __init__(self, config: GCSDeltaPlugin) -> None:
         self.storage_options: GCSAdapterParams = config.parameters
+        self.stats = StatsCache()
         self.fs = FileSystem(config.parameters)
+        self.workers = config.workers
+        self.max_depth = config.max_depth
+        self.discovery_time_budget = config.discovery_time_budget
 
     def load_delta_table(self, delta_table_config: DeltaTableConfig) -> DeltaTable:
         storage_options = self.storage_options.dict() if self.storage_options else None
@@ -40,28 +40,32 @@ class DeltaClient:
             logger.error(f"Error message: {e}")
             raise IsNotDeltaTable() from e
 
-    def handle_folder(self, config: DeltaTableConfig) -> Iterable[DTable]:
-        logger.debug(f"Getting delta tables from folder {config.path}")
-
-        objects = self.fs.get_file_info(remove_protocol(config.path))
-
-        folders = filter(lambda obj: not obj.is_file, objects)
-        allowed = filter(lambda folder: folder.base_name, folders)
-        filtered = filter(lambda item: config.allow(item.path), allowed)
-
-        for obj in filtered:
-            new_config = config.append_prefix(obj.base_name)
-            yield from self.get_table(new_config)
-
-    def get_table(self, delta_table_config: DeltaTableConfig) -> Iterable[DTable]:
+    def get_tables(self, configs: Iterable[DeltaTableConfig]) -> Iterator[DTable]:
+        """
+        Discover delta tables in configured folders and load them concurrently,
+        tables are loaded while discovery goes on.
+        """
+        deadline = (
+            time.monotonic() + self.discovery_time_budget
+            if self.discovery_time_budget
+            else None
+        )
+        found = find_tables(self.fs, configs, self.max_depth, deadline)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.get_table, config) for config in found]
+            for future in futures:
+                if table := future.result():
+                    yield table
+
+    def get_table(self, delta_table_config: DeltaTableConfig) -> Optional[DTable]:
         # sourcery skip: raise-specific-error
         try:
             logger.debug(f"Getting delta table {delta_table_config.path}")
             table = self.load_delta_table(delta_table_config)
 
-            metadata = get_metadata(table)
+            metadata = get_metadata(table, self.stats)
 
-            yield DTable(
+            return DTable(
                 table_uri=table.table_uri,
                 schema=table.schema(),
                 num_rows=metadata.get("num_records"),
@@ -69,31 +73,27 @@ class DeltaClient:
                 created_at=silent(from_ms)(metadata.get("created_time")),
                 updated_at=silent(add_utc_timezone)(metadata.get("modification_time")),
             )
-        except IsNotDeltaTable:
+        except IsNotDeltaTable as e:
             logger.warning(
-                f"Path {delta_table_config.path} is not a delta table. Searching for"
-                " delta tables in subfolders."
+                f"Path {delta_table_config.path} has {DELTA_LOG} folder, but isn't"
+                f" a valid delta table: {e.__cause__}"
             )
-            yield from self.handle_folder(delta_table_config)
+            return None
         except Exception as e:
             raise Exception(
                 f"Failed to get delta table {delta_table_config.path}. {e}"
             ) from e
 
 
-def get_metadata(table: DeltaTable) -> dict[str, Any]:
+def get_metadata(table: DeltaTable, stats: StatsCache) -> dict[str, Any]:
     metadata = {}
 
     try:
-        logger.debug(f"Getting actions list for {table.table_uri}")
-        actions = table.get_add_actions(flatten=True).to_pydict()
-
-        metadata |= walk(
-            partial(handle_values, actions),
-            {"size_bytes": sum, "num_records": sum, "modification_time": last},
-        )
+        logger.debug(f"Getting statistics for {table.table_uri}")
+        metadata |= stats.get(table)
     except Exception as e:
-        logger.error(f"Failed to get actions list for {table.table_uri}")
+        logger.debug(tb.format_exc())
+        logger.error(f"Failed to get statistics for {table.table_uri}. {e}")
 
     try:
         logger.debug(f"Getting metadata for {table.table_uri}")
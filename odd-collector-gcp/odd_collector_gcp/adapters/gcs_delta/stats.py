@@ -0,0 +1,46 @@
+from typing import Any, Callable
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# aggregate of add actions' column for each statistic
+AGGREGATES: dict[str, Callable[[pa.Array], pa.Scalar]] = {
+    "size_bytes": pc.sum,
+    "num_records": pc.sum,
+    "modification_time": pc.max,
+}
+
+
+def get_stats(table) -> dict[str, Any]:
+    """
+    Aggregate statistics of active files of a Delta table.
+    Add actions are aggregated vectorized on the Arrow record batch, without nested
+    min/max/null_count stats being flattened or converted to python objects.
+    @param table: DeltaTable
+    """
+    actions: pa.RecordBatch = table.get_add_actions(flatten=False)
+    names = set(actions.schema.names)
+    return {
+        name: aggregate(actions.column(name)).as_py() if name in names else None
+        for name, aggregate in AGGREGATES.items()
+    }
+
+
+class StatsCache:
+    """
+    Statistics of tables by their uri, computed again only when table's version
+    changes, so unchanged tables aren't aggregated on every run.
+    """
+
+    def __init__(self) -> None:
+        self._stats: dict[str, tuple[int, dict[str, Any]]] = {}
+
+    def get(self, table) -> dict[str, Any]:
+        version = table.version()
+        cached = self._stats.get(table.table_uri)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        stats = get_stats(table)
+        self._stats[table.table_uri] = (version, stats)
+        return stats
@@ -49,6 +49,11 @@ class GCSDeltaPlugin(GcpPlugin):
     type: Literal["gcs_delta"]
     parameters: Optional[GCSAdapterParams] = None
     delta_tables: list[DeltaTableConfig]
+    workers: int = 4  # number of delta tables loaded concurrently
+    # how deep to search for delta tables below prefixes, unlimited if not set
+    max_depth: Optional[int] = None
+    # seconds to search for delta tables per run, unlimited if not set
+    discovery_time_budget: Optional[float] = None
 
 
 class GCSPlugin(GcpPlugin):
@@ -56,6 +61,12 @@ class GCSPlugin(GcpPlugin):
     datasets: list[DatasetConfig]
     parameters: Optional[GCSAdapterParams] = None
     filename_filter: Optional[Filter] = Filter()
+    # read schemas of only this many files of a directory having the same extension,
+    # and reuse them for the rest of files if they are the same
+    schema_sample_size: Optional[int] = None
+    # path to SQLite file caching schemas of unchanged files between runs
+    schema_cache_path: Optional[str] = None
+    schema_cache_size: int = 1_000_000  # max number of cached schemas
 
 
 PLUGIN_FACTORY: PluginFactory = {
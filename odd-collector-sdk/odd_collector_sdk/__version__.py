@@ -1 +1 @@
-VERSION = "0.3.60"
+VERSION = "0.3.61"
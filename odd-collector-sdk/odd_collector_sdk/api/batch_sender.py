@@ -0,0 +1,70 @@
+import asyncio
+from timeit import default_timer as timer
+from typing import Awaitable, Callable, Optional, Set
+
+from odd_models.models import DataEntityList
+
+from .. import metrics
+
+
+class BatchSender:
+    """Sends batches to the platform with a bounded number of requests in flight.
+
+    `submit` returns as soon as a request for the batch is started, so the next batch
+    can be prepared while previous ones are being sent. When `max_inflight_batches`
+    requests are already in flight, it waits until one of them is finished.
+
+    Example:
+        >>> sender = BatchSender(api.ingest_data, max_inflight_batches=2)
+        >>> for batch in batches:
+        >>>     await sender.submit(batch)
+        >>> await sender.join()
+    """
+
+    def __init__(
+        self,
+        send: Callable[[DataEntityList], Awaitable],
+        max_inflight_batches: int = 2,
+    ) -> None:
+        if max_inflight_batches < 1:
+            raise ValueError(f"{max_inflight_batches=} must be positive")
+
+        self._send_batch = send
+        self._semaphore = asyncio.Semaphore(max_inflight_batches)
+        self._tasks: Set[asyncio.Task] = set()
+        self._error: Optional[BaseException] = None
+
+    async def submit(self, data_entity_list: DataEntityList) -> None:
+        start = timer()
+        await self._semaphore.acquire()
+        metrics.record_queue_wait(timer() - start)
+        if self._error is not None:
+            self._semaphore.release()
+            raise self._error
+
+        task = asyncio.create_task(self._send(data_entity_list))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        # let the request start before the caller goes on preparing the next batch
+        await asyncio.sleep(0)
+
+    async def join(self) -> None:
+        """Waits for all requests in flight, raises the first ingestion error if any."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._error is not None:
+            raise self._error
+
+    async def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _send(self, data_entity_list: DataEntityList) -> None:
+        try:
+            await self._send_batch(data_entity_list)
+        except Exception as e:
+            if self._error is None:
+                self._error = e
+        finally:
+            self._semaphore.release()
@@ -1,21 +1,45 @@
+import asyncio
 import json
-import sys
+import random
 from datetime import timedelta
 from timeit import default_timer as timer
+from typing import Dict, Optional
 
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientResponse, ClientSession, ClientTimeout, TCPConnector
 from odd_models.models import DataEntityList, DataSourceList
 
+from .. import metrics
+from ..errors import IngestionDataError, PlatformApiError, RegisterDataSourceError
 from ..logger import logger
+from ..utils.profiling import phase
+from .encoding import EncodedPayload, PayloadEncoder
 
 
 class PlatformApi:
+    """Client for ODD Platform ingestion API.
+
+    One keep-alive session is shared by all requests for the collector's lifetime,
+    so consecutive batches reuse already opened connections instead of doing
+    TCP and TLS handshakes for each of them. A session opened in another event loop
+    is closed and replaced. Call `close` when it is not needed anymore.
+
+    Ingestion payloads are serialized and compressed by `encoder`, see
+    `PayloadEncoder`. Requests failed because the platform is unavailable are retried
+    up to `retries` times with exponential backoff starting from
+    `retry_backoff_seconds`.
+    """
+
     def __init__(
         self,
         token: str,
         platform_url: str,
         connection_timeout_seconds: int = 300,
         verify_ssl: bool = False,
+        connection_pool_size: int = 100,
+        encoder: Optional[PayloadEncoder] = None,
+        retries: int = 3,
+        retry_backoff_seconds: float = 1.0,
+        retry_max_backoff_seconds: float = 30.0,
     ) -> None:
         self.platform_url = platform_url
         self.headers = {
@@ -24,55 +48,136 @@ class PlatformApi:
         }
         self.verify_ssl = verify_ssl
         self.timeout = ClientTimeout(total=connection_timeout_seconds)
+        self.connection_pool_size = connection_pool_size
+        self.encoder = encoder or PayloadEncoder()
+        self.retries = retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.retry_max_backoff_seconds = retry_max_backoff_seconds
+        self._session: Optional[ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
 
     async def register_datasource(self, data_source_list: DataSourceList):
-        async with ClientSession(timeout=self.timeout) as session:
-            try:
-                response = await session.post(
-                    url=f"{self.platform_url}/ingestion/datasources",
-                    data=data_source_list.json(),
-                    headers=self.headers,
-                    ssl=self.verify_ssl,
-                )
-                response.raise_for_status()
-                return response
-            except Exception as e:
-                response = response if "response" in locals() else None
-                raise Exception(self._get_exception_message(e, response))
+        try:
+            return await self._post(
+                url=f"{self.platform_url}/ingestion/datasources",
+                data=data_source_list.model_dump_json(),
+            )
+        except PlatformApiError as e:
+            raise RegisterDataSourceError(
+                e.response, data_source_list, e.status
+            ) from e.__cause__
 
     async def ingest_data(self, data_entity_list: DataEntityList):
-        async with ClientSession(timeout=self.timeout) as session:
-            try:
-                json_start = timer()
-                data = data_entity_list.json()
-                logger.debug(
-                    f"Encoded size: {sys.getsizeof(data)/(1024*1024):.3f} MB, took: {timedelta(seconds=timer() - json_start)}"
-                )
+        # encoding is done in a thread, so requests in flight aren't blocked by it
+        payload = await asyncio.to_thread(self._encode, data_entity_list)
+        logger.debug(str(payload))
 
-                ingest_start = timer()
-                response = await session.post(
+        ingest_start = timer()
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._post(
                     url=f"{self.platform_url}/ingestion/entities",
-                    data=data,
-                    headers=self.headers,
-                    ssl=self.verify_ssl,
+                    data=payload.data,
+                    headers=payload.headers,
                 )
-                response.raise_for_status()
-                ingest_end = timer()
+                break
+            except PlatformApiError as e:
+                metrics.record_error()
+                error = IngestionDataError(e.response, data_entity_list, e.status)
+                error.__cause__ = e.__cause__
+                if attempt == self.retries or not error.is_transient:
+                    raise error from e.__cause__
 
-                logger.debug(
-                    f"Ingestion to platform took {timedelta(seconds=ingest_end - ingest_start)}"
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"Ingestion failed, retry in {delay:.1f}s "
+                    f"({attempt + 1}/{self.retries}). {e.response}"
                 )
+                metrics.record_retry()
+                await asyncio.sleep(delay)
+        ingest_end = timer()
+
+        metrics.record_phase("send", ingest_end - ingest_start)
+        metrics.record_batch(
+            entities=len(data_entity_list.items),
+            encoded_bytes=payload.encoded_size,
+            sent_bytes=payload.compressed_size,
+            seconds=ingest_end - ingest_start,
+        )
+        logger.debug(
+            f"Ingestion to platform took {timedelta(seconds=ingest_end - ingest_start)}"
+        )
+        return response
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(
+            self.retry_backoff_seconds * 2**attempt, self.retry_max_backoff_seconds
+        )
+        # jitter spreads retries of concurrent requests
+        return delay * random.uniform(0.5, 1)
+
+    @phase("serialize")
+    def _encode(self, data_entity_list: DataEntityList) -> EncodedPayload:
+        return self.encoder.encode(data_entity_list)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self) -> ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is not loop:
+            await self._close_stale_session()
+
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(
+                timeout=self.timeout,
+                connector=TCPConnector(limit=self.connection_pool_size),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def _close_stale_session(self) -> None:
+        """Closes session opened in another event loop, its connections can't be
+        used by the running one."""
+        session, self._session = self._session, None
+        if session.closed:
+            return
+        try:
+            await session.close()
+        except Exception as e:
+            # transports of an already closed loop can't be closed anymore
+            logger.debug(f"Couldn't close session of a previous event loop: {e}")
+            session.detach()
+
+    async def _post(
+        self, url: str, data, headers: Optional[Dict[str, str]] = None
+    ) -> ClientResponse:
+        body, status = None, None
+        try:
+            session = await self._get_session()
+            async with session.post(
+                url=url,
+                data=data,
+                headers={**self.headers, **(headers or {})},
+                ssl=self.verify_ssl,
+            ) as response:
+                status = response.status
+                # reading the body releases the connection back to the pool
+                body = await response.read()
+                response.raise_for_status()
                 return response
-            except Exception as e:
-                response = response if "response" in locals() else None
-                raise Exception(self._get_exception_message(e, response))
+        except Exception as e:
+            raise PlatformApiError(self._get_exception_message(e, body), status) from e
 
     @staticmethod
-    def _get_exception_message(e, response):
-        if response:
-            platform_response = json.loads(
-                str(response.content._buffer[0].decode("utf-8"))
-            )
+    def _get_exception_message(e, body: Optional[bytes]):
+        if body:
+            try:
+                platform_response = json.loads(body.decode("utf-8"))
+            except ValueError:
+                platform_response = body.decode("utf-8", errors="replace")
             error_msg = (
                 f"Platform response: {platform_response}.\n Exception message: {str(e)}"
             )
@@ -0,0 +1,117 @@
+import gzip
+from dataclasses import dataclass, field
+from datetime import timedelta
+from timeit import default_timer as timer
+from typing import Callable, Dict, Literal, Optional
+
+from pydantic import BaseModel
+
+Serializer = Literal["pydantic", "orjson"]
+Compression = Literal["none", "gzip", "zstd"]
+
+
+@dataclass
+class EncodedPayload:
+    data: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoded_size: int = 0  # size of serialized json in bytes
+    compressed_size: int = 0  # size of sent body in bytes
+    took: timedelta = timedelta()
+
+    def __str__(self) -> str:
+        return (
+            f"Encoded size: {self.encoded_size / (1024 * 1024):.3f} MB, "
+            f"sent size: {self.compressed_size / (1024 * 1024):.3f} MB, took: {self.took}"
+        )
+
+
+class PayloadEncoder:
+    """Serializes and optionally compresses request payloads for the platform.
+
+    Args:
+        serializer: "pydantic" uses pydantic's rust based `model_dump_json`,
+            "orjson" dumps `model_dump` result with orjson (requires `orjson` package).
+        compression: "gzip" or "zstd" (requires `zstandard` package) compresses the body
+            and sets `Content-Encoding` header accordingly, "none" sends raw json.
+        compression_level: compression level, library default is used if not set.
+        exclude_none: skip fields with None values, shrinks payloads a lot for
+            column-heavy entities.
+    """
+
+    def __init__(
+        self,
+        serializer: Serializer = "pydantic",
+        compression: Compression = "none",
+        compression_level: Optional[int] = None,
+        exclude_none: bool = False,
+    ) -> None:
+        self.exclude_none = exclude_none
+        self.compression = compression
+        self._serialize = self._create_serializer(serializer)
+        self._compress = self._create_compressor(compression, compression_level)
+
+    def encode(self, model: BaseModel) -> EncodedPayload:
+        start = timer()
+        data = self._serialize(model)
+        encoded_size = len(data)
+
+        headers = {}
+        if self._compress is not None:
+            data = self._compress(data)
+            headers["Content-Encoding"] = self.compression
+
+        return EncodedPayload(
+            data=data,
+            headers=headers,
+            encoded_size=encoded_size,
+            compressed_size=len(data),
+            took=timedelta(seconds=timer() - start),
+        )
+
+    def _create_serializer(
+        self, serializer: Serializer
+    ) -> Callable[[BaseModel], bytes]:
+        exclude_none = self.exclude_none
+
+        if serializer == "pydantic":
+            return lambda model: model.model_dump_json(
+                exclude_none=exclude_none
+            ).encode("utf-8")
+
+        if serializer == "orjson":
+            try:
+                import orjson
+            except ImportError as e:
+                raise ImportError(
+                    "orjson serializer requires orjson package, install it with `pip install orjson`"
+                ) from e
+
+            return lambda model: orjson.dumps(
+                model.model_dump(mode="json", exclude_none=exclude_none)
+            )
+
+        raise ValueError(f"Unknown serializer {serializer}")
+
+    @staticmethod
+    def _create_compressor(
+        compression: Compression, level: Optional[int]
+    ) -> Optional[Callable[[bytes], bytes]]:
+        if compression == "none":
+            return None
+
+        if compression == "gzip":
+            level = 6 if level is None else level
+            return lambda data: gzip.compress(data, compresslevel=level)
+
+        if compression == "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError(
+                    "zstd compression requires zstandard package, install it with `pip install zstandard`"
+                ) from e
+
+            level = 3 if level is None else level
+            return lambda data: zstandard.compress(data, level)
+
+        raise ValueError(f"Unknown compression {compression}")
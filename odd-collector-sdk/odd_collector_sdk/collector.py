@@ -3,20 +3,32 @@ import logging
 import signal
 import traceback
 from asyncio import AbstractEventLoop
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Union
 
 import tzlocal
+from aiohttp import web
+from apscheduler.events import (
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+    JobEvent,
+)
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from odd_collector_sdk import metrics
 from odd_collector_sdk.api.datasource_api import PlatformApi
+from odd_collector_sdk.api.encoding import PayloadEncoder
 from odd_collector_sdk.domain.adapter import Adapter
 from odd_collector_sdk.domain.collector_config_loader import CollectorConfigLoader
 from odd_collector_sdk.errors import PlatformApiError
-from odd_collector_sdk.job import create_job
+from odd_collector_sdk.job import AbstractJob, create_job
 from odd_collector_sdk.load_adapter import load_adapters
 from odd_collector_sdk.logger import logger
 from odd_collector_sdk.shutdown import shutdown, shutdown_by
+from odd_collector_sdk.spool import Spool
+from odd_collector_sdk.state_store import StateStore
 from odd_collector_sdk.types import PluginFactory
 from odd_collector_sdk.utils.print_version import print_collector_packages_info
 from odd_models.models import DataSource, DataSourceList
@@ -60,13 +72,67 @@ class Collector:
 
         self.config = CollectorConfigLoader(config_path, plugin_factory).load()
         self._adapters = load_adapters(
-            f"{root_package}.{plugins_package}", self.config.plugins
+            f"{root_package}.{plugins_package}",
+            self.config.plugins,
+            self.config.import_time_budget_seconds,
         )
         self._api = PlatformApi(
             token=self.config.token,
             platform_url=self.config.platform_host_url,
             connection_timeout_seconds=self.config.connection_timeout_seconds,
             verify_ssl=self.config.verify_ssl,
+            encoder=PayloadEncoder(
+                serializer=self.config.ingestion_serializer,
+                compression=self.config.ingestion_compression,
+                compression_level=self.config.ingestion_compression_level,
+                exclude_none=self.config.ingestion_exclude_none,
+            ),
+            retries=self.config.ingestion_retries,
+            retry_backoff_seconds=self.config.ingestion_retry_backoff_seconds,
+        )
+        self._executor = self._create_executor()
+        self._state_store = (
+            StateStore(self.config.state_dir)
+            if self.config.incremental_ingestion
+            else None
+        )
+        self._spool = (
+            Spool(
+                Path(self.config.state_dir) / "spool",
+                max_bytes=self.config.spool_max_mb * 1024 * 1024,
+            )
+            if self.config.spool_failed_batches
+            else None
+        )
+        self._metrics_runner: Optional[web.AppRunner] = None
+
+    def _create_executor(self) -> Optional[Executor]:
+        max_workers = self.config.max_workers
+        if not max_workers:
+            return None
+
+        logger.info(
+            f"Synchronous adapters will be run in {self.config.executor_type} pool with {max_workers=}"
+        )
+        if self.config.executor_type == "process":
+            return ProcessPoolExecutor(max_workers=max_workers)
+        return ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="odd-collector"
+        )
+
+    def _create_job(self, adapter: Adapter) -> AbstractJob:
+        return create_job(
+            self._api,
+            adapter,
+            self.config.chunk_size,
+            executor=self._executor,
+            queue_size=self.config.max_queued_batches,
+            max_inflight_batches=self.config.max_inflight_batches,
+            max_batch_bytes=self.config.max_batch_bytes,
+            state_store=self._state_store,
+            full_resync_interval_hours=self.config.full_resync_interval_hours,
+            profiling_dir=self.config.profiling_dir if self.config.profiling else None,
+            spool=self._spool,
         )
 
     def start_polling(self):
@@ -77,7 +143,7 @@ class Collector:
         scheduler = AsyncIOScheduler(timezone=str(tzlocal.get_localzone()))
         for adapter in self._adapters:
             scheduler.add_job(
-                create_job(self._api, adapter, self.config.chunk_size).start,
+                self._create_job(adapter).start,
                 "interval",
                 minutes=self.config.default_pulling_interval,
                 next_run_time=datetime.now(),
@@ -86,8 +152,24 @@ class Collector:
                 coalesce=True,
                 id=adapter.config.name,
             )
+        scheduler.add_listener(
+            self._on_scheduler_event,
+            EVENT_JOB_SUBMITTED | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES,
+        )
         scheduler.start()
 
+    @staticmethod
+    def _on_scheduler_event(event: JobEvent) -> None:
+        if event.code == EVENT_JOB_SUBMITTED:
+            scheduled_at = event.scheduled_run_times[-1]
+            delay = datetime.now(scheduled_at.tzinfo) - scheduled_at
+            metrics.SCHEDULER_DELAY.observe(
+                max(delay.total_seconds(), 0), plugin=event.job_id
+            )
+        else:
+            logger.warning(f"[{event.job_id}] scheduled run was skipped.")
+            metrics.SCHEDULER_MISFIRES.inc(plugin=event.job_id)
+
     async def register_data_sources(self):
         data_sources: List[DataSource] = [
             DataSource(
@@ -102,9 +184,7 @@ class Collector:
 
     async def one_time_run(self):
         tasks = [
-            asyncio.create_task(
-                create_job(self._api, adapter, self.config.chunk_size).start()
-            )
+            asyncio.create_task(self._create_job(adapter).start())
             for adapter in self._adapters
         ]
 
@@ -120,6 +200,13 @@ class Collector:
                     s, lambda s=s: asyncio.create_task(shutdown_by(s, loop))
                 )
 
+            if self.config.metrics_port:
+                self._metrics_runner = loop.run_until_complete(
+                    metrics.start_metrics_server(
+                        self.config.metrics_port, self.config.metrics_host
+                    )
+                )
+
             loop.run_until_complete(self.register_data_sources())
 
             interval = self.config.default_pulling_interval
@@ -139,3 +226,11 @@ class Collector:
             logger.debug(traceback.format_exc())
             logger.error(e)
             loop.run_until_complete(shutdown(loop))
+        finally:
+            loop.run_until_complete(self._api.close())
+            if self._metrics_runner is not None:
+                loop.run_until_complete(self._metrics_runner.cleanup())
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            if self._state_store is not None:
+                self._state_store.close()
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import AsyncIterator, Iterator, Union
 
 from odd_collector_sdk.domain.plugin import Config
-from odd_models.models import DataEntityList
+from odd_models.models import DataEntity, DataEntityList
 from oddrn_generator import Generator
 
 
@@ -44,4 +44,48 @@ class AsyncAbstractAdapter(ABC):
         pass
 
 
-Adapter = Union[BaseAdapter, AsyncAbstractAdapter, AbstractAdapter]
+class StreamingAdapter(AbstractAdapter, ABC):
+    """Adapter which yields data entities one by one.
+
+    Job splits entities into batches and sends them while they are being produced,
+    so the whole DataEntityList is never kept in memory.
+
+    Example:
+        >>> class Adapter(BaseAdapter, StreamingAdapter):
+        >>>     def get_data_entities(self) -> Iterator[DataEntity]:
+        >>>         for table in self.client.get_tables():
+        >>>             yield map_table(table, self.generator)
+    """
+
+    @abstractmethod
+    def get_data_entities(self) -> Iterator[DataEntity]:
+        pass
+
+    def get_data_entity_list(self) -> DataEntityList:
+        return DataEntityList(
+            data_source_oddrn=self.get_data_source_oddrn(),
+            items=list(self.get_data_entities()),
+        )
+
+
+class AsyncStreamingAdapter(AsyncAbstractAdapter, ABC):
+    """Async version of StreamingAdapter, `get_data_entities` is an async generator."""
+
+    @abstractmethod
+    def get_data_entities(self) -> AsyncIterator[DataEntity]:
+        pass
+
+    async def get_data_entity_list(self) -> DataEntityList:
+        return DataEntityList(
+            data_source_oddrn=self.get_data_source_oddrn(),
+            items=[entity async for entity in self.get_data_entities()],
+        )
+
+
+Adapter = Union[
+    BaseAdapter,
+    AsyncAbstractAdapter,
+    AbstractAdapter,
+    StreamingAdapter,
+    AsyncStreamingAdapter,
+]
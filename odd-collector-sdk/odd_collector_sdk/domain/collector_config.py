@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Type, Union
+from typing import Dict, List, Literal, Optional, Type, Union
 
 from pydantic_settings import BaseSettings
 
@@ -17,6 +17,9 @@ class CollectorConfig(BaseSettings):
     plugins: List[Plugin]
     platform_host_url: str
     chunk_size: int = 250
+    max_batch_bytes: Optional[
+        int
+    ] = None  # estimated size limit of one ingestion request, only chunk_size is used if not set
     misfire_grace_time: Optional[
         int
     ] = None  # seconds after the designated runtime that the job is still allowed to be run
@@ -24,6 +27,36 @@ class CollectorConfig(BaseSettings):
         int
     ] = 1  # maximum number of concurrently running instances allowed
     verify_ssl: bool = True
+    max_workers: Optional[
+        int
+    ] = None  # size of the worker pool for synchronous adapters, if not set they run inside the event loop
+    executor_type: Literal["thread", "process"] = "thread"
+    max_queued_batches: int = 4  # batches buffered between a worker and the event loop
+    max_inflight_batches: int = 2  # ingestion requests sent concurrently by one job
+    ingestion_serializer: Literal["pydantic", "orjson"] = "pydantic"
+    ingestion_compression: Literal["none", "gzip", "zstd"] = "none"
+    ingestion_compression_level: Optional[int] = None
+    ingestion_exclude_none: bool = False  # skip None values in ingestion payloads
+    # retries of requests failed because the platform is unavailable
+    ingestion_retries: int = 3
+    # delay before the first retry, doubled for next ones
+    ingestion_retry_backoff_seconds: float = 1.0
+    # spool batches failed after retries to state_dir and send them later
+    spool_failed_batches: bool = False
+    spool_max_mb: int = 1024  # size limit of one plugin's spool
+    state_dir: str = ".odd_collector_state"  # directory for collector's local state
+    # send only entities changed since the previous run
+    incremental_ingestion: bool = False
+    # hours between forced full runs for incremental ingestion
+    full_resync_interval_hours: Optional[int] = 24
+    metrics_port: Optional[
+        int
+    ] = None  # port of the Prometheus metrics endpoint, not exposed if not set
+    metrics_host: str = "0.0.0.0"
+    profiling: bool = False  # profile phases of runs, see utils.profiling
+    profiling_dir: str = ".odd_collector_profiles"  # directory for profiling reports
+    # warn when importing adapters at startup takes longer
+    import_time_budget_seconds: Optional[float] = None
 
 
 def load_config(
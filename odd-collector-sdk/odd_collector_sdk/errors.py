@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional
 
 from odd_models.models import DataEntityList, DataSourceList
@@ -26,9 +27,11 @@ class LoadConfigError(Exception):
 
 class PlatformApiError(Exception):
     response: str
+    status: Optional[int]
 
-    def __init__(self, response) -> None:
+    def __init__(self, response, status: Optional[int] = None) -> None:
         self.response = response
+        self.status = status
         super().__init__(self.message)
 
     @property
@@ -47,16 +50,38 @@ class IngestionDataError(PlatformApiError):
     def message(self):
         return f"Could not ingest data. Reason: {self.response}"
 
-    def __init__(self, response, data_entity_list: DataEntityList) -> None:
-        super().__init__(response)
+    def __init__(
+        self,
+        response,
+        data_entity_list: DataEntityList,
+        status: Optional[int] = None,
+    ) -> None:
+        super().__init__(response, status)
         self.data_entity_list = data_entity_list
 
+    @property
+    def is_payload_too_large(self) -> bool:
+        """Platform rejected the batch as too large, smaller batches may pass."""
+        return self.status == 413
+
+    @property
+    def is_transient(self) -> bool:
+        """Platform is unavailable or overloaded, the same request may pass later."""
+        if self.status is None:
+            return not isinstance(self.__cause__, asyncio.TimeoutError)
+        return self.status in (429, 502, 503, 504)
+
 
 class RegisterDataSourceError(PlatformApiError):
     data_source_list: DataSourceList
 
-    def __init__(self, response, data_source_list: DataSourceList) -> None:
-        super().__init__(response)
+    def __init__(
+        self,
+        response,
+        data_source_list: DataSourceList,
+        status: Optional[int] = None,
+    ) -> None:
+        super().__init__(response, status)
         self.data_source_list = data_source_list
 
     @property
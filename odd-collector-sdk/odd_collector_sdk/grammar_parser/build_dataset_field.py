@@ -1,7 +1,7 @@
 from pathlib import Path
 from typing import Any
 
-from lark import Lark, Token, Tree
+from lark import Token, Tree
 from odd_models import DataSetField, DataSetFieldType, Type
 from oddrn_generator import Generator
 
@@ -17,6 +17,7 @@ from .field_types import (
     StructType,
     UnionType,
 )
+from .parse_cache import open_parser, parse
 
 
 class DatasetFieldBuilder:
@@ -31,8 +32,8 @@ class DatasetFieldBuilder:
         self.data_source = data_source
         self.odd_types_map = odd_types_map
         self.oddrn_generator = oddrn_generator
-        self.parser = Lark.open(
-            str(parser_config_path), rel_to=__file__, parser=parser_type, start="type"
+        self.parser = open_parser(
+            str(parser_config_path), rel_to=__file__, parser=parser_type
         )
 
     def build_dataset_field(self, field: Any) -> list[DataSetField]:
@@ -40,7 +41,7 @@ class DatasetFieldBuilder:
         oddrn_generator = self.oddrn_generator
         parser_input = str(field.type)
         logger.debug(f"Build dataset field for {field.name} with type {parser_input}")
-        type_tree = self.parser.parse(parser_input)
+        type_tree = parse(self.parser, parser_input)
         field_type = self.traverse_tree(type_tree)
         generated_dataset_fields = []
 
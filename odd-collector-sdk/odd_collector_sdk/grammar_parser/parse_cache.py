@@ -0,0 +1,92 @@
+"""
+Shared cache of parsed type strings.
+
+Catalogs have a few hundred distinct column types across millions of columns, so
+Lark parsers of type grammars are called through `parse`, which keeps parse trees
+of recently parsed strings of every grammar in one bounded LRU cache:
+
+    >>> parser = Lark.open("field_types.lark", rel_to=__file__, start="type")
+    >>> tree = parse(parser, "array<struct<a:int>>")
+
+Trees are shared between callers, so they must not be modified, lark's Transformer
+and Visitor, unlike their *_InPlace variants, don't modify a tree.
+
+Parsers built per column, like DatasetFieldBuilder's, are opened with `open_parser`,
+so a grammar is compiled once and trees of its parser are found in the cache.
+Module level parsers are `LazyParser`s, compiled on the first parse instead of import:
+
+    >>> parser = LazyParser("field_types.lark", rel_to=__file__)
+
+When ODD_GRAMMAR_CACHE_DIR environment variable is set, compiled LALR grammars are
+saved there with lark's cache, and loaded instead of being compiled on next starts.
+"""
+import hashlib
+import os
+from functools import lru_cache
+from typing import Optional, Union
+
+from lark import Lark, Tree
+
+from ..logger import logger
+
+PARSE_CACHE_SIZE = 4096
+GRAMMAR_CACHE_DIR_ENV = "ODD_GRAMMAR_CACHE_DIR"
+
+
+def _grammar_cache_file(grammar_path: str, parser: str, start: str) -> Optional[str]:
+    cache_dir = os.getenv(GRAMMAR_CACHE_DIR_ENV)
+    if not cache_dir or parser != "lalr":
+        return None
+
+    # lark checks grammar's content itself, file name only keeps grammars apart
+    key = hashlib.md5(f"{grammar_path}:{start}".encode()).hexdigest()
+    name = os.path.splitext(os.path.basename(grammar_path))[0]
+    return os.path.join(cache_dir, f"{name}_{key}.lark_cache")
+
+
+@lru_cache(maxsize=None)
+def open_parser(
+    grammar_path: str,
+    rel_to: Optional[str] = None,
+    parser: str = "lalr",
+    start: str = "type",
+) -> Lark:
+    """Compile grammar once, the same parser is returned for the same arguments."""
+    if rel_to:
+        grammar_path = os.path.join(os.path.dirname(rel_to), grammar_path)
+
+    cache_file = _grammar_cache_file(os.path.abspath(grammar_path), parser, start)
+    if cache_file:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            return Lark.open(grammar_path, parser=parser, start=start, cache=cache_file)
+        except OSError as e:
+            logger.warning(f"Could not use grammar cache {cache_file}: {e}")
+
+    return Lark.open(grammar_path, parser=parser, start=start)
+
+
+class LazyParser:
+    """Parser of a grammar, which is compiled on the first parse."""
+
+    def __init__(
+        self,
+        grammar_path: str,
+        rel_to: Optional[str] = None,
+        parser: str = "lalr",
+        start: str = "type",
+    ) -> None:
+        self._args = (grammar_path, rel_to, parser, start)
+
+    @property
+    def parser(self) -> Lark:
+        return open_parser(*self._args)
+
+    def parse(self, text: str) -> Tree:
+        return self.parser.parse(text)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse(parser: Union[Lark, LazyParser], text: str) -> Tree:
+    """Parse text with parser, trees are cached by (parser, text)."""
+    return parser.parse(text)
@@ -1,46 +1,290 @@
 import asyncio
+import contextvars
+import json
+import threading
 import traceback as tb
+from concurrent.futures import Executor, ProcessPoolExecutor
 from contextlib import contextmanager
 from datetime import timedelta
 from inspect import isasyncgenfunction, iscoroutinefunction
 from timeit import default_timer as timer
-from typing import Any, Generator, Iterable, Union
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Union,
+)
 
-from funcy import chunks
+from odd_collector_sdk.api.batch_sender import BatchSender
 from odd_collector_sdk.api.datasource_api import PlatformApi
-from odd_collector_sdk.domain.adapter import Adapter
-from odd_models.models import DataEntityList
+from odd_collector_sdk.domain.adapter import (
+    Adapter,
+    AsyncStreamingAdapter,
+    StreamingAdapter,
+)
+from odd_collector_sdk.errors import IngestionDataError
+from odd_collector_sdk.spool import Spool, SpoolFullError
+from odd_collector_sdk.state_store import IncrementalRun, StateStore
+from odd_collector_sdk.utils.batching import BatchBuilder, split_by_size
+from odd_collector_sdk.utils.profiling import RunProfiler, current_profiler
+from odd_models.models import DataEntity, DataEntityList
 
+from . import metrics
 from .logger import logger
 
 
 @contextmanager
-def log_execution(name):
+def profile_phases(profiler: Optional[RunProfiler]):
+    """Makes phases marked inside the block profiled by profiler, see `utils.profiling`."""
+    if profiler is None:
+        yield
+        return
+
+    token = current_profiler.set(profiler)
+    profiler.start()
     try:
-        start = timer()
-        logger.info(f"[{name}] collecting metadata started.")
         yield
-    except Exception as e:
-        logger.debug(tb.format_exc())
-        logger.error(f"[{name}] failed.\n {e}")
-    else:
-        end = timer()
-        logger.success(
-            f"[{name}] metadata collected in {timedelta(seconds=end - start)}."
-        )
+    finally:
+        profiler.stop()
+        current_profiler.reset(token)
+
+
+@contextmanager
+def log_execution(name, profiling_dir: Optional[str] = None):
+    profiler = RunProfiler(name) if profiling_dir is not None else None
+    with metrics.track_run(name) as summary, profile_phases(profiler):
+        try:
+            start = timer()
+            logger.info(f"[{name}] collecting metadata started.")
+            yield
+        except Exception as e:
+            summary.status = "failed"
+            logger.debug(tb.format_exc())
+            logger.error(f"[{name}] failed.\n {e}")
+        else:
+            summary.status = "success"
+            end = timer()
+            logger.success(
+                f"[{name}] metadata collected in {timedelta(seconds=end - start)}."
+            )
+    logger.info(f"[{name}] run summary: {json.dumps(summary.as_dict())}")
+    if profiler is not None:
+        report_path = profiler.dump(profiling_dir, summary)
+        logger.info(f"[{name}] profiling report is written to {report_path}")
 
 
 class AbstractJob:
-    def __init__(self, api: PlatformApi, adapter: Adapter, chunk_size: int = 250):
+    def __init__(
+        self,
+        api: PlatformApi,
+        adapter: Adapter,
+        chunk_size: int = 250,
+        max_inflight_batches: int = 2,
+        max_batch_bytes: Optional[int] = None,
+        state_store: Optional[StateStore] = None,
+        full_resync_interval_hours: Optional[int] = None,
+        profiling_dir: Optional[str] = None,
+        spool: Optional[Spool] = None,
+    ):
         self._api = api
         self._adapter: Adapter = adapter
         self._chunk_size = chunk_size
+        self._max_inflight_batches = max_inflight_batches
+        self._max_batch_bytes = max_batch_bytes
+        self._state_store = state_store
+        self._full_resync_interval_hours = full_resync_interval_hours
+        self._profiling_dir = profiling_dir
+        self._spool = spool
+        self._replay_lock: Optional[asyncio.Lock] = None
 
-    async def start() -> None:
-        ...
+    async def start(self) -> None:
+        with log_execution(self._adapter.config.name, self._profiling_dir):
+            await self._ingest(self._get_data_entity_list())
+
+    def _get_data_entity_list(
+        self,
+    ) -> Union[Iterable[DataEntityList], AsyncIterable[DataEntityList]]:
+        raise NotImplementedError
 
     async def send_metadata(self, metadata: DataEntityList):
-        await self._api.ingest_data(metadata)
+        try:
+            await self._api.ingest_data(metadata)
+        except IngestionDataError as e:
+            if not e.is_payload_too_large or len(metadata.items) < 2:
+                raise
+
+            half = len(metadata.items) // 2
+            metrics.record_retry()
+            logger.warning(
+                f"[{self._adapter.config.name}] Platform couldn't handle batch with "
+                f"{len(metadata.items)} items, retry with batches of {half} items."
+            )
+            for items in (metadata.items[:half], metadata.items[half:]):
+                await self.send_metadata(
+                    DataEntityList(
+                        data_source_oddrn=metadata.data_source_oddrn, items=items
+                    )
+                )
+
+    def _spool_batch(self, metadata: DataEntityList, error: IngestionDataError) -> bool:
+        """Spools a batch which couldn't be sent because the platform is unavailable."""
+        if self._spool is None or not error.is_transient:
+            return False
+
+        name = self._adapter.config.name
+        try:
+            self._spool.append(name, metadata)
+        except SpoolFullError as e:
+            logger.error(f"[{name}] {e}")
+            return False
+
+        metrics.record_spooled()
+        logger.warning(
+            f"[{name}] Platform is unavailable, batch with {len(metadata.items)} items "
+            f"is spooled to be sent later. {error}"
+        )
+        return True
+
+    async def _replay_spool(self, sent_oddrns: Set[str]) -> None:
+        """Sends spooled batches in order, stops at the first one failed because
+        the platform is unavailable. Batches rejected by the platform are dropped.
+
+        Entities already sent by the current run are skipped, so spooled older
+        versions don't override them.
+        """
+        name = self._adapter.config.name
+        if self._spool.size(name) == 0 or self._replay_lock.locked():
+            return
+
+        async with self._replay_lock:
+            offset = 0
+            try:
+                for next_offset, metadata in self._spool.read(name):
+                    if metadata is not None:
+                        items = [
+                            e for e in metadata.items if e.oddrn not in sent_oddrns
+                        ]
+                        try:
+                            if items:
+                                await self.send_metadata(
+                                    DataEntityList(
+                                        data_source_oddrn=metadata.data_source_oddrn,
+                                        items=items,
+                                    )
+                                )
+                        except IngestionDataError as e:
+                            if e.is_transient:
+                                logger.warning(
+                                    f"[{name}] Couldn't replay spooled batches. {e}"
+                                )
+                                break
+                            logger.error(
+                                f"[{name}] Spooled batch with {len(items)} items "
+                                f"was rejected and is dropped. {e}"
+                            )
+                        else:
+                            metrics.record_replayed()
+                    offset = next_offset
+            finally:
+                if offset:
+                    self._spool.consume(name, offset)
+
+    def _chunks(self, items: Iterable[DataEntity]) -> Iterable[List[DataEntity]]:
+        return split_by_size(items, self._chunk_size, self._max_batch_bytes)
+
+    def _iter_batches(self) -> Generator[DataEntityList, Any, Any]:
+        """Batches of a synchronous adapter."""
+        if isinstance(self._adapter, StreamingAdapter):
+            return self._split_entities(self._adapter.get_data_entities())
+        return self._split(self._adapter.get_data_entity_list())
+
+    def _split_entities(
+        self, entities: Iterable[DataEntity]
+    ) -> Generator[DataEntityList, Any, Any]:
+        data_source_oddrn = self._adapter.get_data_source_oddrn()
+        for index, items in enumerate(self._chunks(entities), start=1):
+            logger.debug(
+                f"[{self._adapter.config.name}] Yield batch #{index} with {len(items)} items"
+            )
+            yield DataEntityList(data_source_oddrn=data_source_oddrn, items=items)
+
+    async def _ingest(
+        self,
+        data_entity_lists: Union[
+            Iterable[DataEntityList], AsyncIterable[DataEntityList]
+        ],
+    ) -> None:
+        """Sends batches with up to max_inflight_batches requests in flight.
+
+        With a state store only entities changed since the previous run are sent.
+        With a spool batches failed because the platform is unavailable are spooled
+        instead of failing the run, and replayed before the run's batches and
+        whenever a batch is sent successfully.
+        """
+        incremental_run = None
+        if self._state_store is not None:
+            incremental_run = IncrementalRun(
+                self._state_store,
+                self._adapter.config.name,
+                self._full_resync_interval_hours,
+            )
+
+        sent_oddrns: Set[str] = set()
+        if self._spool is not None:
+            self._replay_lock = asyncio.Lock()
+            await self._replay_spool(sent_oddrns)
+
+        async def send(del_: DataEntityList):
+            try:
+                await self.send_metadata(del_)
+            except IngestionDataError as e:
+                if self._spool_batch(del_, e):
+                    return
+                raise
+
+            if incremental_run is not None:
+                incremental_run.commit(del_)
+            if self._spool is not None:
+                sent_oddrns.update(entity.oddrn for entity in del_.items)
+                await self._replay_spool(sent_oddrns)
+
+        async def submit(del_: DataEntityList):
+            if incremental_run is not None:
+                del_ = incremental_run.filter(del_)
+                if not del_.items:
+                    return
+            await sender.submit(del_)
+
+        sender = BatchSender(send, self._max_inflight_batches)
+        try:
+            # time between batches is spent by the adapter on fetching and mapping
+            start = timer()
+            if hasattr(data_entity_lists, "__aiter__"):
+                async for del_ in data_entity_lists:
+                    metrics.record_phase("adapter", timer() - start)
+                    await submit(del_)
+                    start = timer()
+            else:
+                for del_ in data_entity_lists:
+                    metrics.record_phase("adapter", timer() - start)
+                    await submit(del_)
+                    start = timer()
+            metrics.record_phase("adapter", timer() - start)
+        except BaseException:
+            await sender.cancel()
+            raise
+        finally:
+            if hasattr(data_entity_lists, "aclose"):
+                await data_entity_lists.aclose()
+        await sender.join()
+
+        if incremental_run is not None:
+            incremental_run.finish()
 
     def _split(
         self, data_entity_lists: Union[DataEntityList, Iterable[DataEntityList]]
@@ -50,7 +294,7 @@ class AbstractJob:
 
         for data_entity_list in data_entity_lists:
             for index, items in enumerate(
-                chunks(self._chunk_size, data_entity_list.items), start=1
+                self._chunks(data_entity_list.items), start=1
             ):
                 logger.debug(
                     f"[{self._adapter.config.name}] Yield batch #{index} with {len(items)} items"
@@ -61,17 +305,12 @@ class AbstractJob:
 
 
 class AsyncGeneratorJob(AbstractJob):
-    async def start(self):
-        with log_execution(self._adapter.config.name):
-            async for del_ in self._get_data_entity_list():
-                await self.send_metadata(metadata=del_)
-
     async def _split(
         self, data_entity_lists: Union[DataEntityList, Iterable[DataEntityList]]
     ) -> Generator[DataEntityList, Any, Any]:
         async for data_entity_list in data_entity_lists:
             for index, items in enumerate(
-                chunks(self._chunk_size, data_entity_list.items), start=1
+                self._chunks(data_entity_list.items), start=1
             ):
                 logger.debug(
                     f"[{self._adapter.config.name}] Yield batch #{index} with {len(items)} items"
@@ -87,14 +326,6 @@ class AsyncGeneratorJob(AbstractJob):
 
 
 class AsyncJob(AbstractJob):
-    async def start(self):
-        with log_execution(self._adapter.config.name):
-            tasks = []
-            async for del_ in self._get_data_entity_list():
-                task = asyncio.create_task(self.send_metadata(metadata=del_))
-                tasks.append(task)
-            await asyncio.gather(*tasks)
-
     async def _get_data_entity_list(self) -> Generator[DataEntityList, Any, Any]:
         data_entity_lists = await self._adapter.get_data_entity_list()
         for data_entity_list in self._split(data_entity_lists):
@@ -102,22 +333,144 @@ class AsyncJob(AbstractJob):
 
 
 class SyncJob(AbstractJob):
-    async def start(self):
-        with log_execution(self._adapter.config.name):
-            for del_ in self._get_data_entity_list():
-                await self.send_metadata(metadata=del_)
-
     def _get_data_entity_list(self) -> Generator[DataEntityList, Any, Any]:
-        data_entity_lists = self._adapter.get_data_entity_list()
-        yield from self._split(data_entity_lists)
+        yield from self._iter_batches()
+
+
+class AsyncStreamingJob(AbstractJob):
+    async def _get_data_entity_list(self) -> AsyncGenerator[DataEntityList, Any]:
+        data_source_oddrn = self._adapter.get_data_source_oddrn()
+        builder = BatchBuilder(self._chunk_size, self._max_batch_bytes)
+
+        async for entity in self._adapter.get_data_entities():
+            items = builder.add(entity)
+            if items is not None:
+                yield DataEntityList(data_source_oddrn=data_source_oddrn, items=items)
+
+        items = builder.flush()
+        if items is not None:
+            yield DataEntityList(data_source_oddrn=data_source_oddrn, items=items)
+
+
+_DONE = object()
+
+
+def fetch_data_entity_lists(adapter: Adapter) -> List[DataEntityList]:
+    """Collects all data entity lists of a synchronous adapter.
+
+    Defined at module level, so it can be submitted to a process pool.
+    """
+    data_entity_lists = adapter.get_data_entity_list()
+    if isinstance(data_entity_lists, DataEntityList):
+        return [data_entity_lists]
+    return list(data_entity_lists)
 
 
-def create_job(api: PlatformApi, adapter: Adapter, chunk_size: int) -> AbstractJob:
+class ExecutorJob(AbstractJob):
+    """Runs a synchronous adapter in a worker pool instead of the event loop.
+
+    With a thread pool batches are streamed back to the event loop through a bounded
+    queue, so the worker is paused while the platform is busy with previous batches.
+    A process pool can't share the queue, so the adapter's result is collected in the
+    worker process and split into batches afterwards. Adapter must be picklable then.
+    """
+
+    def __init__(
+        self,
+        *args,
+        executor: Optional[Executor] = None,
+        queue_size: int = 4,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._executor = executor
+        self._queue_size = queue_size
+
+    async def _get_data_entity_list(self) -> AsyncGenerator[DataEntityList, Any]:
+        loop = asyncio.get_running_loop()
+
+        if isinstance(self._executor, ProcessPoolExecutor):
+            data_entity_lists = await loop.run_in_executor(
+                self._executor, fetch_data_entity_lists, self._adapter
+            )
+            for data_entity_list in self._split(data_entity_lists):
+                yield data_entity_list
+            return
+
+        queue = asyncio.Queue(maxsize=self._queue_size)
+        stopped = threading.Event()
+        # context is copied, so phases marked by the adapter are attributed to this run
+        context = contextvars.copy_context()
+        producer = loop.run_in_executor(
+            self._executor, context.run, self._produce, queue, loop, stopped
+        )
+        try:
+            while (data_entity_list := await queue.get()) is not _DONE:
+                yield data_entity_list
+            await producer
+        finally:
+            if not producer.done():
+                stopped.set()
+                while not queue.empty():
+                    queue.get_nowait()
+
+    def _produce(
+        self,
+        queue: asyncio.Queue,
+        loop: asyncio.AbstractEventLoop,
+        stopped: threading.Event,
+    ) -> None:
+        def put(item) -> None:
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+        try:
+            for data_entity_list in self._iter_batches():
+                if stopped.is_set():
+                    return
+                put(data_entity_list)
+        finally:
+            if not stopped.is_set():
+                put(_DONE)
+
+
+def create_job(
+    api: PlatformApi,
+    adapter: Adapter,
+    chunk_size: int,
+    executor: Optional[Executor] = None,
+    queue_size: int = 4,
+    max_inflight_batches: int = 2,
+    max_batch_bytes: Optional[int] = None,
+    state_store: Optional[StateStore] = None,
+    full_resync_interval_hours: Optional[int] = None,
+    profiling_dir: Optional[str] = None,
+    spool: Optional[Spool] = None,
+) -> AbstractJob:
+    kwargs = dict(
+        chunk_size=chunk_size,
+        max_inflight_batches=max_inflight_batches,
+        max_batch_bytes=max_batch_bytes,
+        state_store=state_store,
+        full_resync_interval_hours=full_resync_interval_hours,
+        profiling_dir=profiling_dir,
+        spool=spool,
+    )
+
+    if isinstance(adapter, AsyncStreamingAdapter):
+        logger.debug(f"Is an async streaming {adapter.config.name=}")
+        return AsyncStreamingJob(api, adapter, **kwargs)
     if isasyncgenfunction(adapter.get_data_entity_list):
         logger.debug(f"Is an async generator {adapter.config.name=}")
-        return AsyncGeneratorJob(api, adapter, chunk_size)
+        return AsyncGeneratorJob(api, adapter, **kwargs)
     if iscoroutinefunction(adapter.get_data_entity_list):
         logger.debug(f"Is an async {adapter.config.name=}")
-        return AsyncJob(api, adapter, chunk_size)
+        return AsyncJob(api, adapter, **kwargs)
+    if executor is not None:
+        logger.debug(
+            f"Is a sync, run in {type(executor).__name__} {adapter.config.name=}"
+        )
+        return ExecutorJob(
+            api, adapter, executor=executor, queue_size=queue_size, **kwargs
+        )
     else:
-        return SyncJob(api, adapter, chunk_size)
+        return SyncJob(api, adapter, **kwargs)
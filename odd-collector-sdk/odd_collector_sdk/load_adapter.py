@@ -1,7 +1,8 @@
+import time
 from functools import cache
 from importlib import import_module
-from pathlib import Path
 from types import ModuleType
+from typing import Optional
 
 from odd_collector_sdk.domain.adapter import Adapter
 from odd_collector_sdk.logger import logger
@@ -9,47 +10,42 @@ from odd_collector_sdk.logger import logger
 from .domain.plugin import Plugin
 
 
-def file_match(path: Path) -> bool:
-    return path.name.endswith(".py") and not path.name.startswith("__")
-
-
-def import_submodules(package: ModuleType) -> None:
-    package_name = package.__name__
-    package_path = Path(package.__file__).parent
-
-    all_files = package_path.glob("*")
-    python_modules = filter(file_match, all_files)
-
-    for file in python_modules:
-        module_name = f"{package_name}.{file.stem}"
-        module = import_module(module_name)
-
-        if file.is_dir():
-            import_submodules(module)
-
-
 @cache
 def load_package(package_path: str) -> ModuleType:
+    """Import adapter's package and its `adapter` module.
+
+    Other modules of the package aren't imported eagerly, the adapter imports what
+    it needs, so unused heavy dependencies don't slow down collector's startup.
+    """
     package = import_module(package_path)
-    import_submodules(package)
+    import_module(f"{package_path}.adapter")
     return package
 
 
-def load_adapters(root_package: str, plugins: list[Plugin]) -> list[Adapter]:
+def load_adapters(
+    root_package: str,
+    plugins: list[Plugin],
+    import_time_budget: Optional[float] = None,
+) -> list[Adapter]:
     """Load adapters from plugins.
 
     Args:
         root_package (str): adapters root package, i.e "odd_collector.adapters"
         plugins (list[Plugin]): list of plugins (configurations) for adapters
+        import_time_budget (float): seconds importing adapters may take, a warning
+            is logged when exceeded
 
     Returns:
         list[Adapter]: list of initialized adapters
     """
     adapters = []
+    import_times: dict[str, float] = {}
 
     for plugin in plugins:
         logger.debug(f"Loading adapter for {plugin.type=} with {plugin.name=} plugin")
+        started_at = time.perf_counter()
         package = load_package(f"{root_package}.{plugin.type}")
+        import_times.setdefault(plugin.type, time.perf_counter() - started_at)
 
         adapter = package.adapter.Adapter(plugin)
         if not hasattr(adapter, "config") or adapter.config is None:
@@ -58,4 +54,22 @@ def load_adapters(root_package: str, plugins: list[Plugin]) -> list[Adapter]:
         adapters.append(adapter)
 
     logger.success(f"Loaded {len(adapters)} adapters!")
+    report_import_times(import_times, import_time_budget)
     return adapters
+
+
+def report_import_times(
+    import_times: dict[str, float], budget: Optional[float] = None
+) -> None:
+    total = sum(import_times.values())
+    report = ", ".join(
+        f"{name}: {seconds:.3f}s"
+        for name, seconds in sorted(import_times.items(), key=lambda x: -x[1])
+    )
+    logger.info(f"Imported adapters in {total:.3f}s ({report})")
+
+    if budget is not None and total > budget:
+        logger.warning(
+            f"Importing adapters took {total:.3f}s, more than {budget}s budget. "
+            "Run collector with `python -X importtime` to find slow imports."
+        )
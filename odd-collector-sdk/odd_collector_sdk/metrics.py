@@ -0,0 +1,343 @@
+"""
+Collector's performance metrics.
+
+Metrics are kept in memory and can be exposed in Prometheus text format on
+`metrics_port` of collector config, see `start_metrics_server`. Every job run
+also collects a `RunSummary`, which is logged when the run is finished.
+
+Plugin's name for metric labels is taken from `current_run` context variable,
+which is set by the job and inherited by tasks and threads it starts with context.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+from .logger import logger
+
+DURATION_BUCKETS = (0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+BYTES_BUCKETS = tuple(1024 * 4**power for power in range(10))  # 1KB .. 256MB
+ENTITIES_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 5000, 10000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"),
+        )
+        for name, value in zip(names, values)
+    )
+    return f"{{{pairs}}}"
+
+
+class Metric:
+    type: str
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self._samples(),
+        ]
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._label_values(labels), 0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DURATION_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # per labels: counts for each bucket and +Inf, sum of observed values
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0))
+            counts[bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def get_count(self, **labels: str) -> int:
+        counts, _ = self._values.get(self._label_values(labels), ([], 0))
+        return sum(counts)
+
+    def get_sum(self, **labels: str) -> float:
+        return self._values.get(self._label_values(labels), ([], 0))[1]
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._values.items()
+            ]
+
+        names = (*self.labelnames, "le")
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(names, (*key, bound))} {cumulative}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=("plugin",)) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames=("plugin",),
+    ) -> Histogram:
+        return self.register(
+            Histogram(name, documentation, labelnames, buckets=buckets)
+        )
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+JOB_RUNS = REGISTRY.counter(
+    "odd_collector_job_runs_total", "Finished job runs.", ("plugin", "status")
+)
+JOB_DURATION = REGISTRY.histogram(
+    "odd_collector_job_duration_seconds", "Duration of job runs.", DURATION_BUCKETS
+)
+PHASE_DURATION = REGISTRY.histogram(
+    "odd_collector_phase_duration_seconds",
+    "Time spent in a phase of a job run, i.e. adapter, serialize, send.",
+    DURATION_BUCKETS,
+    ("plugin", "phase"),
+)
+ENTITIES = REGISTRY.counter(
+    "odd_collector_entities_total", "Data entities sent to the platform."
+)
+BATCH_ENTITIES = REGISTRY.histogram(
+    "odd_collector_batch_entities", "Number of entities in a batch.", ENTITIES_BUCKETS
+)
+BATCH_ENCODED_BYTES = REGISTRY.histogram(
+    "odd_collector_batch_encoded_bytes", "Serialized size of a batch.", BYTES_BUCKETS
+)
+BATCH_SENT_BYTES = REGISTRY.histogram(
+    "odd_collector_batch_sent_bytes",
+    "Size of a batch's request body, after compression.",
+    BYTES_BUCKETS,
+)
+INGESTION_DURATION = REGISTRY.histogram(
+    "odd_collector_ingestion_duration_seconds",
+    "Latency of ingestion requests.",
+    DURATION_BUCKETS,
+)
+INGESTION_RETRIES = REGISTRY.counter(
+    "odd_collector_ingestion_retries_total", "Retried ingestion requests."
+)
+INGESTION_ERRORS = REGISTRY.counter(
+    "odd_collector_ingestion_errors_total", "Failed ingestion requests."
+)
+SPOOLED_BATCHES = REGISTRY.counter(
+    "odd_collector_spooled_batches_total",
+    "Batches spooled to disk because the platform was unavailable.",
+)
+REPLAYED_BATCHES = REGISTRY.counter(
+    "odd_collector_replayed_batches_total", "Spooled batches sent to the platform."
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "odd_collector_queue_wait_seconds",
+    "Time a ready batch waited for a free ingestion slot.",
+    DURATION_BUCKETS,
+)
+SCHEDULER_MISFIRES = REGISTRY.counter(
+    "odd_collector_scheduler_misfires_total",
+    "Scheduled runs skipped because they were late or previous run was still running.",
+)
+SCHEDULER_DELAY = REGISTRY.histogram(
+    "odd_collector_scheduler_delay_seconds",
+    "Delay between scheduled and actual start of a run.",
+    DURATION_BUCKETS,
+)
+
+
+@dataclass
+class RunSummary:
+    plugin: str
+    status: str = "running"
+    duration: float = 0
+    entities: int = 0
+    batches: int = 0
+    encoded_bytes: int = 0
+    sent_bytes: int = 0
+    retries: int = 0
+    errors: int = 0
+    spooled: int = 0
+    replayed: int = 0
+    phases: Dict[str, float] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.time, repr=False)
+
+    def as_dict(self) -> dict:
+        result = asdict(self)
+        result.pop("started_at")
+        result["duration"] = round(self.duration, 3)
+        result["phases"] = {k: round(v, 3) for k, v in self.phases.items()}
+        return result
+
+
+current_run: ContextVar[Optional[RunSummary]] = ContextVar("current_run", default=None)
+
+
+def _plugin() -> str:
+    run = current_run.get()
+    return run.plugin if run is not None else "unknown"
+
+
+@contextmanager
+def track_run(plugin: str) -> Iterator[RunSummary]:
+    """Collects summary of a job run, sets it as `current_run` for the block.
+
+    The block is expected to set summary's status, a run without it is counted as
+    cancelled.
+    """
+    summary = RunSummary(plugin=plugin)
+    token = current_run.set(summary)
+    try:
+        yield summary
+    finally:
+        current_run.reset(token)
+        if summary.status == "running":
+            summary.status = "cancelled"
+        summary.duration = time.time() - summary.started_at
+        JOB_RUNS.inc(plugin=plugin, status=summary.status)
+        JOB_DURATION.observe(summary.duration, plugin=plugin)
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    PHASE_DURATION.observe(seconds, plugin=_plugin(), phase=phase)
+    run = current_run.get()
+    if run is not None:
+        run.phases[phase] = run.phases.get(phase, 0) + seconds
+
+
+def record_batch(
+    entities: int, encoded_bytes: int, sent_bytes: int, seconds: float
+) -> None:
+    plugin = _plugin()
+    ENTITIES.inc(entities, plugin=plugin)
+    BATCH_ENTITIES.observe(entities, plugin=plugin)
+    BATCH_ENCODED_BYTES.observe(encoded_bytes, plugin=plugin)
+    BATCH_SENT_BYTES.observe(sent_bytes, plugin=plugin)
+    INGESTION_DURATION.observe(seconds, plugin=plugin)
+
+    run = current_run.get()
+    if run is not None:
+        run.entities += entities
+        run.batches += 1
+        run.encoded_bytes += encoded_bytes
+        run.sent_bytes += sent_bytes
+
+
+def record_retry() -> None:
+    INGESTION_RETRIES.inc(plugin=_plugin())
+    run = current_run.get()
+    if run is not None:
+        run.retries += 1
+
+
+def record_error() -> None:
+    INGESTION_ERRORS.inc(plugin=_plugin())
+    run = current_run.get()
+    if run is not None:
+        run.errors += 1
+
+
+def record_spooled() -> None:
+    SPOOLED_BATCHES.inc(plugin=_plugin())
+    run = current_run.get()
+    if run is not None:
+        run.spooled += 1
+
+
+def record_replayed() -> None:
+    REPLAYED_BATCHES.inc(plugin=_plugin())
+    run = current_run.get()
+    if run is not None:
+        run.replayed += 1
+
+
+def record_queue_wait(seconds: float) -> None:
+    QUEUE_WAIT.observe(seconds, plugin=_plugin())
+
+
+async def start_metrics_server(port: int, host: str = "0.0.0.0") -> web.AppRunner:
+    """Starts HTTP server exposing metrics on /metrics in Prometheus text format."""
+
+    async def handle(_: web.Request) -> web.Response:
+        return web.Response(
+            text=REGISTRY.render(), content_type="text/plain", charset="utf-8"
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Metrics are exposed on http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,93 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class SchemaCache:
+    """
+    Persistent cache of schemas of objects, stored in a SQLite database.
+
+    Entry is keyed by adapter's namespace and object's path, and is valid only while
+    object's fingerprint (etag, size, modification time) is the same, so unchanged
+    objects aren't opened again on the next run. Schemas are stored as bytes
+    serialized by the adapter, e.g. in Arrow IPC format. When there are more than
+    `max_entries` entries, least recently used ones are evicted on `flush`.
+
+    Cache is shared by threads reading schemas, access is serialized by a lock.
+    """
+
+    def __init__(self, path: str, namespace: str, max_entries: int) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._namespace = namespace
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schemas (
+                namespace TEXT NOT NULL,
+                path TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                format TEXT NOT NULL,
+                schema BLOB NOT NULL,
+                used_at REAL NOT NULL,
+                PRIMARY KEY (namespace, path)
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS schemas_used_at ON schemas (used_at)"
+        )
+        self._connection.commit()
+
+    def get(self, path: str, fingerprint: str) -> Optional[tuple[bytes, str]]:
+        """
+        Get serialized schema of an object.
+        @return: schema and file format, None if object isn't cached or has changed
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprint, format, schema FROM schemas "
+                "WHERE namespace = ? AND path = ?",
+                (self._namespace, path),
+            ).fetchone()
+            if row is None or row[0] != fingerprint:
+                return None
+
+            self._connection.execute(
+                "UPDATE schemas SET used_at = ? WHERE namespace = ? AND path = ?",
+                (time.time(), self._namespace, path),
+            )
+        return row[2], row[1]
+
+    def put(self, path: str, fingerprint: str, schema: bytes, file_format: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO schemas VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self._namespace,
+                    path,
+                    fingerprint,
+                    file_format,
+                    schema,
+                    time.time(),
+                ),
+            )
+
+    def flush(self) -> None:
+        """Evict least recently used entries over the limit and commit changes."""
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM schemas WHERE rowid IN ("
+                "SELECT rowid FROM schemas ORDER BY used_at DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self._max_entries,),
+            )
+            self._connection.commit()
+
+
+def fingerprint(*parts) -> str:
+    return ":".join("" if part is None else str(part) for part in parts)
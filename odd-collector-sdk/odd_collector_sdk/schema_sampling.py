@@ -0,0 +1,64 @@
+"""
+Schema sampling for directories with many similar files.
+
+Files of one directory having the same extension, i.e. parts of a partitioned dataset,
+usually share one schema. Instead of reading all of them, schemas of a few sampled
+files are read: the newest, the oldest and random ones. When the samples agree, their
+schema is reused for the rest of the group, otherwise every file is read as usual.
+
+Functions don't depend on a file system, listed files are described by callables
+returning their name, path and modification time.
+"""
+import random
+import re
+from collections import defaultdict
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+F = TypeVar("F")
+
+
+def group_files(files: Iterable[T], name: Callable[[T], str]) -> list[list[T]]:
+    """Groups files of one directory by extension."""
+    groups = defaultdict(list)
+    for file in files:
+        match = re.search(r"\.(?P<ext>[a-z]+)", name(file))
+        groups[match.group("ext") if match else None].append(file)
+    return list(groups.values())
+
+
+def pick_samples(
+    files: list[T],
+    size: int,
+    path: Callable[[T], str],
+    mtime: Callable[[T], Any],
+) -> list[T]:
+    """Picks the newest, the oldest and random files, `size` in total."""
+    if len(files) <= size:
+        return list(files)
+
+    by_mtime = sorted(files, key=mtime)
+    picked = {path(f): f for f in (by_mtime[-1], by_mtime[0])[:size]}
+    rest = [f for f in files if path(f) not in picked]
+    picked.update((path(f), f) for f in random.sample(rest, size - len(picked)))
+    return list(picked.values())
+
+
+def common_schema(samples: list[F]) -> Optional[F]:
+    """Returns the first sample, if all samples have the same pyarrow schema."""
+    first = samples[0]
+    if first.schema is None:
+        return None
+    if all(s.schema is not None and s.schema.equals(first.schema) for s in samples):
+        return first
+    return None
+
+
+def sampled_metadata(sample_path: str, sample_size: int, group_size: int) -> dict:
+    """Metadata of a file which schema was taken from a sample of its group."""
+    return {
+        "SchemaInference": "sampled",
+        "SchemaSampledFrom": sample_path,
+        "SchemaSampleSize": sample_size,
+        "SchemaGroupSize": group_size,
+    }
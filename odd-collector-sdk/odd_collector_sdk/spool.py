@@ -0,0 +1,128 @@
+import gzip
+import os
+import re
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Iterator, Optional, Set, Tuple, Union
+
+from odd_models.models import DataEntityList
+
+from .logger import logger
+
+# every record is a gzipped json of DataEntityList prefixed with its length
+_HEADER = struct.Struct(">I")
+
+
+class SpoolFullError(Exception):
+    pass
+
+
+class Spool:
+    """Append-only on-disk spool of batches which couldn't be sent to the platform.
+
+    Each plugin has its own file, batches are replayed in the order they were spooled.
+
+    Args:
+        spool_dir: directory for spool files, created if it doesn't exist.
+        max_bytes: size limit of one plugin's spool, batches aren't spooled above it.
+    """
+
+    SUFFIX = ".spool"
+
+    def __init__(self, spool_dir: Union[str, Path], max_bytes: int) -> None:
+        self._dir = Path(spool_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._checked: Set[str] = set()
+
+    def _path(self, plugin: str) -> Path:
+        return self._dir / (re.sub(r"[^\w.-]", "_", plugin) + self.SUFFIX)
+
+    def size(self, plugin: str) -> int:
+        path = self._path(plugin)
+        return path.stat().st_size if path.exists() else 0
+
+    def _truncate_broken_tail(self, plugin: str) -> None:
+        """Cuts a record which was partially written when the collector crashed."""
+        if plugin in self._checked:
+            return
+        self._checked.add(plugin)
+
+        path = self._path(plugin)
+        if not path.exists():
+            return
+
+        size, offset = path.stat().st_size, 0
+        with open(path, "rb+") as f:
+            while offset + _HEADER.size <= size:
+                f.seek(offset)
+                (length,) = _HEADER.unpack(f.read(_HEADER.size))
+                if offset + _HEADER.size + length > size:
+                    break
+                offset += _HEADER.size + length
+            if offset < size:
+                logger.warning(f"Truncate broken record of {plugin} spool")
+                f.truncate(offset)
+
+    def append(self, plugin: str, data_entity_list: DataEntityList) -> None:
+        data = gzip.compress(data_entity_list.model_dump_json().encode("utf-8"))
+
+        with self._lock:
+            self._truncate_broken_tail(plugin)
+            if self.size(plugin) + _HEADER.size + len(data) > self._max_bytes:
+                raise SpoolFullError(
+                    f"Spool of {plugin} exceeds {self._max_bytes} bytes"
+                )
+
+            with open(self._path(plugin), "ab") as f:
+                f.write(_HEADER.pack(len(data)) + data)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def read(self, plugin: str) -> Iterator[Tuple[int, Optional[DataEntityList]]]:
+        """Yields spooled batches with offsets of records following them.
+
+        Records which can't be decoded are logged and yielded as None, so they are
+        consumed with the rest instead of blocking the spool.
+        """
+        path = self._path(plugin)
+        if not path.exists():
+            return
+
+        with self._lock:
+            self._truncate_broken_tail(plugin)
+
+        with open(path, "rb") as f:
+            while len(header := f.read(_HEADER.size)) == _HEADER.size:
+                (length,) = _HEADER.unpack(header)
+                data = f.read(length)
+                if len(data) < length:
+                    break
+                try:
+                    batch = DataEntityList.model_validate_json(gzip.decompress(data))
+                except (OSError, EOFError, zlib.error, ValueError) as e:
+                    logger.error(f"Drop broken record of {plugin} spool. {e}")
+                    batch = None
+                yield f.tell(), batch
+
+    def consume(self, plugin: str, offset: int) -> None:
+        """Removes records before offset, the file is deleted when nothing is left."""
+        path = self._path(plugin)
+        with self._lock:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                rest = f.read()
+
+            if not rest:
+                path.unlink()
+                return
+
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(rest)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
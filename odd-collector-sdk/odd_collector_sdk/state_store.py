@@ -0,0 +1,166 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Union
+
+from odd_models.models import DataEntity, DataEntityList
+
+from .logger import logger
+
+
+def content_hash(entity: DataEntity) -> str:
+    return hashlib.blake2b(
+        entity.model_dump_json().encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+class StateStore:
+    """Local SQLite storage of ingested entities' content hashes per plugin.
+
+    Used for incremental ingestion, when only new or changed entities are sent to the platform.
+
+    Args:
+        state_dir: directory for the database file, created if it doesn't exist.
+    """
+
+    FILE_NAME = "state.db"
+
+    def __init__(self, state_dir: Union[str, Path]) -> None:
+        path = Path(state_dir)
+        path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path / self.FILE_NAME, check_same_thread=False
+        )
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entities ("
+                "plugin TEXT NOT NULL, oddrn TEXT NOT NULL, hash TEXT NOT NULL, "
+                "PRIMARY KEY (plugin, oddrn))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS full_syncs ("
+                "plugin TEXT PRIMARY KEY, synced_at REAL NOT NULL)"
+            )
+
+    def get_hashes(self, plugin: str) -> Dict[str, str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT oddrn, hash FROM entities WHERE plugin = ?", (plugin,)
+            )
+            return dict(rows.fetchall())
+
+    def save_hashes(self, plugin: str, hashes: Dict[str, str]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO entities (plugin, oddrn, hash) VALUES (?, ?, ?)",
+                ((plugin, oddrn, hash_) for oddrn, hash_ in hashes.items()),
+            )
+
+    def delete_hashes(self, plugin: str, oddrns: Iterable[str]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM entities WHERE plugin = ? AND oddrn = ?",
+                ((plugin, oddrn) for oddrn in oddrns),
+            )
+
+    def get_last_full_sync(self, plugin: str) -> Optional[float]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT synced_at FROM full_syncs WHERE plugin = ?", (plugin,)
+            ).fetchone()
+            return row[0] if row else None
+
+    def save_full_sync(self, plugin: str, synced_at: float) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO full_syncs (plugin, synced_at) VALUES (?, ?)",
+                (plugin, synced_at),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+@dataclass
+class IncrementalRunStats:
+    total: int = 0
+    sent: int = 0
+    skipped: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.total} entities, {self.skipped} unchanged skipped, {self.sent} sent"
+        )
+
+
+class IncrementalRun:
+    """Filters out entities which weren't changed since they were sent last time.
+
+    Hashes are saved only for entities from successfully sent batches, see `commit`.
+    During a full run every entity is sent, and after it's finished without errors,
+    entities which disappeared from the source are removed from the store.
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        plugin: str,
+        full_resync_interval_hours: Optional[int] = None,
+    ) -> None:
+        self._store = store
+        self._plugin = plugin
+        self._started_at = time.time()
+        self._known = store.get_hashes(plugin)
+        self._pending: Dict[str, str] = {}
+        self._seen: Set[str] = set()
+        self.stats = IncrementalRunStats()
+
+        last_full_sync = store.get_last_full_sync(plugin)
+        self.is_full = last_full_sync is None or (
+            full_resync_interval_hours is not None
+            and self._started_at - last_full_sync >= full_resync_interval_hours * 3600
+        )
+
+    def filter(self, data_entity_list: DataEntityList) -> DataEntityList:
+        items = []
+        for entity in data_entity_list.items:
+            hash_ = content_hash(entity)
+            self._seen.add(entity.oddrn)
+            self.stats.total += 1
+
+            if not self.is_full and self._known.get(entity.oddrn) == hash_:
+                self.stats.skipped += 1
+                continue
+
+            self._pending[entity.oddrn] = hash_
+            items.append(entity)
+
+        return DataEntityList(
+            data_source_oddrn=data_entity_list.data_source_oddrn, items=items
+        )
+
+    def commit(self, data_entity_list: DataEntityList) -> None:
+        """Saves hashes of successfully sent entities."""
+        hashes = {
+            entity.oddrn: self._pending.pop(entity.oddrn)
+            for entity in data_entity_list.items
+            if entity.oddrn in self._pending
+        }
+        self.stats.sent += len(data_entity_list.items)
+        self._store.save_hashes(self._plugin, hashes)
+
+    def finish(self) -> None:
+        """Must be called only if all batches were sent successfully."""
+        if self.is_full:
+            self._store.delete_hashes(self._plugin, self._known.keys() - self._seen)
+            self._store.save_full_sync(self._plugin, self._started_at)
+
+        logger.info(
+            f"[{self._plugin}] {'Full' if self.is_full else 'Incremental'} run: {self.stats}"
+        )
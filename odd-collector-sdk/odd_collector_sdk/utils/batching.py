@@ -0,0 +1,108 @@
+from typing import Iterable, Iterator, List, Optional
+
+from odd_models.models import DataEntity, MetadataExtension
+
+# Approximate size of serialized json for an entity and a dataset field without
+# their string values, measured on typical relational tables.
+ENTITY_OVERHEAD = 1024
+FIELD_OVERHEAD = 384
+
+
+def _metadata_size(metadata: Optional[List[MetadataExtension]]) -> int:
+    if not metadata:
+        return 0
+    return sum(len(ext.schema_url) + len(str(ext.metadata)) for ext in metadata)
+
+
+def _text_size(*values: Optional[str]) -> int:
+    return sum(len(value) for value in values if value)
+
+
+def estimate_entity_size(entity: DataEntity) -> int:
+    """Cheap estimation of entity's serialized size in bytes.
+
+    Counts string values and metadata of an entity and its dataset fields instead of
+    serializing it, so it's fast enough to be called for every entity.
+    """
+    size = ENTITY_OVERHEAD
+    size += _text_size(entity.oddrn, entity.name, entity.description)
+    size += _metadata_size(entity.metadata)
+
+    if entity.dataset is not None and entity.dataset.field_list:
+        for field in entity.dataset.field_list:
+            size += FIELD_OVERHEAD
+            size += _text_size(
+                field.oddrn,
+                field.name,
+                field.description,
+                field.parent_field_oddrn,
+                field.default_value,
+            )
+            size += _metadata_size(field.metadata)
+            if field.enum_values:
+                size += sum(
+                    _text_size(value.name, value.description)
+                    for value in field.enum_values
+                )
+
+    if entity.data_transformer is not None:
+        transformer = entity.data_transformer
+        size += _text_size(transformer.sql, transformer.source_code_url)
+        size += _text_size(*transformer.inputs, *transformer.outputs)
+
+    if entity.data_entity_group is not None:
+        size += _text_size(*entity.data_entity_group.entities_list)
+
+    return size
+
+
+class BatchBuilder:
+    """Accumulates entities into batches of at most `max_items` entities and `max_bytes`
+    estimated bytes. An entity bigger than `max_bytes` makes a batch on its own.
+    """
+
+    def __init__(self, max_items: int, max_bytes: Optional[int] = None) -> None:
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._batch: List[DataEntity] = []
+        self._batch_size = 0
+
+    def add(self, item: DataEntity) -> Optional[List[DataEntity]]:
+        """Adds an entity, returns the previous batch if the entity doesn't fit in it."""
+        item_size = 0 if self.max_bytes is None else estimate_entity_size(item)
+
+        completed = None
+        if self._batch and (
+            len(self._batch) >= self.max_items
+            or (
+                self.max_bytes is not None
+                and self._batch_size + item_size > self.max_bytes
+            )
+        ):
+            completed = self.flush()
+
+        self._batch.append(item)
+        self._batch_size += item_size
+        return completed
+
+    def flush(self) -> Optional[List[DataEntity]]:
+        batch = self._batch or None
+        self._batch, self._batch_size = [], 0
+        return batch
+
+
+def split_by_size(
+    items: Iterable[DataEntity],
+    max_items: int,
+    max_bytes: Optional[int] = None,
+) -> Iterator[List[DataEntity]]:
+    """Lazily splits entities into batches, see `BatchBuilder`."""
+    builder = BatchBuilder(max_items, max_bytes)
+    for item in items:
+        batch = builder.add(item)
+        if batch is not None:
+            yield batch
+
+    batch = builder.flush()
+    if batch is not None:
+        yield batch
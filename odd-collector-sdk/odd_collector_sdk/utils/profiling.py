@@ -0,0 +1,197 @@
+"""
+Named phases of a job run and opt-in profiling of them.
+
+Adapters mark their phases with `phase`, used as a context manager or a decorator:
+
+    >>> with phase("fetch"):
+    >>>     tables = repository.get_tables()
+    >>>
+    >>> @phase("map")
+    >>> def map_tables(tables): ...
+
+Duration of every phase is recorded to collector's metrics. When `profiling` is enabled
+in collector config, each phase is also run under cProfile and its tracemalloc peak is
+measured, and a per-plugin report is written to `profiling_dir` after the run.
+
+Profiling is meant for synchronous code: a phase containing `await` is attributed
+the work of other tasks done meanwhile. Phases nested into each other are profiled
+separately, the outer one is paused while the inner one is running.
+"""
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .. import metrics
+from ..logger import logger
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    seconds: float = 0
+    memory_peak: int = 0  # bytes allocated on top of the memory used before the phase
+    profile: Optional[pstats.Stats] = field(default=None, repr=False)
+
+
+@dataclass
+class _Frame:
+    name: str
+    profile: Optional[cProfile.Profile]
+    memory_start: int
+    memory_peak: int = 0
+
+
+class RunProfiler:
+    """Collects cProfile stats and tracemalloc peaks of phases for one job run."""
+
+    # tracemalloc is global, it's stopped when the last of concurrent runs is finished
+    _tracing_runs = 0
+    _tracing_lock = threading.Lock()
+
+    def __init__(self, plugin: str, top: int = 30) -> None:
+        self.plugin = plugin
+        self.top = top
+        self.phases: Dict[str, PhaseStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def _stack(self) -> List[_Frame]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def start(self) -> None:
+        with RunProfiler._tracing_lock:
+            if RunProfiler._tracing_runs == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            RunProfiler._tracing_runs += 1
+
+    def stop(self) -> None:
+        with RunProfiler._tracing_lock:
+            RunProfiler._tracing_runs -= 1
+            if RunProfiler._tracing_runs == 0 and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def enter(self, name: str) -> None:
+        stack = self._stack
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            parent = stack[-1]
+            parent.memory_peak = max(parent.memory_peak, peak - parent.memory_start)
+            if parent.profile is not None:
+                parent.profile.disable()
+        tracemalloc.reset_peak()
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler is active, e.g. a phase in another thread on python 3.12+
+            logger.debug(f"[{self.plugin}] couldn't profile phase {name}")
+            profile = None
+        stack.append(_Frame(name, profile, current))
+
+    def exit(self, seconds: float) -> None:
+        stack = self._stack
+        frame = stack.pop()
+        if frame.profile is not None:
+            frame.profile.disable()
+
+        _, peak = tracemalloc.get_traced_memory()
+        memory_peak = max(frame.memory_peak, peak - frame.memory_start)
+        if stack:
+            parent = stack[-1]
+            parent.memory_peak = max(parent.memory_peak, peak - parent.memory_start)
+            if parent.profile is not None:
+                parent.profile.enable()
+
+        with self._lock:
+            stats = self.phases.setdefault(frame.name, PhaseStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.memory_peak = max(stats.memory_peak, memory_peak)
+            if frame.profile is not None:
+                if stats.profile is None:
+                    stats.profile = pstats.Stats(frame.profile)
+                else:
+                    stats.profile.add(frame.profile)
+
+    def report(self, summary: Optional[metrics.RunSummary] = None) -> str:
+        lines = [f"Profile of {self.plugin} run"]
+        if summary is not None:
+            lines.append(f"Run: {summary.as_dict()}")
+
+        for name, stats in self.phases.items():
+            lines.extend(
+                [
+                    "",
+                    f"Phase {name}: {stats.calls} calls, {stats.seconds:.3f}s, "
+                    f"memory peak {stats.memory_peak / (1024 * 1024):.3f} MB",
+                ]
+            )
+            if stats.profile is not None:
+                stream = io.StringIO()
+                stats.profile.stream = stream
+                stats.profile.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                    self.top
+                )
+                lines.append(stream.getvalue())
+        return "\n".join(lines)
+
+    def dump(
+        self, directory: Union[str, Path], summary: Optional[metrics.RunSummary] = None
+    ) -> Path:
+        """Writes text report and raw profiles of phases, which can be opened by pstats or snakeviz."""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+
+        for name, stats in self.phases.items():
+            if stats.profile is not None:
+                stats.profile.dump_stats(path / f"{self.plugin}.{name}.prof")
+
+        report_path = path / f"{self.plugin}.txt"
+        report_path.write_text(self.report(summary))
+        return report_path
+
+
+current_profiler: ContextVar[Optional[RunProfiler]] = ContextVar(
+    "current_profiler", default=None
+)
+
+
+class phase(ContextDecorator):
+    """Marks a named phase of a job run, i.e. fetch, map, serialize, send."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._local = threading.local()
+
+    def __enter__(self) -> "phase":
+        profiler = current_profiler.get()
+        if profiler is not None:
+            profiler.enter(self.name)
+        self._starts.append((profiler, time.perf_counter()))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        profiler, start = self._starts.pop()
+        seconds = time.perf_counter() - start
+        if profiler is not None:
+            profiler.exit(seconds)
+        metrics.record_phase(self.name, seconds)
+
+    @property
+    def _starts(self) -> list:
+        # one instance is shared by all calls of a decorated function
+        if not hasattr(self._local, "starts"):
+            self._local.starts = []
+        return self._local.starts
@@ -0,0 +1,2 @@
+# not imported by the adapter, so it isn't loaded with it
+some_value = 1
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from odd_collector_sdk.api.batch_sender import BatchSender
+from odd_models.models import DataEntityList
+
+
+def batch(index: int) -> DataEntityList:
+    return DataEntityList(data_source_oddrn=f"//test/{index}", items=[])
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_bounds_inflight_requests():
+    inflight, max_inflight, sent = 0, 0, []
+
+    async def send(data_entity_list: DataEntityList):
+        nonlocal inflight, max_inflight
+        inflight += 1
+        max_inflight = max(inflight, max_inflight)
+        await asyncio.sleep(0.01)
+        sent.append(data_entity_list.data_source_oddrn)
+        inflight -= 1
+
+    sender = BatchSender(send, max_inflight_batches=3)
+    for index in range(10):
+        await sender.submit(batch(index))
+    await sender.join()
+
+    assert max_inflight == 3
+    assert sorted(sent) == sorted(f"//test/{index}" for index in range(10))
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_raises_ingestion_error():
+    async def send(data_entity_list: DataEntityList):
+        raise RuntimeError("platform is down")
+
+    sender = BatchSender(send, max_inflight_batches=1)
+    with pytest.raises(RuntimeError, match="platform is down"):
+        for index in range(10):
+            await sender.submit(batch(index))
+        await sender.join()
+
+
+def test_batch_sender_validates_window():
+    with pytest.raises(ValueError):
+        BatchSender(lambda _: None, max_inflight_batches=0)
@@ -0,0 +1,87 @@
+import gzip
+import json
+
+import pytest
+from odd_collector_sdk.api.encoding import PayloadEncoder
+from odd_models.models import (
+    DataEntity,
+    DataEntityList,
+    DataEntityType,
+    DataSet,
+    DataSetField,
+    DataSetFieldType,
+    Type,
+)
+
+
+@pytest.fixture
+def data_entity_list():
+    return DataEntityList(
+        data_source_oddrn="//test_datasource/host/localhost",
+        items=[
+            DataEntity(
+                oddrn=f"//test_datasource/host/localhost/tables/{i}",
+                name=f"table_{i}",
+                type=DataEntityType.TABLE,
+                dataset=DataSet(
+                    field_list=[
+                        DataSetField(
+                            oddrn=f"//test_datasource/host/localhost/tables/{i}/columns/{j}",
+                            name=f"column_{j}",
+                            type=DataSetFieldType(
+                                type=Type.TYPE_STRING,
+                                logical_type="varchar",
+                                is_nullable=True,
+                            ),
+                        )
+                        for j in range(10)
+                    ]
+                ),
+            )
+            for i in range(10)
+        ],
+    )
+
+
+def test_default_encoding(data_entity_list):
+    payload = PayloadEncoder().encode(data_entity_list)
+
+    assert payload.headers == {}
+    assert payload.data == data_entity_list.model_dump_json().encode()
+    assert payload.encoded_size == payload.compressed_size == len(payload.data)
+
+
+def test_orjson_serializer(data_entity_list):
+    pytest.importorskip("orjson")
+    payload = PayloadEncoder(serializer="orjson").encode(data_entity_list)
+
+    assert json.loads(payload.data) == json.loads(data_entity_list.model_dump_json())
+
+
+def test_exclude_none(data_entity_list):
+    payload = PayloadEncoder(exclude_none=True).encode(data_entity_list)
+
+    assert payload.encoded_size < len(data_entity_list.model_dump_json())
+    assert ":null" not in payload.data.decode()
+
+
+def test_gzip_compression(data_entity_list):
+    payload = PayloadEncoder(compression="gzip", compression_level=1).encode(
+        data_entity_list
+    )
+
+    assert payload.headers == {"Content-Encoding": "gzip"}
+    assert payload.compressed_size < payload.encoded_size
+    assert gzip.decompress(payload.data) == data_entity_list.model_dump_json().encode()
+
+
+def test_zstd_compression(data_entity_list):
+    zstandard = pytest.importorskip("zstandard")
+    payload = PayloadEncoder(compression="zstd").encode(data_entity_list)
+
+    assert payload.headers == {"Content-Encoding": "zstd"}
+    assert payload.compressed_size < payload.encoded_size
+    assert (
+        zstandard.ZstdDecompressor().decompress(payload.data)
+        == data_entity_list.model_dump_json().encode()
+    )
@@ -1,11 +1,14 @@
+import asyncio
+
 import pytest
+import pytest_asyncio
 from aioresponses import aioresponses
 from odd_collector_sdk.api.datasource_api import PlatformApi
+from odd_collector_sdk.errors import IngestionDataError
 from odd_models.models import DataEntityList, DataSourceList
 
 
-@pytest.fixture
-def platform_api():
+def create_platform_api() -> PlatformApi:
     return PlatformApi(
         token="test-token",
         platform_url="http://test-platform-url",
@@ -14,6 +17,13 @@ def platform_api():
     )
 
 
+@pytest_asyncio.fixture
+async def platform_api():
+    platform_api = create_platform_api()
+    yield platform_api
+    await platform_api.close()
+
+
 @pytest.fixture
 def data_source_list():
     return DataSourceList(items=[])
@@ -56,3 +66,73 @@ async def test_ingest_data(platform_api, data_entity_list):
             await platform_api.ingest_data(data_entity_list)
         assert "Platform response" in str(exc_info.value)
         assert "{'message': 'some error message'}" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_ingest_data_reuses_session(platform_api, data_entity_list):
+    with aioresponses() as mock:
+        url = f"{platform_api.platform_url}/ingestion/entities"
+        mock.post(url, status=200, payload={"message": "success"}, repeat=True)
+
+        await platform_api.ingest_data(data_entity_list)
+        session = platform_api._session
+        await platform_api.ingest_data(data_entity_list)
+
+        assert platform_api._session is session
+        await platform_api.close()
+        assert session.closed
+
+
+def test_session_of_previous_event_loop_is_closed(data_entity_list):
+    platform_api = create_platform_api()
+    with aioresponses() as mock:
+        url = f"{platform_api.platform_url}/ingestion/entities"
+        mock.post(url, status=200, payload={"message": "success"}, repeat=True)
+
+        asyncio.run(platform_api.ingest_data(data_entity_list))
+        session = platform_api._session
+        asyncio.run(platform_api.ingest_data(data_entity_list))
+
+        assert session.closed
+        assert platform_api._session is not session
+        asyncio.run(platform_api.close())
+
+
+@pytest.mark.asyncio
+async def test_ingest_data_retries_when_platform_is_unavailable(data_entity_list):
+    platform_api = PlatformApi(
+        token="test-token",
+        platform_url="http://test-platform-url",
+        retries=2,
+        retry_backoff_seconds=0,
+    )
+    with aioresponses() as mock:
+        url = f"{platform_api.platform_url}/ingestion/entities"
+        mock.post(url, status=503)
+        mock.post(url, status=502)
+        mock.post(url, status=200, payload={"message": "success"})
+
+        response = await platform_api.ingest_data(data_entity_list)
+        assert response.status == 200
+
+        mock.post(url, status=503, repeat=True)
+        with pytest.raises(IngestionDataError) as exc_info:
+            await platform_api.ingest_data(data_entity_list)
+        assert exc_info.value.is_transient
+    await platform_api.close()
+
+
+@pytest.mark.asyncio
+async def test_ingest_data_doesnt_retry_rejected_batch(data_entity_list):
+    platform_api = PlatformApi(
+        token="test-token", platform_url="http://test-platform-url", retries=2
+    )
+    with aioresponses() as mock:
+        url = f"{platform_api.platform_url}/ingestion/entities"
+        mock.post(url, status=400)
+        mock.post(url, status=200)
+
+        with pytest.raises(IngestionDataError) as exc_info:
+            await platform_api.ingest_data(data_entity_list)
+        assert not exc_info.value.is_transient
+    await platform_api.close()
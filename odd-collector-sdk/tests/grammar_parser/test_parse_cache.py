@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+from lark import Lark
+from odd_collector_sdk.grammar_parser import parse_cache
+from odd_collector_sdk.grammar_parser.build_dataset_field import DatasetFieldBuilder
+from odd_models import Type
+from oddrn_generator import DatabricksUnityCatalogGenerator
+
+GRAMMAR = Path(__file__).parent / "field_types.lark"
+
+TYPES = [
+    'PrimitiveType("int")',
+    'PrimitiveType("string")',
+    'ArrayType(PrimitiveType("long"), contains_null=True)',
+    'StructType([Field(id, PrimitiveType("int"), nullable=True), '
+    'Field(tags, ArrayType(PrimitiveType("string"), contains_null=False), '
+    "nullable=True)])",
+]
+
+
+@dataclass
+class Column:
+    name: str
+    type: str
+    description: str = None
+
+
+@pytest.fixture()
+def parses(monkeypatch) -> list[str]:
+    parse_cache.parse.cache_clear()
+    parsed = []
+    lark_parse = Lark.parse
+    monkeypatch.setattr(
+        Lark, "parse", lambda self, text: parsed.append(text) or lark_parse(self, text)
+    )
+    return parsed
+
+
+def build(column: Column):
+    generator = DatabricksUnityCatalogGenerator(
+        host_settings="localhost", catalogs="catalog", schemas="schema", tables="table"
+    )
+    builder = DatasetFieldBuilder(
+        data_source="test",
+        oddrn_generator=generator,
+        parser_config_path=GRAMMAR,
+        odd_types_map={"int": Type.TYPE_INTEGER, "string": Type.TYPE_STRING},
+    )
+    return builder.build_dataset_field(column)
+
+
+def test_types_are_parsed_once(parses):
+    columns = [Column(f"column_{i}", TYPES[i % len(TYPES)]) for i in range(100)]
+
+    fields = [build(column) for column in columns]
+
+    assert sorted(parses) == sorted(TYPES)
+    assert fields[0][0].type.type == Type.TYPE_INTEGER
+    assert [f.name for f in fields[3]] == ["column_3", "id", "tags", "Element"]
+    assert fields[7][0].oddrn != fields[3][0].oddrn
+
+
+def test_grammar_is_compiled_once():
+    assert parse_cache.open_parser(str(GRAMMAR)) is parse_cache.open_parser(
+        str(GRAMMAR)
+    )
+
+
+def test_invalid_types_are_not_cached(parses):
+    for _ in range(2):
+        with pytest.raises(Exception):
+            parse_cache.parse(parse_cache.open_parser(str(GRAMMAR)), "Unknown")
+
+    assert parses == ["Unknown", "Unknown"]
+
+
+def test_lazy_parser_compiles_grammar_on_first_parse(monkeypatch):
+    opened = []
+    open_parser = parse_cache.open_parser
+
+    def recording_open_parser(*args):
+        opened.append(args)
+        return open_parser(*args)
+
+    monkeypatch.setattr(parse_cache, "open_parser", recording_open_parser)
+
+    parser = parse_cache.LazyParser("field_types.lark", rel_to=__file__)
+    assert opened == []
+
+    tree = parse_cache.parse(parser, 'PrimitiveType("int")')
+    assert tree.data == "primitive_type"
+    assert opened == [("field_types.lark", __file__, "lalr", "type")]
+
+
+def test_compiled_grammar_is_cached_to_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(parse_cache.GRAMMAR_CACHE_DIR_ENV, str(tmp_path / "grammars"))
+    grammar = str(tmp_path / "types.lark")
+    Path(grammar).write_text(GRAMMAR.read_text())
+
+    parse_cache.open_parser(grammar)
+    cached = list((tmp_path / "grammars").iterdir())
+    assert len(cached) == 1
+
+    parse_cache.open_parser.cache_clear()
+    monkeypatch.setattr(Lark, "_build_lexer", None)  # fails if grammar is compiled
+    parser = parse_cache.open_parser(grammar)
+    assert parser.parse('PrimitiveType("int")').data == "primitive_type"
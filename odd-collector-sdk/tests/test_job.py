@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator
+
+import pytest
+from odd_collector_sdk.domain.adapter import AsyncStreamingAdapter, StreamingAdapter
+from odd_collector_sdk.domain.plugin import Plugin
+from odd_collector_sdk.errors import IngestionDataError
+from odd_collector_sdk.job import AsyncStreamingJob, ExecutorJob, SyncJob, create_job
+from odd_models.models import DataEntity, DataEntityList, DataEntityType
+
+
+class FakeApi:
+    def __init__(self):
+        self.ingested: list[DataEntityList] = []
+
+    async def ingest_data(self, data_entity_list: DataEntityList):
+        self.ingested.append(data_entity_list)
+
+
+class SlowAdapter:
+    def __init__(self, name: str, items_count: int = 5, delay: float = 0.3):
+        self.config = Plugin(type="test", name=name)
+        self.items_count = items_count
+        self.delay = delay
+        self.thread_name = None
+
+    def get_data_source_oddrn(self) -> str:
+        return f"//test/{self.config.name}"
+
+    def get_data_entity_list(self) -> DataEntityList:
+        self.thread_name = threading.current_thread().name
+        time.sleep(self.delay)
+        return DataEntityList(
+            data_source_oddrn=self.get_data_source_oddrn(),
+            items=[
+                DataEntity(
+                    oddrn=f"//test/{self.config.name}/{i}",
+                    name=str(i),
+                    type=DataEntityType.TABLE,
+                )
+                for i in range(self.items_count)
+            ],
+        )
+
+
+def test_create_job_without_executor():
+    job = create_job(FakeApi(), SlowAdapter("sync"), chunk_size=2)
+    assert isinstance(job, SyncJob)
+
+
+@pytest.mark.asyncio
+async def test_executor_job_streams_batches():
+    api = FakeApi()
+    adapter = SlowAdapter("pooled", items_count=5, delay=0)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="worker") as executor:
+        job = create_job(api, adapter, chunk_size=2, executor=executor, queue_size=1)
+        assert isinstance(job, ExecutorJob)
+        await job.start()
+
+    assert adapter.thread_name.startswith("worker")
+    assert [len(del_.items) for del_ in api.ingested] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_executor_job_runs_adapters_in_parallel():
+    api = FakeApi()
+    adapters = [SlowAdapter(f"adapter_{i}", delay=0.3) for i in range(4)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        start = time.monotonic()
+        await asyncio.gather(
+            *(
+                create_job(api, adapter, chunk_size=2, executor=executor).start()
+                for adapter in adapters
+            )
+        )
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 0.3 * len(adapters)
+    assert sum(len(del_.items) for del_ in api.ingested) == 20
+
+
+@pytest.mark.asyncio
+async def test_executor_job_stops_producer_on_ingestion_error():
+    class FailingApi(FakeApi):
+        async def ingest_data(self, data_entity_list: DataEntityList):
+            raise RuntimeError("platform is down")
+
+    adapter = SlowAdapter("failing", items_count=10, delay=0)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        job = ExecutorJob(FailingApi(), adapter, 1, executor=executor, queue_size=1)
+        await asyncio.wait_for(job.start(), timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_job_shrinks_batch_rejected_as_too_large():
+    class LimitedApi(FakeApi):
+        async def ingest_data(self, data_entity_list: DataEntityList):
+            if len(data_entity_list.items) > 2:
+                raise IngestionDataError("Payload too large", data_entity_list, 413)
+            await super().ingest_data(data_entity_list)
+
+    api = LimitedApi()
+    await SyncJob(api, SlowAdapter("limited", items_count=7, delay=0), 7).start()
+
+    assert sorted(len(del_.items) for del_ in api.ingested) == [1, 2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_job_doesnt_shrink_batch_on_timeout():
+    class HungApi(FakeApi):
+        requests = 0
+
+        async def ingest_data(self, data_entity_list: DataEntityList):
+            self.requests += 1
+            error = IngestionDataError("Timeout", data_entity_list)
+            error.__cause__ = asyncio.TimeoutError()
+            raise error
+
+    api = HungApi()
+    await SyncJob(api, SlowAdapter("hung", items_count=8, delay=0), 8).start()
+
+    # the run fails on the first timed out batch instead of splitting it
+    assert api.requests == 1
+
+
+class Streaming(StreamingAdapter):
+    def __init__(self, items_count: int):
+        self.config = Plugin(type="test", name="streaming")
+        self.items_count = items_count
+        self.produced = 0
+
+    def get_data_source_oddrn(self) -> str:
+        return "//test/streaming"
+
+    def get_data_entities(self) -> Iterator[DataEntity]:
+        for i in range(self.items_count):
+            self.produced += 1
+            yield DataEntity(
+                oddrn=f"//test/streaming/{i}", name=str(i), type=DataEntityType.TABLE
+            )
+
+
+@pytest.mark.asyncio
+async def test_streaming_adapter_is_sent_while_produced():
+    class RecordingApi(FakeApi):
+        def __init__(self, adapter: Streaming):
+            super().__init__()
+            self.adapter = adapter
+            self.produced_on_send = []
+
+        async def ingest_data(self, data_entity_list: DataEntityList):
+            self.produced_on_send.append(self.adapter.produced)
+            await super().ingest_data(data_entity_list)
+
+    adapter = Streaming(items_count=10)
+    api = RecordingApi(adapter)
+    await create_job(api, adapter, chunk_size=3, max_inflight_batches=1).start()
+
+    assert [len(del_.items) for del_ in api.ingested] == [3, 3, 3, 1]
+    assert api.produced_on_send[0] < adapter.items_count
+
+
+@pytest.mark.asyncio
+async def test_async_streaming_adapter():
+    class AsyncStreaming(AsyncStreamingAdapter):
+        config = Plugin(type="test", name="async_streaming")
+
+        def get_data_source_oddrn(self) -> str:
+            return "//test/async_streaming"
+
+        async def get_data_entities(self) -> AsyncIterator[DataEntity]:
+            for i in range(5):
+                yield DataEntity(
+                    oddrn=f"//test/async_streaming/{i}",
+                    name=str(i),
+                    type=DataEntityType.TABLE,
+                )
+
+    api = FakeApi()
+    job = create_job(api, AsyncStreaming(), chunk_size=2)
+    assert isinstance(job, AsyncStreamingJob)
+
+    await job.start()
+    assert [len(del_.items) for del_ in api.ingested] == [2, 2, 1]
@@ -0,0 +1,111 @@
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+from odd_collector_sdk import metrics
+from odd_collector_sdk.api.datasource_api import PlatformApi
+from odd_collector_sdk.domain.plugin import Plugin
+from odd_collector_sdk.job import SyncJob
+from odd_collector_sdk.metrics import Counter, Histogram, Registry
+from odd_models.models import DataEntity, DataEntityList, DataEntityType
+
+
+class Adapter:
+    def __init__(self, name: str, items_count: int):
+        self.config = Plugin(type="test", name=name)
+        self.items_count = items_count
+
+    def get_data_source_oddrn(self) -> str:
+        return f"//test/{self.config.name}"
+
+    def get_data_entity_list(self) -> DataEntityList:
+        return DataEntityList(
+            data_source_oddrn=self.get_data_source_oddrn(),
+            items=[
+                DataEntity(
+                    oddrn=f"//test/{self.config.name}/{i}",
+                    name=str(i),
+                    type=DataEntityType.TABLE,
+                )
+                for i in range(self.items_count)
+            ],
+        )
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    counter = registry.register(Counter("runs_total", "Runs.", ("plugin",)))
+    histogram = registry.register(
+        Histogram("duration_seconds", "Duration.", ("plugin",), buckets=(1, 10))
+    )
+
+    counter.inc(plugin="pg")
+    counter.inc(2, plugin="pg")
+    histogram.observe(0.5, plugin="pg")
+    histogram.observe(5, plugin="pg")
+    histogram.observe(50, plugin="pg")
+
+    assert registry.render().splitlines() == [
+        "# HELP runs_total Runs.",
+        "# TYPE runs_total counter",
+        'runs_total{plugin="pg"} 3',
+        "# HELP duration_seconds Duration.",
+        "# TYPE duration_seconds histogram",
+        'duration_seconds_bucket{plugin="pg",le="1"} 1',
+        'duration_seconds_bucket{plugin="pg",le="10"} 2',
+        'duration_seconds_bucket{plugin="pg",le="+Inf"} 3',
+        'duration_seconds_count{plugin="pg"} 3',
+        'duration_seconds_sum{plugin="pg"} 55.5',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_job_run_collects_metrics_and_summary():
+    api = PlatformApi(token="token", platform_url="http://platform")
+    job = SyncJob(api, Adapter("metrics_pg", items_count=5), chunk_size=2)
+
+    with aioresponses() as mock:
+        mock.post("http://platform/ingestion/entities", status=200, repeat=True)
+        with metrics.track_run("metrics_pg") as summary:
+            await job._ingest(job._iter_batches())
+            summary.status = "success"
+    await api.close()
+
+    assert summary.entities == 5
+    assert summary.batches == 3
+    assert summary.encoded_bytes > 0
+    assert summary.sent_bytes == summary.encoded_bytes
+    assert {"adapter", "serialize", "send"} <= summary.phases.keys()
+
+    assert metrics.ENTITIES.get(plugin="metrics_pg") == 5
+    assert metrics.BATCH_ENTITIES.get_count(plugin="metrics_pg") == 3
+    assert metrics.JOB_RUNS.get(plugin="metrics_pg", status="success") == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_run_is_counted():
+    api = PlatformApi(token="token", platform_url="http://platform")
+    job = SyncJob(api, Adapter("metrics_failed", items_count=1), chunk_size=2)
+
+    with aioresponses() as mock:
+        mock.post("http://platform/ingestion/entities", status=500)
+        await job.start()
+    await api.close()
+
+    assert metrics.INGESTION_ERRORS.get(plugin="metrics_failed") == 1
+    assert metrics.JOB_RUNS.get(plugin="metrics_failed", status="failed") == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_server(unused_tcp_port):
+    metrics.ENTITIES.inc(plugin="metrics_server")
+    runner = await metrics.start_metrics_server(unused_tcp_port, "127.0.0.1")
+    try:
+        async with ClientSession() as session:
+            async with session.get(
+                f"http://127.0.0.1:{unused_tcp_port}/metrics"
+            ) as response:
+                text = await response.text()
+    finally:
+        await runner.cleanup()
+
+    assert 'odd_collector_entities_total{plugin="metrics_server"} 1' in text
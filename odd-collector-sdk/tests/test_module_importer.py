@@ -27,3 +27,13 @@ def test_importing_modules():
 
     for adapter in adapters:
         assert hasattr(adapter, "config")
+
+
+def test_modules_not_used_by_adapter_are_not_imported():
+    config_path = path.join(test_folder_path, "collector_config.yaml")
+    config = load_config(config_path, PLUGIN_FACTORY)
+
+    load_adapters("tests.adapters", config.plugins)
+
+    assert "tests.adapters.s3.adapter" in sys.modules
+    assert "tests.adapters.s3.unused" not in sys.modules
@@ -0,0 +1,37 @@
+from odd_collector_sdk.schema_cache import SchemaCache, fingerprint
+
+
+def test_schema_is_valid_while_fingerprint_is_the_same(tmp_path):
+    cache = SchemaCache(str(tmp_path / "cache" / "schemas.sqlite"), "s3_adapter", 10)
+    cache.put("bucket/a.parquet", fingerprint(10, 1), b"schema", "parquet")
+
+    assert cache.get("bucket/a.parquet", fingerprint(10, 1)) == (b"schema", "parquet")
+    assert cache.get("bucket/a.parquet", fingerprint(10, 2)) is None
+    assert cache.get("bucket/b.parquet", fingerprint(10, 1)) is None
+
+
+def test_entries_are_kept_between_runs_per_namespace(tmp_path):
+    path = str(tmp_path / "schemas.sqlite")
+    cache = SchemaCache(path, "s3_adapter", 10)
+    cache.put("a", "1", b"schema", "csv")
+    cache.flush()
+
+    assert SchemaCache(path, "s3_adapter", 10).get("a", "1") == (b"schema", "csv")
+    assert SchemaCache(path, "gcs_adapter", 10).get("a", "1") is None
+
+
+def test_least_recently_used_schemas_are_evicted(tmp_path):
+    cache = SchemaCache(str(tmp_path / "schemas.sqlite"), "s3_adapter", 2)
+    for path in ("a", "b", "c"):
+        cache.put(path, "1", path.encode(), "parquet")
+    cache.get("a", "1")
+
+    cache.flush()
+
+    assert cache.get("a", "1") == (b"a", "parquet")
+    assert cache.get("b", "1") is None
+    assert cache.get("c", "1") == (b"c", "parquet")
+
+
+def test_fingerprint_keeps_missing_parts():
+    assert fingerprint("etag", None, 10) == "etag::10"
@@ -0,0 +1,67 @@
+from typing import NamedTuple, Optional
+
+from odd_collector_sdk.schema_sampling import (
+    common_schema,
+    group_files,
+    pick_samples,
+    sampled_metadata,
+)
+
+
+class Schema(NamedTuple):
+    fields: tuple
+
+    def equals(self, other: "Schema") -> bool:
+        return self.fields == other.fields
+
+
+class Sample(NamedTuple):
+    path: str
+    schema: Optional[Schema]
+
+
+def test_files_are_grouped_by_extension():
+    files = ["part-0.parquet", "part-1.parquet", "a.csv", "b.csv.gz", "README"]
+
+    groups = group_files(files, name=lambda f: f)
+
+    assert groups == [
+        ["part-0.parquet", "part-1.parquet"],
+        ["a.csv", "b.csv.gz"],
+        ["README"],
+    ]
+
+
+def test_newest_and_oldest_files_are_always_sampled():
+    files = [(f"part-{i}", mtime) for i, mtime in enumerate([5, 1, 9, 3, 7, 2])]
+
+    samples = pick_samples(files, 3, path=lambda f: f[0], mtime=lambda f: f[1])
+
+    assert len(samples) == 3
+    assert len({path for path, _ in samples}) == 3
+    assert {("part-2", 9), ("part-1", 1)} <= set(samples)
+
+
+def test_small_groups_are_sampled_entirely():
+    files = [("a", 1), ("b", 2)]
+
+    assert pick_samples(files, 3, path=lambda f: f[0], mtime=lambda f: f[1]) == files
+
+
+def test_common_schema_requires_all_samples_to_agree():
+    schema = Schema(("id", "name"))
+    same = [Sample("a", schema), Sample("b", Schema(("id", "name")))]
+
+    assert common_schema(same) is same[0]
+    assert common_schema([*same, Sample("c", Schema(("id",)))]) is None
+    assert common_schema([*same, Sample("c", None)]) is None
+    assert common_schema([Sample("a", None), *same]) is None
+
+
+def test_sampled_metadata():
+    assert sampled_metadata("bucket/part-0.parquet", 3, 100) == {
+        "SchemaInference": "sampled",
+        "SchemaSampledFrom": "bucket/part-0.parquet",
+        "SchemaSampleSize": 3,
+        "SchemaGroupSize": 100,
+    }
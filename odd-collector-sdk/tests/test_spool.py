@@ -0,0 +1,152 @@
+import pytest
+from odd_collector_sdk.domain.plugin import Plugin
+from odd_collector_sdk.errors import IngestionDataError
+from odd_collector_sdk.job import SyncJob
+from odd_collector_sdk.spool import Spool, SpoolFullError
+from odd_models.models import DataEntity, DataEntityList, DataEntityType
+
+
+def batch(*names: str) -> DataEntityList:
+    return DataEntityList(
+        data_source_oddrn="//test/spool",
+        items=[
+            DataEntity(
+                oddrn=f"//test/spool/{name}", name=name, type=DataEntityType.TABLE
+            )
+            for name in names
+        ],
+    )
+
+
+def names(data_entity_list: DataEntityList) -> list:
+    return [entity.name for entity in data_entity_list.items]
+
+
+def test_spool_replays_batches_in_order(tmp_path):
+    spool = Spool(tmp_path, max_bytes=1024 * 1024)
+    spool.append("pg", batch("a", "b"))
+    spool.append("pg", batch("c"))
+
+    records = list(spool.read("pg"))
+    assert [names(del_) for _, del_ in records] == [["a", "b"], ["c"]]
+
+    spool.consume("pg", records[0][0])
+    assert [names(del_) for _, del_ in spool.read("pg")] == [["c"]]
+
+    spool.consume("pg", records[1][0] - records[0][0])
+    assert spool.size("pg") == 0
+
+
+def test_spool_size_is_limited(tmp_path):
+    spool = Spool(tmp_path, max_bytes=1024 * 1024)
+    spool.append("pg", batch("a"))
+
+    spool = Spool(tmp_path, max_bytes=spool.size("pg") + 10)
+    with pytest.raises(SpoolFullError):
+        spool.append("pg", batch(*map(str, range(50))))
+
+
+def test_spool_drops_partially_written_record(tmp_path):
+    spool = Spool(tmp_path, max_bytes=1024 * 1024)
+    spool.append("pg", batch("a"))
+    with open(tmp_path / "pg.spool", "ab") as f:
+        f.write(b"\x00\x00\x10\x00broken")
+
+    spool = Spool(tmp_path, max_bytes=1024 * 1024)
+    spool.append("pg", batch("b"))
+    assert [names(del_) for _, del_ in spool.read("pg")] == [["a"], ["b"]]
+
+
+class Adapter:
+    config = Plugin(type="test", name="spooled")
+
+    def __init__(self, *names: str):
+        self.names = names
+
+    def get_data_source_oddrn(self) -> str:
+        return "//test/spool"
+
+    def get_data_entity_list(self) -> DataEntityList:
+        return batch(*self.names)
+
+
+class FlakyApi:
+    def __init__(self):
+        self.available = True
+        self.ingested = []
+
+    async def ingest_data(self, data_entity_list: DataEntityList):
+        if not self.available:
+            raise IngestionDataError("Service unavailable", data_entity_list, 503)
+        self.ingested.append(names(data_entity_list))
+
+
+@pytest.mark.asyncio
+async def test_job_spools_batches_while_platform_is_unavailable(tmp_path):
+    api, spool = FlakyApi(), Spool(tmp_path, max_bytes=1024 * 1024)
+
+    api.available = False
+    await SyncJob(api, Adapter("a", "b", "c"), chunk_size=2, spool=spool).start()
+    assert api.ingested == []
+    assert spool.size("spooled") > 0
+
+    # spooled batches are sent before the next run's ones,
+    # entities which were sent by the run already are skipped
+    api.available = True
+    await SyncJob(api, Adapter("a", "b", "d"), chunk_size=3, spool=spool).start()
+    assert api.ingested == [["a", "b"], ["c"], ["a", "b", "d"]]
+    assert spool.size("spooled") == 0
+
+
+@pytest.mark.asyncio
+async def test_job_fails_on_rejected_batch_with_spool(tmp_path):
+    class RejectingApi(FlakyApi):
+        async def ingest_data(self, data_entity_list: DataEntityList):
+            raise IngestionDataError("Bad request", data_entity_list, 400)
+
+    spool = Spool(tmp_path, max_bytes=1024 * 1024)
+    await SyncJob(RejectingApi(), Adapter("a"), chunk_size=2, spool=spool).start()
+    assert spool.size("spooled") == 0
+
+
+def test_spool_drops_records_which_cant_be_decoded(tmp_path):
+    spool = Spool(tmp_path, max_bytes=1024 * 1024)
+    spool.append("pg", batch("a"))
+    with open(tmp_path / "pg.spool", "ab") as f:
+        f.write(b"\x00\x00\x00\x06broken")
+    spool.append("pg", batch("b"))
+
+    records = [del_ and names(del_) for _, del_ in spool.read("pg")]
+    assert records == [["a"], None, ["b"]]
+
+
+@pytest.mark.asyncio
+async def test_job_drops_spooled_batches_which_cant_be_replayed(tmp_path):
+    class RejectingApi(FlakyApi):
+        async def ingest_data(self, data_entity_list: DataEntityList):
+            if names(data_entity_list) == ["rejected"]:
+                raise IngestionDataError("Bad request", data_entity_list, 422)
+            await super().ingest_data(data_entity_list)
+
+    spool = Spool(tmp_path, max_bytes=1024 * 1024)
+    spool.append("spooled", batch("rejected"))
+    with open(tmp_path / "spooled.spool", "ab") as f:
+        f.write(b"\x00\x00\x00\x06broken")
+    spool.append("spooled", batch("b"))
+
+    api = RejectingApi()
+    await SyncJob(api, Adapter("c"), chunk_size=2, spool=spool).start()
+    assert api.ingested == [["b"], ["c"]]
+    assert spool.size("spooled") == 0
+
+
+@pytest.mark.asyncio
+async def test_job_keeps_spooled_batches_while_platform_is_unavailable(tmp_path):
+    api, spool = FlakyApi(), Spool(tmp_path, max_bytes=1024 * 1024)
+    spool.append("spooled", batch("a"))
+    size = spool.size("spooled")
+
+    api.available = False
+    await SyncJob(api, Adapter("b"), chunk_size=2, spool=spool).start()
+    assert [names(del_) for _, del_ in spool.read("spooled")] == [["a"], ["b"]]
+    assert spool.size("spooled") > size
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+from odd_collector_sdk.domain.plugin import Plugin
+from odd_collector_sdk.job import SyncJob
+from odd_collector_sdk.state_store import IncrementalRun, StateStore
+from odd_models.models import DataEntity, DataEntityList, DataEntityType
+
+
+class FakeApi:
+    def __init__(self):
+        self.ingested: list[DataEntityList] = []
+
+    async def ingest_data(self, data_entity_list: DataEntityList):
+        self.ingested.append(data_entity_list)
+
+
+class Adapter:
+    def __init__(self, names: list[str]):
+        self.config = Plugin(type="test", name="incremental")
+        self.names = names
+
+    def get_data_source_oddrn(self) -> str:
+        return "//test"
+
+    def get_data_entity_list(self) -> DataEntityList:
+        return DataEntityList(
+            data_source_oddrn=self.get_data_source_oddrn(),
+            items=[
+                DataEntity(oddrn=f"//test/{i}", name=name, type=DataEntityType.TABLE)
+                for i, name in enumerate(self.names)
+            ],
+        )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StateStore(tmp_path)
+    yield store
+    store.close()
+
+
+def sent_names(api: FakeApi) -> list[str]:
+    return [item.name for del_ in api.ingested for item in del_.items]
+
+
+@pytest.mark.asyncio
+async def test_only_changed_entities_are_sent(store):
+    adapter = Adapter(["a", "b", "c"])
+
+    api = FakeApi()
+    await SyncJob(api, adapter, state_store=store).start()
+    assert sent_names(api) == ["a", "b", "c"]
+
+    api = FakeApi()
+    await SyncJob(api, adapter, state_store=store).start()
+    assert sent_names(api) == []
+
+    adapter.names = ["a", "changed", "c", "new"]
+    api = FakeApi()
+    await SyncJob(api, adapter, state_store=store).start()
+    assert sent_names(api) == ["changed", "new"]
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_sent_again(store):
+    class FailingApi(FakeApi):
+        async def ingest_data(self, data_entity_list: DataEntityList):
+            raise RuntimeError("platform is down")
+
+    adapter = Adapter(["a", "b"])
+    await SyncJob(FailingApi(), adapter, state_store=store).start()
+
+    api = FakeApi()
+    await SyncJob(api, adapter, state_store=store).start()
+    assert sent_names(api) == ["a", "b"]
+
+
+def test_full_resync(store):
+    del_ = Adapter(["a", "b"]).get_data_entity_list()
+
+    run = IncrementalRun(store, "plugin", full_resync_interval_hours=1)
+    assert run.is_full
+    run.commit(run.filter(del_))
+    run.finish()
+
+    assert not IncrementalRun(store, "plugin", full_resync_interval_hours=1).is_full
+
+    store.save_full_sync("plugin", time.time() - 3600)
+    run = IncrementalRun(store, "plugin", full_resync_interval_hours=1)
+    assert run.is_full
+    assert len(run.filter(del_).items) == 2
+    assert run.stats.skipped == 0
+
+
+def test_full_run_removes_disappeared_entities(store):
+    adapter = Adapter(["a", "b"])
+    run = IncrementalRun(store, "plugin")
+    run.commit(run.filter(adapter.get_data_entity_list()))
+    run.finish()
+
+    store.save_full_sync("plugin", 0)
+    adapter.names = ["a"]
+    run = IncrementalRun(store, "plugin", full_resync_interval_hours=1)
+    run.commit(run.filter(adapter.get_data_entity_list()))
+    run.finish()
+
+    assert list(store.get_hashes("plugin")) == ["//test/0"]
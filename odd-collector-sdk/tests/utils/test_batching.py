@@ -0,0 +1,60 @@
+from odd_collector_sdk.utils.batching import estimate_entity_size, split_by_size
+from odd_models.models import (
+    DataEntity,
+    DataEntityType,
+    DataSet,
+    DataSetField,
+    DataSetFieldType,
+    Type,
+)
+
+
+def table(index: int, columns: int) -> DataEntity:
+    return DataEntity(
+        oddrn=f"//test/tables/{index}",
+        name=f"table_{index}",
+        type=DataEntityType.TABLE,
+        dataset=DataSet(
+            field_list=[
+                DataSetField(
+                    oddrn=f"//test/tables/{index}/columns/{j}",
+                    name=f"column_{j}",
+                    type=DataSetFieldType(
+                        type=Type.TYPE_STRING, logical_type="varchar", is_nullable=True
+                    ),
+                )
+                for j in range(columns)
+            ]
+        ),
+    )
+
+
+def test_estimate_entity_size_is_close_to_serialized_size():
+    entity = table(0, 100)
+    serialized_size = len(entity.model_dump_json())
+
+    assert serialized_size / 2 < estimate_entity_size(entity) < serialized_size * 2
+
+
+def test_split_by_items_count():
+    items = [table(i, 1) for i in range(5)]
+    assert [len(batch) for batch in split_by_size(items, 2)] == [2, 2, 1]
+
+
+def test_split_by_size():
+    items = [table(0, 1), table(1, 100), table(2, 100), table(3, 1), table(4, 1)]
+    max_bytes = estimate_entity_size(items[1]) + 1
+
+    batches = list(split_by_size(items, 250, max_bytes))
+
+    assert [[item.name for item in batch] for batch in batches] == [
+        ["table_0"],
+        ["table_1"],
+        ["table_2"],
+        ["table_3", "table_4"],
+    ]
+
+
+def test_split_keeps_oversized_entity():
+    items = [table(0, 100)]
+    assert list(split_by_size(items, 250, 1)) == [items]
@@ -0,0 +1,83 @@
+import pytest
+from odd_collector_sdk import metrics
+from odd_collector_sdk.domain.plugin import Plugin
+from odd_collector_sdk.job import SyncJob
+from odd_collector_sdk.utils.profiling import RunProfiler, current_profiler, phase
+from odd_models.models import DataEntity, DataEntityList, DataEntityType
+
+
+class FakeApi:
+    async def ingest_data(self, data_entity_list: DataEntityList):
+        pass
+
+
+class Adapter:
+    def __init__(self, name: str):
+        self.config = Plugin(type="test", name=name)
+
+    def get_data_source_oddrn(self) -> str:
+        return f"//test/{self.config.name}"
+
+    @phase("fetch")
+    def fetch(self) -> list:
+        return [bytearray(1024 * 1024) for _ in range(4)]
+
+    def get_data_entity_list(self) -> DataEntityList:
+        rows = self.fetch()
+        with phase("map"):
+            items = [
+                DataEntity(oddrn=f"//test/{i}", name=str(i), type=DataEntityType.TABLE)
+                for i in range(len(rows))
+            ]
+        return DataEntityList(
+            data_source_oddrn=self.get_data_source_oddrn(), items=items
+        )
+
+
+def test_phase_records_duration_without_profiler():
+    with metrics.track_run("phase_without_profiler") as summary:
+        with phase("fetch"):
+            pass
+        summary.status = "success"
+
+    assert "fetch" in summary.phases
+    assert (
+        metrics.PHASE_DURATION.get_count(plugin="phase_without_profiler", phase="fetch")
+        == 1
+    )
+
+
+def test_nested_phases_are_profiled_separately():
+    profiler = RunProfiler("nested")
+    token = current_profiler.set(profiler)
+    profiler.start()
+    try:
+        with phase("outer"):
+            data = bytearray(1024 * 1024)
+            with phase("inner"):
+                inner_data = bytearray(8 * 1024 * 1024)
+            del inner_data
+        del data
+    finally:
+        profiler.stop()
+        current_profiler.reset(token)
+
+    outer, inner = profiler.phases["outer"], profiler.phases["inner"]
+    assert outer.calls == inner.calls == 1
+    assert inner.memory_peak >= 8 * 1024 * 1024
+    # memory allocated by the inner phase counts towards the outer one's peak too
+    assert outer.memory_peak >= 9 * 1024 * 1024
+    assert outer.profile is not None and inner.profile is not None
+
+
+@pytest.mark.asyncio
+async def test_job_writes_profiling_report(tmp_path):
+    job = SyncJob(
+        FakeApi(), Adapter("profiled"), chunk_size=10, profiling_dir=str(tmp_path)
+    )
+    await job.start()
+
+    report = (tmp_path / "profiled.txt").read_text()
+    assert "Phase fetch: 1 calls" in report
+    assert "Phase map: 1 calls" in report
+    assert (tmp_path / "profiled.fetch.prof").exists()
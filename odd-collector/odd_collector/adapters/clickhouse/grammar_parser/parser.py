@@ -1,6 +1,7 @@
 from typing import Union
 
-from lark import Lark, Token, Tree
+from lark import Token, Tree
+from odd_collector_sdk.grammar_parser.parse_cache import LazyParser
 
 from ..logger import logger
 from .column_type import (
@@ -28,7 +29,7 @@ Tuple(String, Boolean).
 LARL does not support the different types of Tuples presented in field_types.lark
 """
 
-parser = Lark.open("field_types.lark", rel_to=__file__, parser="earley", start="type")
+parser = LazyParser("field_types.lark", rel_to=__file__, parser="earley")
 
 
 def traverse_tree(node) -> Union[ParseType, str, Field, None]:
@@ -1,5 +1,6 @@
 from typing import List
 
+from odd_collector_sdk.grammar_parser import parse_cache
 from odd_models.models import DataSetField, DataSetFieldType, Type
 from oddrn_generator import ClickHouseGenerator
 
@@ -141,7 +142,7 @@ def build_dataset_fields(
                 )
 
     for column in columns:
-        type_tree = parser.parse(column.type)
+        type_tree = parse_cache.parse(parser, column.type)
         column_type = traverse_tree(type_tree)
 
         _build_dataset_fields(column.name, column_type)
@@ -1,9 +1,10 @@
-from lark import Lark, Token, Tree
+from lark import Token, Tree
+from odd_collector_sdk.grammar_parser.parse_cache import LazyParser
 
 from .column_type import ArrayType, BasicType, Field, Map, ParseType, Struct
 from .exceptions import *
 
-parser = Lark.open("field_types.lark", rel_to=__file__, parser="lalr", start="type")
+parser = LazyParser("field_types.lark", rel_to=__file__, parser="lalr")
 
 
 def traverse_tree(node):
@@ -1,5 +1,6 @@
 from typing import List, Union
 
+from odd_collector_sdk.grammar_parser import parse_cache
 from odd_collector_sdk.utils.metadata import DefinitionType, extract_metadata
 from odd_models.models import DataSetField, DataSetFieldType, Type
 from oddrn_generator import DatabricksUnityCatalogGenerator
@@ -21,7 +22,7 @@ def build_dataset_field(
     column: DatabricksColumn, oddrn_generator: DatabricksUnityCatalogGenerator
 ) -> List[DataSetField]:
     logger.debug(f"Build dataset field for {column.name} with type {column.type}")
-    type_tree = parser.parse(column.type)
+    type_tree = parse_cache.parse(parser, column.type)
     column_type = traverse_tree(type_tree)
 
     generated_dataset_fields = []
@@ -1,18 +1,20 @@
-import json
 import logging
-import urllib.request
 
 from odd_collector_sdk.domain.adapter import AbstractAdapter
 from odd_models.models import DataEntity, DataEntityList
 from oddrn_generator import DbtGenerator
 
-from .mappers.tables import map_table
+from .artifacts import Manifest, iter_catalog_nodes, open_artifact, read_version
+from .mappers.tables import map_tables
 
 
 class Adapter(AbstractAdapter):
     def __init__(self, config) -> None:
         self.__url = config.odd_catalog_url
         self.__oddrn_generator = DbtGenerator(host_settings=config.host)
+        # versions of artifacts of the last run and datasets mapped from them
+        self.__versions = None
+        self.__datasets: list[DataEntity] = []
 
     def get_data_entity_list(self) -> DataEntityList:
         return DataEntityList(
@@ -24,16 +26,38 @@ class Adapter(AbstractAdapter):
         return self.__oddrn_generator.get_data_source_oddrn()
 
     def get_datasets(self) -> list[DataEntity]:
+        """
+        Artifacts are read as streams: manifest.json is reduced to the fields used by
+        mappers, and nodes of catalog.json are mapped one by one. When neither
+        artifact was regenerated since the last run, datasets of that run are reused.
+        """
+        catalog_url = f"{self.__url}catalog.json"
+        manifest_url = f"{self.__url}manifest.json"
         try:
-            with urllib.request.urlopen(f"{self.__url}catalog.json") as catalog_file:
-                catalog_json: dict = json.load(catalog_file)
+            versions = []
+            for url in (catalog_url, manifest_url):
+                with open_artifact(url) as artifact_file:
+                    versions.append(read_version(artifact_file))
 
-            with urllib.request.urlopen(f"{self.__url}manifest.json") as manifest_file:
-                manifest_json: dict = json.load(manifest_file)
+            if self.__versions is not None and versions == self.__versions:
+                logging.info("dbt artifacts haven't changed since the last run")
+                return self.__datasets
 
-            tables: dict = catalog_json["nodes"]
+            with open_artifact(manifest_url) as manifest_file:
+                manifest = Manifest.read(manifest_file)
 
-            return map_table(self.__oddrn_generator, tables, manifest_json)
+            with open_artifact(catalog_url) as catalog_file:
+                datasets = list(
+                    map_tables(
+                        self.__oddrn_generator,
+                        iter_catalog_nodes(catalog_file),
+                        manifest,
+                    )
+                )
+
+            if None not in versions:
+                self.__versions, self.__datasets = versions, datasets
+            return datasets
 
         except Exception as e:
             logging.error("Failed to load metadata for tables")
@@ -0,0 +1,75 @@
+import gzip
+import io
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, TextIO
+from urllib.parse import urlparse
+
+from odd_collector.helpers.json_stream import iter_sections
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# fields of manifest's nodes used by mappers, the rest isn't kept in memory
+NODE_FIELDS = ("database", "schema", "name", "root_path", "path", "compiled_sql")
+
+
+@contextmanager
+def open_artifact(location: str) -> Iterator[TextIO]:
+    """
+    Open dbt artifact by url or local path, gzip compressed artifacts are detected
+    by their content and decompressed on the fly.
+    """
+    scheme = urlparse(location).scheme
+    if len(scheme) > 1:
+        raw = io.BufferedReader(urllib.request.urlopen(location))
+    else:
+        raw = open(location, "rb")
+
+    with raw:
+        stream = gzip.GzipFile(fileobj=raw) if raw.peek(2)[:2] == GZIP_MAGIC else raw
+        with io.TextIOWrapper(stream, encoding="utf-8") as text:
+            yield text
+
+
+def read_version(stream: TextIO) -> Optional[tuple[str, str]]:
+    """
+    Read version of an artifact from its metadata, which is the first member of
+    dbt artifacts, so the rest of the artifact isn't read.
+    @return: generated_at and invocation_id, None if artifact has no metadata
+    """
+    for section, _, value in iter_sections(stream, ()):
+        if section == "metadata":
+            return value.get("generated_at"), value.get("invocation_id")
+    return None
+
+
+@dataclass
+class Manifest:
+    nodes: dict[str, dict] = field(default_factory=dict)
+    parent_map: dict[str, list[str]] = field(default_factory=dict)
+    child_map: dict[str, list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def read(cls, stream: TextIO) -> "Manifest":
+        """Read nodes and lineage of manifest.json node by node."""
+        manifest = cls()
+        sections = {
+            "nodes": manifest.nodes,
+            "parent_map": manifest.parent_map,
+            "child_map": manifest.child_map,
+        }
+        for section, key, value in iter_sections(stream, sections):
+            if section not in sections or key is None:
+                continue
+            if section == "nodes":
+                value = {name: value.get(name) for name in NODE_FIELDS}
+            sections[section][key] = value
+        return manifest
+
+
+def iter_catalog_nodes(stream: TextIO) -> Iterator[tuple[str, dict]]:
+    """Iterate nodes of catalog.json one by one."""
+    for section, key, value in iter_sections(stream, {"nodes"}):
+        if section == "nodes" and key is not None:
+            yield key, value
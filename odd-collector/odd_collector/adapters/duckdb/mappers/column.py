@@ -1,5 +1,6 @@
 from typing import Union
 
+from odd_collector_sdk.grammar_parser import parse_cache
 from odd_collector_sdk.utils.metadata import DefinitionType, extract_metadata
 from odd_models.models import DataSetField, DataSetFieldType, Type
 from oddrn_generator import DuckDBGenerator
@@ -22,7 +23,7 @@ def build_dataset_field(
     column: DuckDBColumn, oddrn_generator: DuckDBGenerator
 ) -> list[DataSetField]:
     logger.debug(f"Build dataset field for {column.name} with type {column.type}")
-    type_tree = parser.parse(column.type)
+    type_tree = parse_cache.parse(parser, column.type)
     column_type = traverse_tree(type_tree)
 
     generated_dataset_fields = []
@@ -26,6 +26,9 @@ class Client:
         response = self._es.indices.get_data_stream(name=name)
         return response["data_streams"]
 
+    def get_aliases(self) -> dict:
+        return self._es.indices.get_alias().body
+
     def get_index_template(self, template_name: str) -> list[dict]:
         return self._es.indices.get_index_template(name=template_name).body.get(
             "index_templates"
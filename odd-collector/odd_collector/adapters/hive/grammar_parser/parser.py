@@ -1,5 +1,3 @@
-from lark import Lark
+from odd_collector_sdk.grammar_parser.parse_cache import LazyParser
 
-parser = Lark.open(
-    "hive_field_type_grammar.lark", rel_to=__file__, parser="lalr", start="type"
-)
+parser = LazyParser("hive_field_type_grammar.lark", rel_to=__file__, parser="lalr")
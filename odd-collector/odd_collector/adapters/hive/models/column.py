@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from odd_collector_sdk.grammar_parser import parse_cache
+
 from ..grammar_parser.parser import parser
 from ..grammar_parser.transformer import transformer
 from ..logger import logger
@@ -18,7 +20,7 @@ class Column:
 
 def parse_column_type(column_type: str) -> ColumnType:
     try:
-        parsed = parser.parse(column_type)
+        parsed = parse_cache.parse(parser, column_type)
         col_type: ColumnType = transformer.transform(parsed)
         col_type.logical_type = column_type
 
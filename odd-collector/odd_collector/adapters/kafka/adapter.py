@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import requests
 from confluent_kafka import Consumer, KafkaException, TopicPartition
@@ -11,6 +11,8 @@ from odd_models.models import DataEntity, DataEntityList
 
 from .kafka_generator import KafkaGenerator
 from .mappers.schemas import map_topics
+from .sampler import TopicSampler
+from .schema_registry import NON_REGISTRY, SchemaRegistryFetcher
 
 FORMAT = "%(asctime)s | %(levelname)s | %(name)s  | %(message)s"
 
@@ -23,6 +25,7 @@ class Adapter(AbstractAdapter):
     def __init__(self, config) -> None:
         self.schema_registry_conf = config.schema_registry_conf
         self.broker_conf = config.broker_conf
+        self.schema_registry_workers = config.schema_registry_workers
         logging.debug(config.broker_conf)
         logging.debug(config.schema_registry_conf)
         if not self.broker_conf.get("group.id"):
@@ -47,8 +50,18 @@ class Adapter(AbstractAdapter):
                 f"Unable to connect to schema registry on url '{self.schema_registry_conf.get('url')}', schema will be skipped"
             )
             self.schema_client = None
-            self.schema_subjects = None
         self.consumer = Consumer(self.broker_conf)
+        self.sampler = (
+            TopicSampler(
+                self.broker_conf,
+                messages_per_partition=config.sample_messages_per_partition,
+                max_topics=config.sample_max_topics_per_run,
+                workers=config.sample_workers,
+                timeout=config.sample_timeout_seconds,
+            )
+            if config.sample_non_registry_topics
+            else None
+        )
 
     def get_data_source_oddrn(self) -> str:
         logging.debug(self.__oddrn_generator.get_data_source_oddrn())
@@ -60,11 +73,13 @@ class Adapter(AbstractAdapter):
         an odd list of data entities
         """
         try:
-            self.schema_subjects = (
-                self.schema_client.get_subjects() if self.schema_client else None
+            # one fetcher per run, so schemas shared between topics are requested once
+            registry = (
+                SchemaRegistryFetcher(self.schema_client, self.schema_registry_workers)
+                if self.schema_client
+                else None
             )
-
-            topics = self.retrieve_schemas()
+            topics = self.retrieve_schemas(registry)
             # logging.debug("*************SCHEMA******************")
             logging.debug(topics)
             # logging.debug("*************SCHEMA******************")
@@ -73,7 +88,7 @@ class Adapter(AbstractAdapter):
                 self.__oddrn_generator,
                 topics,
                 self.broker_conf.get("bootstrap.servers"),
-                self.schema_client,
+                registry,
             )
         except Exception as e:
             logging.error("Failed to load metadata for tables")
@@ -91,47 +106,37 @@ class Adapter(AbstractAdapter):
         logging.debug("*************DataEntity******************")
         return res
 
-    def retrieve_schemas(self):
+    def retrieve_schemas(self, registry: Optional[SchemaRegistryFetcher] = None):
         try:
             topics = self.admin_client.list_topics()
+            registry_schemas = registry.fetch(topics.topics) if registry else {}
+            sampled_schemas = (
+                self.sampler.get_schemas(
+                    {
+                        topic: list(topic_metadata.partitions)
+                        for topic, topic_metadata in topics.topics.items()
+                        if not topic.startswith("_")
+                        and registry_schemas.get(topic, {}).get("value")
+                        in (None, NON_REGISTRY)
+                    }
+                )
+                if self.sampler
+                else {}
+            )
 
             schemas = []
-            for topic in topics.topics.items():
-                schema = {
-                    "title": topic[
-                        0
-                    ]  # TODO add row number, creation and modification date  like in mongo if possible
-                }
+            for topic, topic_metadata in topics.topics.items():
+                # TODO add row number, creation and modification date  like in mongo if possible
+                schema = {"title": topic}
                 metadata = {}
-                metadata["partitions"] = len(topic[1].partitions.keys())
+                metadata["partitions"] = len(topic_metadata.partitions.keys())
                 schema["metadata"] = metadata
-                msg = None
-
-                if self.schema_subjects and f"{topic[0]}-value" in self.schema_subjects:
-                    schema["value"] = eval(
-                        self.schema_client.get_latest_version(
-                            f"{topic[0]}-value"
-                        ).schema.schema_str
-                    )
-                    logger.info(
-                        f"Found schema in schema registry for topic: {topic[0]}"
-                    )
-                else:
-                    schema["value"] = {"type": "non-registry"}
-                    schema["value"]["data"] = None
-
-                if self.schema_subjects and f"{topic[0]}-key" in self.schema_subjects:
-                    schema["key"] = eval(
-                        self.schema_client.get_latest_version(
-                            f"{topic[0]}-key"
-                        ).schema.schema_str
-                    )
-                    logger.info(
-                        f"Found  key schema in schema registry for topic: {topic[0]}"
-                    )
-                else:
-                    schema["key"] = {"type": "non-registry"}
-                    schema["key"]["data"] = None
+
+                topic_schemas = registry_schemas.get(topic, {})
+                schema["value"] = topic_schemas.get("value", dict(NON_REGISTRY))
+                if topic in sampled_schemas:
+                    schema["value"] = sampled_schemas[topic]
+                schema["key"] = topic_schemas.get("key", dict(NON_REGISTRY))
 
                 schemas.append(schema)
             return schemas
@@ -0,0 +1,100 @@
+"""
+Inference of JSON schema from sampled messages of topics without a schema registry
+subject.
+
+Inferred schema is the one understood by JsonParser:
+    - primitives: {"type": "string" | "integer" | "number" | "boolean"}
+    - objects: {"type": "object", "properties": {...}, "required": [...]}
+    - arrays: {"type": "array", "items": {...}}
+    - values of different types in different messages: list of their schemas
+
+Nulls and empty arrays carry no type information, properties having only them are
+skipped, and properties which are null or missing in some messages aren't required.
+"""
+import json
+from functools import reduce
+from typing import Any, Iterable, List, Optional, Union
+
+from .parser.types import RawSchema
+
+Schema = Union[RawSchema, List[RawSchema]]
+
+
+def infer_schema(value: Any) -> Optional[RawSchema]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return {"type": "boolean"}
+    if isinstance(value, int):
+        return {"type": "integer"}
+    if isinstance(value, float):
+        return {"type": "number"}
+    if isinstance(value, str):
+        return {"type": "string"}
+    if isinstance(value, list):
+        items = merge_all(infer_schema(item) for item in value)
+        return {"type": "array", "items": items} if items is not None else None
+    if isinstance(value, dict):
+        properties = {}
+        for name, property_value in value.items():
+            property_schema = infer_schema(property_value)
+            if property_schema is not None:
+                properties[name] = property_schema
+        return {
+            "type": "object",
+            "properties": properties,
+            "required": list(properties),
+        }
+    return None
+
+
+def infer_payload_schema(payload: Optional[bytes]) -> Optional[RawSchema]:
+    """Returns schema of a JSON object payload, None for anything else."""
+    if not payload:
+        return None
+    try:
+        value = json.loads(payload)
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return infer_schema(value) if isinstance(value, dict) else None
+
+
+def merge_all(schemas: Iterable[Optional[Schema]]) -> Optional[Schema]:
+    return reduce(merge_schemas, schemas, None)
+
+
+def merge_schemas(a: Optional[Schema], b: Optional[Schema]) -> Optional[Schema]:
+    if a is None:
+        return b
+    if b is None or a == b:
+        return a
+
+    variants = list(a) if isinstance(a, list) else [a]
+    for schema in b if isinstance(b, list) else [b]:
+        for i, variant in enumerate(variants):
+            if _kind(variant) == _kind(schema):
+                variants[i] = _merge_same_kind(variant, schema)
+                break
+        else:
+            variants.append(schema)
+
+    return variants[0] if len(variants) == 1 else variants
+
+
+def _kind(schema: RawSchema) -> str:
+    # integers and floats are merged into number
+    return "number" if schema["type"] == "integer" else schema["type"]
+
+
+def _merge_same_kind(a: RawSchema, b: RawSchema) -> RawSchema:
+    if a["type"] == "object":
+        properties = dict(a["properties"])
+        for name, schema in b["properties"].items():
+            properties[name] = merge_schemas(properties.get(name), schema)
+        required = [name for name in a["required"] if name in b["required"]]
+        return {"type": "object", "properties": properties, "required": required}
+
+    if a["type"] == "array":
+        return {"type": "array", "items": merge_schemas(a["items"], b["items"])}
+
+    return a if a["type"] == b["type"] else {"type": "number"}
@@ -20,7 +20,7 @@ def __extract_referenced_nodes(
     )
 
     for reference in references:
-        rs = schema_client.get_version(reference["name"], reference["version"])
+        rs = schema_client.get_version(reference["subject"], reference["version"])
 
         if len(rs.schema.references) > 0:
             nodes.extend(__extract_referenced_nodes(rs, schema_client))
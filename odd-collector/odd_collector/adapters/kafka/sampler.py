@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from confluent_kafka import Consumer, KafkaError, TopicPartition
+
+from .mappers.inference import infer_payload_schema, merge_schemas
+from .mappers.parser.types import RawSchema
+
+logger = logging.getLogger("KafkaAdapter")
+
+
+@dataclass
+class SampledTopic:
+    high_watermarks: Tuple[int, ...]
+    schema: Optional[RawSchema]
+    checked_at: float
+
+
+class TopicSampler:
+    """Infers schemas of topics without a schema registry subject from last messages.
+
+    Samples are cached per topic together with high watermarks of its partitions,
+    a topic is sampled again only when new messages were produced to it.
+    Each run checks at most `max_topics` topics, the ones which were never checked or
+    checked longest ago go first, the rest keep the schema from previous runs.
+
+    Args:
+        broker_conf: consumer config, offsets are never committed.
+        messages_per_partition: number of last messages read from every partition.
+        max_topics: number of topics checked per run.
+        workers: number of topics sampled concurrently.
+        timeout: seconds spent on one topic.
+    """
+
+    def __init__(
+        self,
+        broker_conf: dict,
+        messages_per_partition: int,
+        max_topics: int,
+        workers: int,
+        timeout: float,
+    ) -> None:
+        self._conf = {
+            **broker_conf,
+            "enable.auto.commit": False,
+            "enable.partition.eof": True,
+        }
+        self._messages_per_partition = messages_per_partition
+        self._max_topics = max_topics
+        self._workers = workers
+        self._timeout = timeout
+        self._cache: Dict[str, SampledTopic] = {}
+        self._lock = threading.Lock()
+
+    def get_schemas(self, topics: Dict[str, List[int]]) -> Dict[str, RawSchema]:
+        """Returns inferred schemas of topics, given as {topic: [partition, ...]}"""
+        for removed in self._cache.keys() - topics.keys():
+            del self._cache[removed]
+
+        to_check = sorted(
+            topics,
+            key=lambda t: self._cache[t].checked_at if t in self._cache else 0,
+        )[: self._max_topics]
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            for topic, error in zip(
+                to_check,
+                executor.map(lambda t: self._check(t, topics[t]), to_check),
+            ):
+                if error is not None:
+                    logger.warning(f"Couldn't sample topic {topic}: {error}")
+
+        return {
+            topic: sampled.schema
+            for topic, sampled in self._cache.items()
+            if sampled.schema is not None
+        }
+
+    def _check(self, topic: str, partitions: Iterable[int]) -> Optional[Exception]:
+        consumer = Consumer(self._conf)
+        try:
+            offsets = []
+            for partition in sorted(partitions):
+                low, high = consumer.get_watermark_offsets(
+                    TopicPartition(topic, partition), timeout=self._timeout
+                )
+                offsets.append((partition, low, high))
+            high_watermarks = tuple(high for _, _, high in offsets)
+
+            cached = self._cache.get(topic)
+            if cached is not None and cached.high_watermarks == high_watermarks:
+                cached.checked_at = time.time()
+                return None
+
+            schema = self._sample(consumer, topic, offsets)
+            with self._lock:
+                self._cache[topic] = SampledTopic(high_watermarks, schema, time.time())
+        except Exception as e:
+            return e
+        finally:
+            consumer.close()
+
+    def _sample(
+        self, consumer: Consumer, topic: str, offsets: List[Tuple[int, int, int]]
+    ) -> Optional[RawSchema]:
+        # last offset to read in every not empty partition
+        last_offsets = {
+            partition: high - 1 for partition, low, high in offsets if high > low
+        }
+        if not last_offsets:
+            return None
+
+        consumer.assign(
+            [
+                TopicPartition(
+                    topic, partition, max(low, high - self._messages_per_partition)
+                )
+                for partition, low, high in offsets
+                if partition in last_offsets
+            ]
+        )
+
+        schema = None
+        deadline = time.monotonic() + self._timeout
+        while last_offsets and time.monotonic() < deadline:
+            message = consumer.poll(timeout=max(0.0, deadline - time.monotonic()))
+            if message is None:
+                continue
+
+            error = message.error()
+            if error is not None:
+                if error.code() == KafkaError._PARTITION_EOF:
+                    last_offsets.pop(message.partition(), None)
+                else:
+                    logger.debug(f"Error while sampling topic {topic}: {error}")
+                continue
+
+            schema = merge_schemas(schema, infer_payload_schema(message.value()))
+            if message.offset() >= last_offsets.get(message.partition(), -1):
+                last_offsets.pop(message.partition(), None)
+
+        # top-level union can't be mapped to fields of the topic
+        return schema if isinstance(schema, dict) else None
@@ -0,0 +1,75 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from confluent_kafka.schema_registry import RegisteredSchema, SchemaRegistryClient
+
+logger = logging.getLogger("KafkaAdapter")
+
+NON_REGISTRY = {"type": "non-registry", "data": None}
+
+
+class SchemaRegistryFetcher:
+    """Fetches schemas of topics from schema registry concurrently.
+
+    One instance is meant for one collector run: subjects are listed once, and every
+    (subject, version) is requested once and shared by all topics referencing it.
+    Fetcher can be used instead of SchemaRegistryClient by schema mappers,
+    as it has the same `get_version` method.
+    """
+
+    def __init__(self, client: SchemaRegistryClient, max_workers: int) -> None:
+        self._client = client
+        self._max_workers = max_workers
+        self._subjects = set(client.get_subjects())
+        self._versions: Dict[Tuple[str, int], RegisteredSchema] = {}
+        self._lock = threading.Lock()
+
+    def get_version(self, subject_name: str, version: int) -> RegisteredSchema:
+        key = (subject_name, version)
+        if key not in self._versions:
+            # concurrent requests of the same version are harmless, result is the same
+            registered_schema = self._client.get_version(subject_name, version)
+            with self._lock:
+                self._versions.setdefault(key, registered_schema)
+        return self._versions[key]
+
+    def fetch(self, topics: Iterable[str]) -> Dict[str, Dict[str, dict]]:
+        """Returns value and key schemas of topics, i.e. {topic: {"value": {...}, "key": {...}}}"""
+        topics = list(topics)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            values = executor.map(self._get_schema, (f"{t}-value" for t in topics))
+            keys = executor.map(self._get_schema, (f"{t}-key" for t in topics))
+            return {
+                topic: {"value": value, "key": key}
+                for topic, value, key in zip(topics, values, keys)
+            }
+
+    def _get_schema(self, subject: str) -> dict:
+        if subject not in self._subjects:
+            return dict(NON_REGISTRY)
+
+        registered_schema = self._client.get_latest_version(subject)
+        with self._lock:
+            self._versions.setdefault(
+                (subject, registered_schema.version), registered_schema
+            )
+        references = registered_schema.schema.references
+        # warm up the cache with references, mappers take them from it
+        self._fetch_references(references)
+
+        logger.info(f"Found schema in schema registry for subject: {subject}")
+        schema = json.loads(registered_schema.schema.schema_str)
+        if references:
+            schema["references"] = references
+        return schema
+
+    def _fetch_references(self, references: Optional[List[Dict[str, Any]]]) -> None:
+        for reference in references or []:
+            key = (reference["subject"], reference["version"])
+            if key in self._versions:
+                continue
+            registered_schema = self.get_version(*key)
+            self._fetch_references(registered_schema.schema.references)
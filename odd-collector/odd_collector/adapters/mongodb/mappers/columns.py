@@ -1,53 +1,85 @@
 from typing import List
 
-from odd_models.models import DataSetField, DataSetFieldType, Type
+from odd_models.models import DataSetField, DataSetFieldType, MetadataExtension, Type
 
+from ..schema_profile import FieldProfile
+from .metadata import SCHEMA_FILE_URL
 from .types import TYPES_MONGO_TO_ODD
 
+# the specification has no field extension for MongoDB, field stats are kept
+# in the dataset one
+FIELD_METADATA_SCHEMA_URL = f"{SCHEMA_FILE_URL}#/definitions/MongodbDataSetExtension"
 
-def map_columns(data: dict, oddrn_generator) -> List[DataSetField]:
+
+def map_columns(profile: FieldProfile, oddrn_generator) -> List[DataSetField]:
     collector = []
-    __map_columns(collector, data, oddrn_generator)
+    __map_columns(collector, profile, oddrn_generator)
     return collector
 
 
 def __map_columns(
-    collector: list, data: dict, oddrn_generator, parent_oddrn: str = None
-) -> List[DataSetField]:
-    for key, value in data.items():
-        metadata = {"title": key, "bsonType": type(value).__name__}
-        column = __map_column(metadata, oddrn_generator, parent_oddrn)
+    collector: list, profile: FieldProfile, oddrn_generator, parent_oddrn: str = None
+) -> None:
+    for name, field_profile in profile.fields.items():
+        column = __map_column(
+            name,
+            field_profile,
+            oddrn_generator,
+            parent_oddrn,
+            is_nullable=field_profile.is_nullable(profile),
+            presence=field_profile.presence(profile),
+        )
+        collector.append(column)
+        __map_nested(collector, field_profile, oddrn_generator, column.oddrn)
+
+
+def __map_nested(
+    collector: list, profile: FieldProfile, oddrn_generator, parent_oddrn: str
+) -> None:
+    if profile.fields:
+        __map_columns(collector, profile, oddrn_generator, parent_oddrn)
+    if profile.items is not None and profile.items.count > 0:
+        items = profile.items
+        column = __map_column(
+            "Values",
+            items,
+            oddrn_generator,
+            parent_oddrn,
+            is_nullable="NoneType" in items.types,
+        )
         collector.append(column)
-        if isinstance(value, dict):
-            __map_columns(collector, value, oddrn_generator, column.oddrn)
-        if isinstance(value, list) and len(value) > 0:
-            __map_columns(
-                collector, {"Values": value[0]}, oddrn_generator, column.oddrn
-            )
+        __map_nested(collector, items, oddrn_generator, column.oddrn)
 
 
 def __map_column(
-    column_metadata, oddrn_generator, parent_oddrn: str = None
+    name: str,
+    profile: FieldProfile,
+    oddrn_generator,
+    parent_oddrn: str = None,
+    is_nullable: bool = True,
+    presence: float = None,
 ) -> DataSetField:
-    name: str = column_metadata["title"]
-    parent_field_oddrn = parent_oddrn if parent_oddrn else None
     oddrn = (
-        oddrn_generator.get_oddrn_by_path(f"columns", name)
+        oddrn_generator.get_oddrn_by_path("columns", name)
         if parent_oddrn is None
-        else f"{parent_field_oddrn}/subcolumns/{name}"
+        else f"{parent_oddrn}/subcolumns/{name}"
     )
-    data_type: str = column_metadata["bsonType"]
-    dsf = DataSetField(
+    data_type = profile.type_name
+    metadata = {"types": dict(profile.types)}
+    if presence is not None:
+        metadata["presence"] = round(presence, 4)
+
+    return DataSetField(
         oddrn=oddrn,
         name=name,
-        parent_field_oddrn=parent_field_oddrn,
-        metadata=[],
+        parent_field_oddrn=parent_oddrn,
+        metadata=[
+            MetadataExtension(schema_url=FIELD_METADATA_SCHEMA_URL, metadata=metadata)
+        ],
         type=DataSetFieldType(
             type=TYPES_MONGO_TO_ODD.get(data_type, Type.TYPE_UNKNOWN),
-            is_nullable=column_metadata["bsonType"] != "partition_key",
-            logical_type=column_metadata["bsonType"],
+            is_nullable=is_nullable,
+            logical_type=data_type,
         ),
-        is_primary_key=column_metadata["title"] == "_id",
+        is_primary_key=name == "_id",
     )
-
-    return dsf
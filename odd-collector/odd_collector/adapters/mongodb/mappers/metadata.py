@@ -2,6 +2,11 @@ from typing import List, NamedTuple
 
 from odd_models.models import MetadataExtension
 
+SCHEMA_FILE_URL = (
+    "https://raw.githubusercontent.com/opendatadiscovery/opendatadiscovery-specification/"
+    "main/specification/extensions/mongodb.json"
+)
+
 
 def append_metadata_extension(
     metadata_list: List[MetadataExtension],
@@ -3,11 +3,7 @@ from typing import Dict, List
 from odd_models.models import DataEntity, DataEntityGroup, DataEntityType, DataSet
 
 from .columns import map_columns
-
-SCHEMA_FILE_URL = (
-    "https://raw.githubusercontent.com/opendatadiscovery/opendatadiscovery-specification/"
-    "main/specification/extensions/mongodb.json"
-)
+from .metadata import SCHEMA_FILE_URL
 
 
 def map_collection(
@@ -48,7 +44,9 @@ def map_collection(
             parent_oddrn=de_group.oddrn,
             rows_number=metadata["row_number"],
         )
-        data_entity.dataset.field_list = map_columns(metadata["data"], oddrn_generator)
+        data_entity.dataset.field_list = map_columns(
+            metadata["profile"], oddrn_generator
+        )
         data_entities.append(data_entity)
 
     de_group.data_entity_group = DataEntityGroup(
@@ -1,12 +1,13 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import pymongo
 from pymongo import MongoClient
+from pymongo.database import Database
 
 from .exceptions import DBException
 from .mongo_repository_base import MongoRepositoryBase
-
-MAX_NUMBER_OF_ITERATION = 10
+from .schema_profile import FieldProfile
 
 
 class MongoRepository(MongoRepositoryBase):
@@ -16,13 +17,21 @@ class MongoRepository(MongoRepositoryBase):
         self.__database = config.database
         self.__user = config.user
         self.__password = config.password
+        self.__sample_size = config.sample_size
+        self.__sample_budget = config.sample_budget
+        self.__sample_max_time_ms = config.sample_max_time_ms
+        self.__workers = config.workers
 
     def retrieve_schemas(self):
         """
         This function is used to collect the schemas of a MongoDB,
         it will go return one schema for each collection. For each
-        collection, the schema returned is dictionary contains the
-        combination of all the types used across the first N document.
+        collection, the schema is a profile of documents randomly
+        sampled by the server with $sample.
+
+        Collections are profiled concurrently, and the number of sampled
+        documents is limited by `sample_budget` per run, which is split
+        between collections.
         """
         try:
             with MongoClient(
@@ -30,55 +39,73 @@ class MongoRepository(MongoRepositoryBase):
             ) as mongo_client:
                 connection = mongo_client[self.__database]
                 collections = connection.list_collection_names()
-                schemas = []
-                for collection_name in collections:
-                    collection = connection[collection_name]
-                    schema = {
-                        "title": collection_name,
-                        "row_number": collection.estimated_document_count(),
-                    }
-                    try:
-                        creation_date = (
-                            collection.find({})
-                            .sort("_id", 1)
-                            .limit(1)
-                            .next()["_id"]
-                            .generation_time
-                        )
-                        modification_date = (
-                            collection.find({})
-                            .sort("_id", -1)
-                            .limit(1)
-                            .next()["_id"]
-                            .generation_time
-                        )
-                    except:
-                        logging.warn(
-                            f"no _id field of ObjectID type in {collection_name} collection"
+                if not collections:
+                    return []
+
+                sample_size = min(
+                    self.__sample_size,
+                    max(1, self.__sample_budget // len(collections)),
+                )
+                with ThreadPoolExecutor(max_workers=self.__workers) as executor:
+                    return list(
+                        executor.map(
+                            lambda name: self.__retrieve_schema(
+                                connection, name, sample_size
+                            ),
+                            collections,
                         )
-                        creation_date = None
-                        modification_date = None
+                    )
+        except pymongo.errors.PyMongoError as mongo_exception:
+            logging.error(f"MongoDB Error: {mongo_exception.args[0]}")
+            raise DBException("Database error")
 
-                    metadata = {
-                        "index.v"
-                        + str(i["v"])
-                        + "."
-                        + i["name"]: str([key for key, _ in i["key"].items()])
-                        for i in collection.list_indexes()
-                    }
+    def __retrieve_schema(
+        self, connection: Database, collection_name: str, sample_size: int
+    ) -> dict:
+        collection = connection[collection_name]
+        schema = {
+            "title": collection_name,
+            "row_number": collection.estimated_document_count(),
+        }
+        try:
+            creation_date = collection.find_one({}, sort=[("_id", 1)])[
+                "_id"
+            ].generation_time
+            modification_date = collection.find_one({}, sort=[("_id", -1)])[
+                "_id"
+            ].generation_time
+        except:
+            logging.warning(
+                f"no _id field of ObjectID type in {collection_name} collection"
+            )
+            creation_date = None
+            modification_date = None
 
-                    results = collection.find({}).limit(MAX_NUMBER_OF_ITERATION)
-                    merged_dict = {}
-                    for i in results:
-                        merged_dict = merged_dict | i
+        metadata = {
+            "index.v"
+            + str(i["v"])
+            + "."
+            + i["name"]: str([key for key, _ in i["key"].items()])
+            for i in collection.list_indexes()
+        }
 
-                    schema["metadata"] = metadata
-                    schema["creation_date"] = creation_date
-                    schema["modification_date"] = modification_date
-                    schema["data"] = merged_dict
+        profile = FieldProfile()
+        try:
+            profile.add_documents(
+                collection.aggregate(
+                    [{"$sample": {"size": sample_size}}],
+                    maxTimeMS=self.__sample_max_time_ms,
+                )
+            )
+        except pymongo.errors.ExecutionTimeout:
+            logging.warning(
+                f"Sampling of {collection_name} collection exceeded "
+                f"{self.__sample_max_time_ms} ms, its schema is built from "
+                f"{profile.documents} documents"
+            )
 
-                    schemas.append(schema)
-                return schemas
-        except pymongo.errors.PyMongoError as mongo_exception:
-            logging.error(f"MongoDB Error: {mongo_exception.args[0]}")
-            raise DBException("Database error")
+        schema["metadata"] = metadata
+        schema["creation_date"] = creation_date
+        schema["modification_date"] = modification_date
+        schema["profile"] = profile
+        return schema
@@ -0,0 +1,71 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional
+
+# elements of an array profiled per document, enough to get their structure
+MAX_ARRAY_ITEMS = 100
+
+INTEGER_TYPES = {"int", "Int64"}
+NUMBER_TYPES = INTEGER_TYPES | {"float", "Decimal128"}
+
+
+@dataclass
+class FieldProfile:
+    """
+    Structure of a field merged from sampled documents.
+
+    Every value seen is counted by its python type, nested documents are profiled
+    into `fields` and array elements into `items`, so the profile of a collection
+    is the root FieldProfile, which sampled documents are added to.
+    """
+
+    count: int = 0  # number of values, null included
+    types: Counter = field(default_factory=Counter)
+    documents: int = 0  # number of values which were documents, i.e. dicts
+    fields: Dict[str, "FieldProfile"] = field(default_factory=dict)
+    items: Optional["FieldProfile"] = None
+
+    def add(self, value: Any) -> None:
+        self.count += 1
+        self.types[type(value).__name__] += 1
+
+        if isinstance(value, dict):
+            self.add_document(value)
+        elif isinstance(value, list):
+            if self.items is None:
+                self.items = FieldProfile()
+            for item in value[:MAX_ARRAY_ITEMS]:
+                self.items.add(item)
+
+    def add_document(self, document: dict) -> None:
+        self.documents += 1
+        for name, value in document.items():
+            if name not in self.fields:
+                self.fields[name] = FieldProfile()
+            self.fields[name].add(value)
+
+    def add_documents(self, documents: Iterable[dict]) -> "FieldProfile":
+        for document in documents:
+            self.add_document(document)
+        return self
+
+    @property
+    def type_name(self) -> str:
+        """Least common type of the values, "mixed" if they have nothing in common."""
+        types = set(self.types) - {"NoneType"}
+        if not types:
+            return "None"
+        if len(types) == 1:
+            return types.pop()
+        if types <= INTEGER_TYPES:
+            return "Int64"
+        if types <= NUMBER_TYPES:
+            return "float"
+        return "mixed"
+
+    def presence(self, parent: "FieldProfile") -> float:
+        """Share of parent's documents having this field."""
+        return self.count / parent.documents if parent.documents else 0
+
+    def is_nullable(self, parent: "FieldProfile") -> bool:
+        return self.count < parent.documents or "NoneType" in self.types
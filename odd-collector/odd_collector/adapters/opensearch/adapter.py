@@ -3,6 +3,7 @@ from urllib.parse import urlparse
 
 from funcy import get_in, get_lax
 from odd_collector.domain.plugin import ElasticsearchPlugin
+from odd_collector.helpers.index_pattern import IndexPatternMatcher
 from odd_collector_sdk.domain.adapter import BaseAdapter
 from odd_models.models import DataEntity, DataEntityList
 from oddrn_generator import ElasticSearchGenerator, Generator
@@ -41,6 +42,7 @@ class Adapter(BaseAdapter):
 
         mappings = self.client.get_mapping()
         data_streams = self.client.get_data_streams()
+        aliases = self.client.get_aliases()
 
         indices = [
             index for index in indices if not index["index"].startswith(".internal")
@@ -66,22 +68,23 @@ class Adapter(BaseAdapter):
                 ),
             )
 
-        # map templates
+        # map templates, linking them to indices which match their patterns
+        # directly or through data streams and aliases
+        indices_by_aliases: dict[str, list[str]] = {}
+        for index_name, index_aliases in aliases.items():
+            for alias in index_aliases.get("aliases", {}):
+                indices_by_aliases.setdefault(alias, []).append(index_name)
+
+        index_matcher = IndexPatternMatcher(
+            indices_entities, data_streams, indices_by_aliases
+        )
         template_entities: dict[str, TemplateEntity] = {}
         for tmpl_name, tmpl in templates_by_names.items():
             data_entity = map_template(tmpl, self.generator)
             pattern = tmpl["index_template"]["index_patterns"]
 
-            # Here we are trying to get all indices that match the pattern
-            # to show that current template works with index
-            # But if we can't get them, we just skip
-            try:
-                for index_name in self.client.get_indices(index=pattern, h="index"):
-                    if index_entity := indices_entities.get(index_name["index"]):
-                        data_entity.add_output(index_entity)
-            except Exception as e:
-                logger.warning(e)
-                continue
+            for index_name in index_matcher.match(pattern):
+                data_entity.add_output(indices_entities[index_name])
 
             template_entities[tmpl_name] = data_entity
 
@@ -33,6 +33,9 @@ class Client:
         response = self._os.indices.get_data_stream(name=name)
         return response["data_streams"]
 
+    def get_aliases(self) -> dict:
+        return self._os.indices.get_alias()
+
     def get_index_template(self, template_name: str) -> list[dict]:
         return self._os.indices.get_index_template(name=template_name).get(
             "index_templates"
@@ -223,3 +223,11 @@ class Schema(HasMetadata):
             self.__dict__,
             {"schema_name"},
         )
+
+
+@dataclass
+class Catalog:
+    schemas: list[Schema]
+    tables: list[Table]
+    fk_constraints: list[ForeignKeyConstraint]
+    unique_constraints: list[UniqueConstraint]
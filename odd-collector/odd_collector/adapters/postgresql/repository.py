@@ -1,10 +1,11 @@
 from dataclasses import asdict, dataclass
 from operator import attrgetter
-from typing import Union
+from typing import Optional, Union
 
 import psycopg2
 from funcy.seqs import group_by
 from odd_collector.adapters.postgresql.models import (
+    Catalog,
     Column,
     EnumTypeLabel,
     ForeignKeyConstraint,
@@ -16,6 +17,7 @@ from odd_collector.adapters.postgresql.models import (
 from odd_collector.domain.plugin import PostgreSQLPlugin
 from odd_collector_sdk.domain.filter import Filter
 from psycopg2 import sql
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
 
 
 @dataclass(frozen=True)
@@ -38,18 +40,53 @@ class ConnectionParams:
 
 
 class PostgreSQLRepository:
+    """Reads PostgreSQL catalog.
+
+    Schemas are resolved once per connection, other queries are filtered by their OIDs.
+    """
+
     def __init__(self, conn_params: ConnectionParams, schemas_filter: Filter):
         self.conn_params = conn_params
         self.schemas_filter = schemas_filter
+        self._schemas: Optional[list[Schema]] = None
 
     def __enter__(self):
         self.conn = psycopg2.connect(**asdict(self.conn_params))
+        self._schemas = None
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.conn.close()
 
+    def get_catalog(self) -> Catalog:
+        """Fetches a consistent snapshot of the catalog.
+
+        All queries run in one read only repeatable read transaction, so objects
+        created or dropped meanwhile don't break references between them.
+        """
+        self.conn.set_session(
+            isolation_level=ISOLATION_LEVEL_REPEATABLE_READ, readonly=True
+        )
+        try:
+            return Catalog(
+                schemas=self.get_schemas(),
+                tables=self.get_tables(),
+                fk_constraints=self.get_foreign_key_constraints(),
+                unique_constraints=self.get_unique_constraints(),
+            )
+        finally:
+            self.conn.rollback()
+
     def get_schemas(self) -> list[Schema]:
+        if self._schemas is None:
+            self._schemas = self._fetch_schemas()
+        return self._schemas
+
+    @property
+    def _query_params(self) -> dict:
+        return {"schema_oids": [schema.oid for schema in self.get_schemas()]}
+
+    def _fetch_schemas(self) -> list[Schema]:
         with self.conn.cursor() as cur:
             schemas = [
                 Schema(*raw)
@@ -66,16 +103,12 @@ class PostgreSQLRepository:
             ]
         return schemas
 
-    @property
-    def get_filtered_schema_names_str(self):
-        schemas = [schema.schema_name for schema in self.get_schemas()]
-        return ", ".join([f"'{schema}'" for schema in schemas])
-
     def get_tables(self) -> list[Table]:
-        query = self.tables_query(self.get_filtered_schema_names_str)
-
         with self.conn.cursor() as cur:
-            tables = [Table(*raw) for raw in self.execute(query, cur)]
+            tables = [
+                Table(*raw)
+                for raw in self.execute(self.tables_query(), cur, self._query_params)
+            ]
             grouped_columns = group_by(attrgetter("attrelid"), self.get_columns())
 
             for table in tables:
@@ -92,9 +125,7 @@ class PostgreSQLRepository:
             grouped_enums = group_by(attrgetter("type_oid"), enums)
             grouped_pks = group_by(attrgetter("attrelid", "column_name"), primary_keys)
 
-            raw_data = self.execute(
-                self.columns_query(self.get_filtered_schema_names_str), cur
-            )
+            raw_data = self.execute(self.columns_query(), cur, self._query_params)
             columns = [Column(*raw) for raw in raw_data]
 
             for column in columns:
@@ -107,16 +138,12 @@ class PostgreSQLRepository:
 
     def get_enums(self):
         with self.conn.cursor() as cur:
-            raw_data = self.execute(
-                self.enums_query(self.get_filtered_schema_names_str), cur
-            )
+            raw_data = self.execute(self.enums_query(), cur, self._query_params)
             return [EnumTypeLabel(*raw) for raw in raw_data]
 
     def get_primary_keys(self):
         with self.conn.cursor() as cur:
-            raw_data = self.execute(
-                self.pks_query(self.get_filtered_schema_names_str), cur
-            )
+            raw_data = self.execute(self.pks_query(), cur, self._query_params)
             return [PrimaryKey(*raw) for raw in raw_data]
 
     def get_foreign_key_constraints(self):
@@ -139,10 +166,7 @@ class PostgreSQLRepository:
                     tuple(rfka),
                 )
                 for oid, cn, nsp_oid, nsp, tn, tc, rnsp_oid, rnsp, rtn, rtc, fk, fka, rfk, rfka in self.execute(
-                    self.foreign_key_constraints_query(
-                        self.get_filtered_schema_names_str
-                    ),
-                    cur,
+                    self.foreign_key_constraints_query(), cur, self._query_params
                 )
             ]
             return [ForeignKeyConstraint(*fkc) for fkc in fk_constraints]
@@ -150,13 +174,13 @@ class PostgreSQLRepository:
     def get_unique_constraints(self):
         with self.conn.cursor() as cur:
             raw_data = self.execute(
-                self.unique_constraints_query(self.get_filtered_schema_names_str), cur
+                self.unique_constraints_query(), cur, self._query_params
             )
             return [UniqueConstraint(*raw) for raw in raw_data]
 
     @staticmethod
-    def pks_query(schemas: str):
-        return f"""
+    def pks_query():
+        return """
             select c.relname, a.attname, a.attrelid
             from pg_index i
                 join pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
@@ -166,7 +190,7 @@ class PostgreSQLRepository:
                 and c.relkind in ('r', 'v', 'm', 'p')
                 and c.relispartition = false -- exclude partiotions
                 and a.attnum > 0
-                and n.nspname in ({schemas}) 
+                and n.oid = any(%(schema_oids)s)
         """
 
     @property
@@ -184,8 +208,8 @@ class PostgreSQLRepository:
         """
 
     @staticmethod
-    def tables_query(schemas: str):
-        return f"""
+    def tables_query():
+        return """
             select
                 c.oid
                 , it.table_catalog
@@ -216,14 +240,13 @@ class PostgreSQLRepository:
                     left join information_schema.views iw on iw.table_schema = n.nspname and iw.table_name = c.relname
             where c.relkind in ('r', 'v', 'm', 'p')
                 and c.relispartition = false -- exclude partiotions
-                and n.nspname not like 'pg_temp_%'
-                and n.nspname in ({schemas}) 
+                and n.oid = any(%(schema_oids)s)
             order by n.nspname, c.relname
         """
 
     @staticmethod
-    def columns_query(schemas: str):
-        return f"""
+    def columns_query():
+        return """
             select
                 a.attrelid
                 , ic.table_catalog
@@ -282,14 +305,14 @@ class PostgreSQLRepository:
             where c.relkind in ('r', 'v', 'm', 'p')
                 and c.relispartition = false -- exclude partiotions
                 and a.attnum > 0
-                and n.nspname in ({schemas}) 
+                and n.oid = any(%(schema_oids)s)
                 and a.attisdropped is false
             order by n.nspname, c.relname, a.attnum
         """
 
     @staticmethod
-    def enums_query(schemas: str):
-        return f"""
+    def enums_query():
+        return """
             select
                 pe.enumtypid as type_oid
                 , pt.typname as type_name
@@ -297,13 +320,13 @@ class PostgreSQLRepository:
             from pg_enum pe
             join pg_type pt on pt.oid = pe.enumtypid
             join pg_catalog.pg_namespace n on n.oid = pt.typnamespace
-            where n.nspname in ({schemas})
+            where n.oid = any(%(schema_oids)s)
             order by pe.enumsortorder
         """
 
     @staticmethod
-    def foreign_key_constraints_query(schemas: str) -> str:
-        return f"""
+    def foreign_key_constraints_query() -> str:
+        return """
             SELECT
                 subq.oid
                 , conname AS constraint_name
@@ -352,14 +375,14 @@ class PostgreSQLRepository:
                     ON ta.attrelid = conrelid AND ta.attnum = unnested_conkey
                 JOIN pg_catalog.pg_attribute AS rta -- referenced table attribute
                     ON rta.attrelid = confrelid AND rta.attnum = unnested_confkey
-            WHERE ns.nspname IN ({schemas}) AND rns.nspname in ({schemas})
+            WHERE ns.oid = ANY(%(schema_oids)s) AND rns.oid = ANY(%(schema_oids)s)
             GROUP BY
                 subq.oid, conname, conrelid, confrelid, ns.oid, ns.nspname, c.relname, rc.relnamespace, rns.nspname, rc.relname;
         """
 
     @staticmethod
-    def unique_constraints_query(schemas: str):
-        return f"""
+    def unique_constraints_query():
+        return """
             SELECT
                 con.oid AS oid
                 , con.conname AS constraint_name
@@ -375,12 +398,14 @@ class PostgreSQLRepository:
                 JOIN pg_catalog.pg_namespace AS ns
                     ON ns.oid = con.connamespace
             WHERE
-                con.contype = 'u' AND ns.nspname IN ({schemas})
+                con.contype = 'u' AND ns.oid = ANY(%(schema_oids)s)
             GROUP BY
                 con.oid, con.conname, con.conrelid, c.relname, ns.nspname;
         """
 
     @staticmethod
-    def execute(query: Union[str, sql.Composed], cursor) -> list[tuple]:
-        cursor.execute(query)
+    def execute(
+        query: Union[str, sql.Composed], cursor, params: Optional[dict] = None
+    ) -> list[tuple]:
+        cursor.execute(query, params)
         return cursor.fetchall()
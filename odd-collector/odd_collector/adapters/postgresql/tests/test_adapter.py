@@ -0,0 +1,59 @@
+from dataclasses import replace
+
+from odd_collector.adapters.postgresql import adapter as postgresql_adapter
+from odd_collector.adapters.postgresql.adapter import Adapter
+from odd_collector.adapters.postgresql.models import Catalog, Schema
+from odd_collector.domain.plugin import PostgreSQLPlugin
+from odd_models import DataEntityType
+
+
+def test_get_data_entities_maps_catalog_once(monkeypatch, table, view):
+    view = replace(
+        view,
+        table_name="test_view",
+        view_definition="SELECT * FROM test.test JOIN test.test AS t2 ON true;",
+    )
+    catalog = Catalog(
+        schemas=[
+            Schema(
+                schema_name="test",
+                schema_owner="postgres",
+                oid=1,
+                description=None,
+                total_size_bytes=0,
+            )
+        ],
+        tables=[table, view],
+        fk_constraints=[],
+        unique_constraints=[],
+    )
+    config = PostgreSQLPlugin(
+        type="postgresql",
+        name="pg",
+        host="localhost",
+        database="test",
+        user="postgres",
+    )
+    adapter = Adapter(config)
+
+    map_tables_calls = []
+    map_tables = postgresql_adapter.map_tables
+
+    def counted_map_tables(*args, **kwargs):
+        map_tables_calls.append(args)
+        return map_tables(*args, **kwargs)
+
+    monkeypatch.setattr(adapter, "_get_catalog", lambda: catalog)
+    monkeypatch.setattr(postgresql_adapter, "map_tables", counted_map_tables)
+
+    entities = list(adapter.get_data_entities())
+
+    assert len(map_tables_calls) == 1
+    table_entity, view_entity, schema_entity, database_entity = entities
+    assert view_entity.type == DataEntityType.VIEW
+    assert view_entity.data_transformer.inputs == [table_entity.oddrn]
+    assert schema_entity.data_entity_group.entities_list == [
+        table_entity.oddrn,
+        view_entity.oddrn,
+    ]
+    assert database_entity.data_entity_group.entities_list == [schema_entity.oddrn]
@@ -0,0 +1,65 @@
+from odd_collector.adapters.postgresql.repository import (
+    ConnectionParams,
+    PostgreSQLRepository,
+)
+from odd_collector_sdk.domain.filter import Filter
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query, params=None):
+        self.conn.executed.append((query, params))
+        self._is_schemas = "from pg_catalog.pg_namespace n\n" in query
+
+    def fetchall(self):
+        if self._is_schemas:
+            return [
+                ("public", "postgres", 42, None, 0),
+                ("hidden", "postgres", 43, None, 0),
+            ]
+        return []
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.session = None
+        self.rolled_back = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def set_session(self, **kwargs):
+        self.session = kwargs
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def test_get_catalog_resolves_schemas_once():
+    repo = PostgreSQLRepository(
+        ConnectionParams(host="", port=5432, dbname="", user="", password=""),
+        Filter(include=["public"]),
+    )
+    repo.conn = FakeConnection()
+
+    catalog = repo.get_catalog()
+
+    assert [schema.schema_name for schema in catalog.schemas] == ["public"]
+    # schemas, tables, enums, primary keys, columns, foreign and unique constraints
+    assert len(repo.conn.executed) == 7
+    assert all(params == {"schema_oids": [42]} for _, params in repo.conn.executed[1:])
+    assert repo.conn.session == {
+        "isolation_level": ISOLATION_LEVEL_REPEATABLE_READ,
+        "readonly": True,
+    }
+    assert repo.conn.rolled_back
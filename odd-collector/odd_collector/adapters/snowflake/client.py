@@ -2,9 +2,8 @@ import re
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from functools import cached_property
-from typing import Any, Callable, Union
+from typing import Any, Union
 
-from funcy import lsplit
 from odd_collector.domain.plugin import SnowflakePlugin
 from odd_collector.helpers import LowerKeyDict
 from odd_collector_sdk.errors import DataSourceError
@@ -22,6 +21,9 @@ from .domain import (
 )
 from .logger import logger
 
+# tables, columns and keys are joined by (catalog, schema, table)
+TableKey = tuple[str, str, str]
+
 SCHEMAS_QUERY = """
     SELECT 
         CATALOG_NAME, 
@@ -316,8 +318,8 @@ class SnowflakeClient(SnowflakeClientBase):
         query = COLUMNS_QUERY % self.filtered_schema_names
         return self._base_fetch_entity_list(query, cursor, Column)
 
-    def _fetch_primary_keys(self, cursor: DictCursor) -> dict[str, list]:
-        res = defaultdict(list)
+    def _fetch_primary_keys(self, cursor: DictCursor) -> dict[TableKey, set[str]]:
+        res = defaultdict(set)
 
         raw_query = PRIMARY_KEYS_QUERIES["raw"]
         transformed_query = (
@@ -327,12 +329,13 @@ class SnowflakeClient(SnowflakeClientBase):
             cursor.execute(query)
 
         for pk in cursor.fetchall():
-            res[pk["table_name"]].append(pk["column_name"])
+            key = (pk["database_name"], pk["schema_name"], pk["table_name"])
+            res[key].add(pk["column_name"])
         return res
 
     @staticmethod
-    def _get_clustering_keys(tables: list[Table]) -> dict[str, list]:
-        res: dict[str, list] = {}
+    def _get_clustering_keys(tables: list[Table]) -> dict[TableKey, set[str]]:
+        res: dict[TableKey, set[str]] = {}
 
         # Snowflake clustering keys could look like: "LINEAR(to_date(post_timestamp))", "LINEAR(column2, column3)"
         # cl_keys matches any parentheses and everything inside them that do not contain any parentheses.
@@ -342,42 +345,46 @@ class SnowflakeClient(SnowflakeClientBase):
             if table.clustering_key:
                 matches = re.search(regex, table.clustering_key)
                 if matches:
-                    res[table.table_name] = matches.group("cl_keys").split(", ")
+                    key = (table.table_catalog, table.table_schema, table.table_name)
+                    res[key] = {
+                        cl_key.strip().lower()
+                        for cl_key in matches.group("cl_keys").split(",")
+                    }
         return res
 
-    def get_tables(self) -> list[Union[Table, View]]:
-        logger.info("Getting tables and views from Snowflake")
+    @staticmethod
+    def _attach_columns(
+        tables: list[Table],
+        columns: list[Column],
+        primary_keys: dict[TableKey, set[str]],
+        clustering_keys: dict[TableKey, set[str]],
+    ) -> None:
+        """Attaches columns to their tables in one pass over each list."""
+        columns_by_table: dict[TableKey, list[Column]] = defaultdict(list)
+        for column in columns:
+            key = (column.table_catalog, column.table_schema, column.table_name)
+            if column.column_name in primary_keys.get(key, ()):
+                column.is_primary_key = True
+            if column.column_name.lower() in clustering_keys.get(key, ()):
+                column.is_clustering_key = True
+            columns_by_table[key].append(column)
 
-        def is_belongs(table: Table) -> Callable[[Column], bool]:
-            def _(column: Column) -> bool:
-                return (
-                    table.table_catalog == column.table_catalog
-                    and table.table_schema == column.table_schema
-                    and table.table_name == column.table_name
-                )
+        for table in tables:
+            key = (table.table_catalog, table.table_schema, table.table_name)
+            table.columns.extend(columns_by_table.get(key, []))
 
-            return _
+    def get_tables(self) -> list[Union[Table, View]]:
+        logger.info("Getting tables and views from Snowflake")
 
         with DictCursor(self._conn) as cursor:
             tables: list[Table] = self._fetch_tables(cursor)
             columns: list[Column] = self._fetch_columns(cursor)
-            primary_keys: dict[str, list] = self._fetch_primary_keys(cursor)
-            clustering_keys: dict[str, list] = self._get_clustering_keys(tables)
-
-            for column in columns:
-                if column.column_name in primary_keys.get(column.table_name, []):
-                    column.is_primary_key = True
-                if column.column_name.lower() in clustering_keys.get(
-                    column.table_name, []
-                ):
-                    column.is_clustering_key = True
-
-            for table in tables:
-                belongs, not_belongs = lsplit(is_belongs(table), columns)
-                table.columns.extend(belongs)
-                columns = not_belongs
-
-            return tables
+            primary_keys = self._fetch_primary_keys(cursor)
+
+        self._attach_columns(
+            tables, columns, primary_keys, self._get_clustering_keys(tables)
+        )
+        return tables
 
     def get_raw_pipes(self) -> list[RawPipe]:
         logger.info("Getting pipes from Snowflake")
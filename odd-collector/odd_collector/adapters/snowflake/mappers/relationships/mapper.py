@@ -1,6 +1,5 @@
 from odd_collector.adapters.snowflake.domain import (
     ForeignKeyConstraint,
-    Table,
     UniqueConstraint,
 )
 from odd_collector.adapters.snowflake.logger import logger
@@ -19,11 +18,15 @@ class DataEntityRelationshipsMapper:
         self,
         oddrn_generator: SnowflakeGenerator,
         unique_constraints: list[UniqueConstraint],
-        table_entities_pair: list[tuple[Table, DataEntity]],
+        datasets: dict[str, DataEntity],
     ):
+        """
+        :param datasets: table entities by "<schema>.<table>", at least the ones
+            referenced by mapped foreign key constraints
+        """
         self.oddrn_generator = oddrn_generator
         self.unique_constraints = group_uniques_constraints_by_table(unique_constraints)
-        self.datasets = self._map_datasets_by_full_name(table_entities_pair)
+        self.datasets = datasets
 
     def map(self, data: list[ForeignKeyConstraint]) -> list[DataEntity]:
         return [self._map_data_entity_relationship(fkc) for fkc in data]
@@ -55,15 +58,6 @@ class DataEntityRelationshipsMapper:
             unique_constraints=self._get_unique_constraints(schema_name, table_name),
         ).build_data_entity()
 
-    @staticmethod
-    def _map_datasets_by_full_name(
-        table_entities_pair: list[tuple[Table, DataEntity]]
-    ) -> dict[str, DataEntity]:
-        return {
-            f"{te_pair[0].table_schema}.{te_pair[0].table_name}": te_pair[1]
-            for te_pair in table_entities_pair
-        }
-
     def _get_dataset(self, schema_name: str, table_name: str) -> DataEntity:
         return self.datasets[f"{schema_name}.{table_name}"]
 
@@ -77,6 +77,10 @@ class RedshiftPlugin(DatabasePlugin):
 class MongoDBPlugin(DatabasePlugin):
     type: Literal["mongodb"]
     protocol: str
+    sample_size: int = 1000  # documents sampled from a collection to get its schema
+    sample_budget: int = 100_000  # documents sampled per run, split between collections
+    sample_max_time_ms: int = 30_000  # time limit of sampling one collection
+    workers: int = 4  # collections profiled concurrently
 
 
 class KafkaPlugin(BasePlugin):
@@ -84,7 +88,15 @@ class KafkaPlugin(BasePlugin):
     host: str
     port: int
     schema_registry_conf: Optional[dict] = {}
+    schema_registry_workers: int = 8  # concurrent requests to schema registry
     broker_conf: dict
+    # infer schemas of topics without schema registry subject from their last messages
+    sample_non_registry_topics: bool = False
+    sample_messages_per_partition: int = 10
+    # the rest keep schemas sampled on previous runs
+    sample_max_topics_per_run: int = 100
+    sample_workers: int = 4
+    sample_timeout_seconds: float = 5.0  # per topic
 
 
 class SnowflakePlugin(BasePlugin):
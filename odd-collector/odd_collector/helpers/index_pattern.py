@@ -0,0 +1,82 @@
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Iterable, Mapping, Optional, Pattern, Union
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern: str) -> Pattern:
+    # index templates support only "*" wildcard, everything else is a literal
+    return re.compile(".*".join(map(re.escape, pattern.split("*"))), re.DOTALL)
+
+
+def _match_sorted(names: list[str], pattern: str) -> Iterable[str]:
+    prefix = pattern[: pattern.index("*")]
+    regex = _compile(pattern)
+
+    for i in range(bisect_left(names, prefix), len(names)):
+        name = names[i]
+        if not name.startswith(prefix):
+            break
+        if name.startswith(".") and not pattern.startswith("."):
+            continue
+        if regex.fullmatch(name):
+            yield name
+
+
+class IndexPatternMatcher:
+    """
+    Matches index patterns of Elasticsearch/OpenSearch index templates against
+    already fetched index names, instead of asking the cluster for every template.
+
+    Names are kept sorted, so a pattern is checked only against indices starting
+    with its literal prefix. As in Elasticsearch, wildcards don't match names
+    starting with "." unless the pattern starts with "." too.
+
+    Patterns are resolved against data stream and alias names as well, which are
+    expanded to their indices, so templates of data streams are matched with
+    hidden `.ds-*` backing indices like the cluster itself does.
+    """
+
+    def __init__(
+        self,
+        index_names: Iterable[str],
+        data_streams: Iterable[dict] = (),
+        aliases: Optional[Mapping[str, Iterable[str]]] = None,
+    ) -> None:
+        self._names = sorted(set(index_names))
+        self._names_set = set(self._names)
+
+        # data stream or alias name -> names of indices behind it
+        self._targets: dict[str, list[str]] = {}
+        for stream in data_streams:
+            self._targets[stream["name"]] = [
+                index["index_name"] for index in stream.get("indices", [])
+            ]
+        for alias, indices in (aliases or {}).items():
+            self._targets.setdefault(alias, []).extend(indices)
+        self._target_names = sorted(self._targets)
+
+    def match(self, patterns: Union[str, Iterable[str]]) -> list[str]:
+        if isinstance(patterns, str):
+            patterns = patterns.split(",")
+
+        result = {}
+        for pattern in patterns:
+            for name in self._match_one(pattern.strip()):
+                result[name] = None
+        return list(result)
+
+    def _match_one(self, pattern: str) -> Iterable[str]:
+        if "*" in pattern:
+            names = list(_match_sorted(self._names, pattern))
+            targets = _match_sorted(self._target_names, pattern)
+        else:
+            names = [pattern] if pattern in self._names_set else []
+            targets = [pattern] if pattern in self._targets else []
+
+        for target in targets:
+            names.extend(
+                name for name in self._targets[target] if name in self._names_set
+            )
+        return names
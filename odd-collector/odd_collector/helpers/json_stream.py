@@ -0,0 +1,106 @@
+import json
+import re
+from typing import Any, Collection, Iterator, Optional, TextIO
+
+WHITESPACE = re.compile(r"\s*")
+NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class JsonStream:
+    """
+    Incremental reader of a JSON document from a text stream.
+
+    Document is read in chunks, and only values asked for are decoded, so objects
+    can be iterated member by member without the whole document being in memory.
+    Value of each member must be consumed, by `value` or `members`, before the next
+    member is read.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = 1 << 20) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read(self) -> bool:
+        if self._eof:
+            return False
+
+        # chunks grow with the buffer, so a large value is decoded a few times only
+        chunk = self._stream.read(max(self._chunk_size, len(self._buffer)))
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next character, whitespaces are skipped."""
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                raise ValueError("Unexpected end of JSON document")
+
+    def _expect(self, char: str) -> None:
+        if (actual := self.peek()) != char:
+            raise ValueError(f"Expected {char!r} in JSON document, got {actual!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # a number near the end of the buffer may continue in the next chunk,
+                # "1." or "1e" of a split float is decoded as 1
+                if self._eof or (
+                    end < len(self._buffer) and self._buffer[end] not in NUMBER_CHARS
+                ):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._read()
+
+    def members(self) -> Iterator[str]:
+        """Iterate keys of the next object, value of each key must be consumed."""
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("}")
+            return
+
+
+def iter_sections(
+    stream: TextIO, sections: Collection[str]
+) -> Iterator[tuple[str, Optional[str], Any]]:
+    """
+    Iterate top-level members of a JSON object, objects of `sections` are iterated
+    member by member.
+    @return: iterator of (section, key, value), key is None for not iterated sections
+    """
+    reader = JsonStream(stream)
+    for section in reader.members():
+        if section in sections and reader.peek() == "{":
+            for key in reader.members():
+                yield section, key, reader.value()
+        else:
+            yield section, None, reader.value()
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from odd_collector.adapters.dbt import adapter as dbt_adapter
+from odd_collector.domain.plugin import DbtPlugin
+
+
+def write_artifacts(path, generated_at: str, invocation_id: str = "1"):
+    metadata = {"generated_at": generated_at, "invocation_id": invocation_id}
+    (path / "catalog.json").write_text(
+        json.dumps({"metadata": metadata, "nodes": {"model.a": {}, "model.b": {}}})
+    )
+    (path / "manifest.json").write_text(
+        json.dumps({"metadata": metadata, "nodes": {}, "parent_map": {}})
+    )
+
+
+@pytest.fixture
+def mapped(monkeypatch):
+    """Names of catalog nodes mapped by each call of map_tables."""
+    calls = []
+
+    def map_tables(generator, tables, manifest):
+        calls.append([key for key, _ in tables])
+        return [f"entity of {key}" for key in calls[-1]]
+
+    monkeypatch.setattr(dbt_adapter, "map_tables", map_tables)
+    return calls
+
+
+def create_adapter(path) -> dbt_adapter.Adapter:
+    config = DbtPlugin(
+        type="dbt", name="dbt", host="localhost", odd_catalog_url=f"{path}/"
+    )
+    return dbt_adapter.Adapter(config)
+
+
+def test_datasets_are_reused_while_artifacts_are_unchanged(tmp_path, mapped):
+    write_artifacts(tmp_path, "2023-01-01T00:00:00Z")
+    adapter = create_adapter(tmp_path)
+
+    datasets = adapter.get_datasets()
+    assert datasets == ["entity of model.a", "entity of model.b"]
+    assert adapter.get_datasets() is datasets
+    assert len(mapped) == 1
+
+
+@pytest.mark.parametrize(
+    "generated_at, invocation_id",
+    [("2023-01-02T00:00:00Z", "1"), ("2023-01-01T00:00:00Z", "2")],
+)
+def test_changed_artifacts_are_mapped_again(
+    tmp_path, mapped, generated_at, invocation_id
+):
+    write_artifacts(tmp_path, "2023-01-01T00:00:00Z")
+    adapter = create_adapter(tmp_path)
+    datasets = adapter.get_datasets()
+
+    write_artifacts(tmp_path, generated_at, invocation_id)
+    assert adapter.get_datasets() is not datasets
+    assert len(mapped) == 2
@@ -0,0 +1,60 @@
+import gzip
+import json
+
+from odd_collector.adapters.dbt.artifacts import (
+    Manifest,
+    iter_catalog_nodes,
+    open_artifact,
+    read_version,
+)
+
+MANIFEST = {
+    "metadata": {"generated_at": "2023-01-01T00:00:00Z", "invocation_id": "1"},
+    "nodes": {
+        "model.project.orders": {
+            "database": "db",
+            "schema": "public",
+            "name": "orders",
+            "path": "orders.sql",
+            "root_path": "/project",
+            "compiled_sql": "select 1",
+            "raw_sql": "select 1",
+            "config": {"materialized": "view"},
+        }
+    },
+    "macros": {"macro.a": {"name": "a"}},
+    "parent_map": {"model.project.orders": ["seed.project.raw"]},
+    "child_map": {"model.project.orders": []},
+}
+
+
+def test_manifest_is_reduced_to_used_fields(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(MANIFEST))
+
+    with open_artifact(str(path)) as stream:
+        manifest = Manifest.read(stream)
+
+    assert manifest.nodes == {
+        "model.project.orders": {
+            "database": "db",
+            "schema": "public",
+            "name": "orders",
+            "root_path": "/project",
+            "path": "orders.sql",
+            "compiled_sql": "select 1",
+        }
+    }
+    assert manifest.parent_map == MANIFEST["parent_map"]
+    assert manifest.child_map == MANIFEST["child_map"]
+
+
+def test_gzip_artifact_is_read_by_url(tmp_path):
+    catalog = {"metadata": {"generated_at": "2023"}, "nodes": {"model.a": {}}}
+    path = tmp_path / "catalog.json"
+    path.write_bytes(gzip.compress(json.dumps(catalog).encode()))
+
+    with open_artifact(path.as_uri()) as stream:
+        assert read_version(stream) == ("2023", None)
+    with open_artifact(path.as_uri()) as stream:
+        assert list(iter_catalog_nodes(stream)) == [("model.a", {})]
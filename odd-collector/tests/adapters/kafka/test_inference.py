@@ -0,0 +1,51 @@
+import json
+
+from odd_collector.adapters.kafka.mappers.inference import (
+    infer_payload_schema,
+    merge_all,
+)
+from odd_collector.adapters.kafka.mappers.parser import create_mapper
+from odd_models.models import Type
+from oddrn_generator import KafkaGenerator
+
+MESSAGES = [
+    {"id": 1, "name": "a", "tags": [], "address": {"city": "x"}},
+    {"id": 2.5, "name": None, "tags": ["t"], "address": {"city": "y", "zip": 1}},
+    {"id": 3, "tags": ["t", 1], "address": "unknown"},
+]
+
+
+def test_infer_schema_merges_samples():
+    schema = merge_all(infer_payload_schema(json.dumps(m).encode()) for m in MESSAGES)
+
+    assert schema["required"] == ["id", "address"]
+    assert schema["properties"]["id"] == {"type": "number"}
+    assert schema["properties"]["name"] == {"type": "string"}
+    assert schema["properties"]["tags"] == {
+        "type": "array",
+        "items": [{"type": "string"}, {"type": "integer"}],
+    }
+    address_object, address_string = schema["properties"]["address"]
+    assert address_object["required"] == ["city"]
+    assert address_string == {"type": "string"}
+
+
+def test_not_json_objects_are_skipped():
+    assert infer_payload_schema(b"not a json") is None
+    assert infer_payload_schema(b"[1, 2]") is None
+    assert infer_payload_schema(None) is None
+
+
+def test_inferred_schema_is_mapped_by_json_parser():
+    schema = merge_all(infer_payload_schema(json.dumps(m).encode()) for m in MESSAGES)
+
+    generator = KafkaGenerator(host_settings="localhost:9092")
+    generator.set_oddrn_paths(topics="orders")
+    fields = create_mapper(generator, "JSON").map_schema(schema, [])
+
+    by_name = {field.name: field for field in fields}
+    assert by_name["id"].type.type == Type.TYPE_NUMBER
+    assert by_name["id"].type.is_nullable is False
+    assert by_name["name"].type.is_nullable is True
+    assert by_name["tags"].type.type == Type.TYPE_LIST
+    assert by_name["address"].type.type == Type.TYPE_UNION
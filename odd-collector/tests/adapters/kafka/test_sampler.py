@@ -0,0 +1,131 @@
+import json
+
+import pytest
+from confluent_kafka import KafkaError
+from odd_collector.adapters.kafka import sampler
+from odd_collector.adapters.kafka.sampler import TopicSampler
+
+
+class FakeError:
+    def code(self):
+        return KafkaError._PARTITION_EOF
+
+
+class FakeMessage:
+    def __init__(self, partition: int, offset: int, value: bytes = None):
+        self._partition, self._offset, self._value = partition, offset, value
+
+    def error(self):
+        return FakeError() if self._value is None else None
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+    def value(self):
+        return self._value
+
+
+class FakeConsumer:
+    """Consumer of in-memory topics given as {topic: {partition: [payload, ...]}}"""
+
+    topics: dict = {}
+    polled: list = []
+
+    def __init__(self, conf: dict):
+        self._queue = []
+
+    def get_watermark_offsets(self, partition, timeout=None):
+        return 0, len(self.topics[partition.topic][partition.partition])
+
+    def assign(self, partitions):
+        for tp in partitions:
+            messages = self.topics[tp.topic][tp.partition]
+            for offset in range(tp.offset, len(messages)):
+                self._queue.append(FakeMessage(tp.partition, offset, messages[offset]))
+            self._queue.append(FakeMessage(tp.partition, len(messages)))
+
+    def poll(self, timeout=None):
+        if not self._queue:
+            return None
+        message = self._queue.pop(0)
+        if message.value() is not None:
+            self.polled.append(json.loads(message.value()))
+        return message
+
+    def close(self):
+        pass
+
+
+def payloads(*messages: dict) -> list:
+    return [json.dumps(message).encode() for message in messages]
+
+
+@pytest.fixture
+def consumer(monkeypatch):
+    FakeConsumer.topics = {}
+    FakeConsumer.polled = []
+    monkeypatch.setattr(sampler, "Consumer", FakeConsumer)
+    return FakeConsumer
+
+
+def create_sampler(max_topics: int = 10) -> TopicSampler:
+    return TopicSampler(
+        {}, messages_per_partition=2, max_topics=max_topics, workers=2, timeout=1.0
+    )
+
+
+def test_sampler_reads_last_messages_of_partitions(consumer):
+    consumer.topics = {
+        "users": {
+            0: payloads({"id": "old"}, {"id": 1}, {"id": 2, "name": "a"}),
+            1: payloads({"id": 3}),
+        }
+    }
+
+    schemas = create_sampler().get_schemas({"users": [0, 1]})
+
+    assert sorted(m["id"] for m in consumer.polled) == [1, 2, 3]
+    assert schemas["users"]["required"] == ["id"]
+    assert set(schemas["users"]["properties"]) == {"id", "name"}
+
+
+def test_unchanged_topics_are_not_sampled_again(consumer):
+    consumer.topics = {"users": {0: payloads({"id": 1})}}
+    topic_sampler = create_sampler()
+
+    first = topic_sampler.get_schemas({"users": [0]})
+    consumer.polled.clear()
+    assert topic_sampler.get_schemas({"users": [0]}) == first
+    assert consumer.polled == []
+
+    # new messages change high watermarks, so the topic is sampled again
+    consumer.topics["users"][0] += payloads({"id": 2, "email": "e"})
+    schemas = topic_sampler.get_schemas({"users": [0]})
+    assert consumer.polled == [{"id": 1}, {"id": 2, "email": "e"}]
+    assert set(schemas["users"]["properties"]) == {"id", "email"}
+
+
+def test_topics_checked_per_run_are_limited(consumer):
+    consumer.topics = {
+        name: {0: payloads({"id": index})} for index, name in enumerate("abc")
+    }
+    topic_sampler = create_sampler(max_topics=2)
+
+    assert len(topic_sampler.get_schemas({name: [0] for name in "abc"})) == 2
+    assert len(consumer.polled) == 2
+
+    # the topic which wasn't checked goes first, the others keep their schemas
+    consumer.polled.clear()
+    assert set(topic_sampler.get_schemas({name: [0] for name in "abc"})) == set("abc")
+    assert len(consumer.polled) == 1
+
+
+def test_removed_topics_are_dropped_from_cache(consumer):
+    consumer.topics = {"a": {0: payloads({"id": 1})}, "b": {0: payloads({"id": 2})}}
+    topic_sampler = create_sampler()
+
+    assert set(topic_sampler.get_schemas({"a": [0], "b": [0]})) == {"a", "b"}
+    assert set(topic_sampler.get_schemas({"a": [0]})) == {"a"}
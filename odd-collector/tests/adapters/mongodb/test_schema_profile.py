@@ -0,0 +1,54 @@
+from bson import Int64, ObjectId
+from odd_collector.adapters.mongodb.mappers.columns import map_columns
+from odd_collector.adapters.mongodb.mappers.schemas import SCHEMA_FILE_URL
+from odd_collector.adapters.mongodb.schema_profile import FieldProfile
+from odd_models.models import Type
+from oddrn_generator import MongoGenerator
+
+DOCUMENTS = [
+    {"_id": ObjectId(), "count": 1, "address": {"city": "x"}, "tags": ["a"]},
+    {"_id": ObjectId(), "count": Int64(2), "address": {"city": "y", "zip": 1}},
+    {"_id": ObjectId(), "count": 2.5, "address": None, "tags": [{"k": 1}, "b"]},
+    {"_id": ObjectId(), "count": 3, "address": {"city": None}, "tags": []},
+]
+
+
+def test_profile_merges_nested_documents():
+    profile = FieldProfile().add_documents(DOCUMENTS)
+
+    assert profile.documents == 4
+    count, address = profile.fields["count"], profile.fields["address"]
+    assert count.type_name == "float"
+    assert not count.is_nullable(profile)
+    assert address.type_name == "dict"
+    assert address.is_nullable(profile)
+    assert address.fields["city"].presence(address) == 1
+    assert address.fields["zip"].presence(address) == 1 / 3
+    assert profile.fields["tags"].presence(profile) == 3 / 4
+    assert profile.fields["tags"].items.type_name == "mixed"
+
+
+def test_map_columns_from_profile():
+    generator = MongoGenerator(host_settings="localhost", databases="db")
+    generator.set_oddrn_paths(collections="users")
+
+    fields = map_columns(FieldProfile().add_documents(DOCUMENTS), generator)
+
+    by_oddrn = {field.oddrn.split("/collections/users/")[1]: field for field in fields}
+    assert list(by_oddrn) == [
+        "columns/_id",
+        "columns/count",
+        "columns/address",
+        "columns/address/subcolumns/city",
+        "columns/address/subcolumns/zip",
+        "columns/tags",
+        "columns/tags/subcolumns/Values",
+        "columns/tags/subcolumns/Values/subcolumns/k",
+    ]
+    assert by_oddrn["columns/_id"].is_primary_key
+    assert by_oddrn["columns/count"].type.type == Type.TYPE_NUMBER
+    assert by_oddrn["columns/tags"].type.is_nullable
+    assert by_oddrn["columns/tags"].metadata[0].metadata["presence"] == 0.75
+    assert str(by_oddrn["columns/tags"].metadata[0].schema_url) == (
+        f"{SCHEMA_FILE_URL}#/definitions/MongodbDataSetExtension"
+    )
@@ -327,3 +327,26 @@ def test_adapter(
     assert schema_entity.oddrn in database_entity.data_entity_group.entities_list
     for table_entity in table_entities:
         assert table_entity.oddrn in schema_entity.data_entity_group.entities_list
+
+
+def test_get_pipes_joins_stages_by_full_name(
+    raw_pipes: list[RawPipe], raw_stages: list[RawStage]
+):
+    orphan = RawPipe(
+        pipe_catalog=DATABASE_NAME,
+        pipe_schema=SCHEMA,
+        pipe_name="ORPHAN_PIPE",
+        definition=f"COPY INTO {TABLE_NAME}\nFROM @missing_stage\nFILE_FORMAT = (TYPE = 'CSV')",
+    )
+    other_stage = RawStage(
+        stage_name="OTHER_STAGE",
+        stage_catalog=DATABASE_NAME,
+        stage_schema=SCHEMA,
+        stage_url="s3://bucket/path/",
+        stage_type="External Named",
+    )
+
+    pipes = list(Adapter._get_pipes([*raw_pipes, orphan], [other_stage, *raw_stages]))
+
+    assert [pipe.name for pipe in pipes] == [FIRST_PIPE, SECOND_PIPE]
+    assert all(pipe.stage_type == "Internal Named" for pipe in pipes)
@@ -0,0 +1,130 @@
+from timeit import default_timer as timer
+
+import pytest
+from odd_collector.adapters.snowflake.client import SnowflakeClient
+from odd_collector.adapters.snowflake.domain import Column, Table
+
+COLUMNS_PER_TABLE = 25
+
+
+def make_table(schema: str, name: str, clustering_key=None) -> Table:
+    return Table(
+        table_catalog="DB",
+        table_schema=schema,
+        table_name=name,
+        table_type="BASE TABLE",
+        clustering_key=clustering_key,
+    )
+
+
+def make_column(schema: str, table: str, name: str) -> Column:
+    return Column(
+        table_catalog="DB", table_schema=schema, table_name=table, column_name=name
+    )
+
+
+def test_attach_columns_keys_tables_by_schema():
+    tables = [
+        make_table("PUBLIC", "USERS", clustering_key="LINEAR(CREATED_AT)"),
+        make_table("STAGING", "USERS"),
+    ]
+    columns = [
+        make_column(schema, "USERS", name)
+        for schema in ("PUBLIC", "STAGING")
+        for name in ("ID", "EMAIL", "CREATED_AT")
+    ]
+    primary_keys = {
+        ("DB", "PUBLIC", "USERS"): {"ID"},
+        ("DB", "STAGING", "USERS"): {"EMAIL"},
+    }
+
+    SnowflakeClient._attach_columns(
+        tables, columns, primary_keys, SnowflakeClient._get_clustering_keys(tables)
+    )
+
+    public, staging = tables
+    assert [c.table_schema for c in public.columns] == ["PUBLIC"] * 3
+    assert [c.column_name for c in public.columns if c.is_primary_key] == ["ID"]
+    assert [c.column_name for c in public.columns if c.is_clustering_key] == [
+        "CREATED_AT"
+    ]
+    assert [c.table_schema for c in staging.columns] == ["STAGING"] * 3
+    assert [c.column_name for c in staging.columns if c.is_primary_key] == ["EMAIL"]
+    assert not any(c.is_clustering_key for c in staging.columns)
+
+
+class CountingDict(dict):
+    """Dict counting lookups of its keys."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lookups = 0
+
+    def get(self, key, default=None):
+        self.lookups += 1
+        return super().get(key, default)
+
+
+def synthetic_catalog(columns_count: int):
+    tables_count = columns_count // COLUMNS_PER_TABLE
+    tables = [
+        Table.model_construct(
+            table_catalog="DB",
+            table_schema=f"S{i % 10}",
+            table_name=f"T{i}",
+            columns=[],
+        )
+        for i in range(tables_count)
+    ]
+    columns = [
+        Column.model_construct(
+            table_catalog="DB",
+            table_schema=f"S{i % 10}",
+            table_name=f"T{i}",
+            column_name=f"C{j}",
+            is_primary_key=False,
+            is_clustering_key=False,
+        )
+        for i in range(tables_count)
+        for j in range(COLUMNS_PER_TABLE)
+    ]
+    primary_keys = CountingDict(
+        {("DB", f"S{i % 10}", f"T{i}"): {"C0"} for i in range(tables_count)}
+    )
+    return tables, columns, primary_keys
+
+
+@pytest.mark.parametrize("columns_count", [1_000, 10_000])
+def test_attach_columns_looks_up_keys_once_per_column(columns_count):
+    tables, columns, primary_keys = synthetic_catalog(columns_count)
+    clustering_keys = CountingDict()
+
+    SnowflakeClient._attach_columns(tables, columns, primary_keys, clustering_keys)
+
+    assert sum(len(table.columns) for table in tables) == columns_count
+    assert all(table.columns[0].is_primary_key for table in tables)
+    assert all(
+        column.table_name == table.table_name
+        for table in tables
+        for column in table.columns
+    )
+    # keys are looked up by (catalog, schema, table) of each column,
+    # tables aren't scanned for every column
+    assert primary_keys.lookups == columns_count
+    assert clustering_keys.lookups == columns_count
+
+
+def attach_seconds(columns_count: int) -> float:
+    tables, columns, primary_keys = synthetic_catalog(columns_count)
+    start = timer()
+    SnowflakeClient._attach_columns(tables, columns, primary_keys, {})
+    return timer() - start
+
+
+@pytest.mark.slow
+def test_attach_columns_scales_linearly():
+    small, large = attach_seconds(100_000), attach_seconds(1_000_000)
+
+    # 10 times more columns take about 10 times longer, scanning all columns
+    # for every table would take about 100 times longer
+    assert large < small * 30
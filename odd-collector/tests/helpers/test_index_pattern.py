@@ -0,0 +1,72 @@
+from odd_collector.helpers.index_pattern import IndexPatternMatcher
+
+INDICES = [
+    "logs-2024.01",
+    "logs-2024.02",
+    "logs",
+    "logs_archive",
+    "metrics-app",
+    ".ds-logs-2024.01-000001",
+    "app-logs-prod",
+]
+
+
+def test_match_wildcards():
+    matcher = IndexPatternMatcher(INDICES)
+
+    assert matcher.match(["logs-*"]) == ["logs-2024.01", "logs-2024.02"]
+    assert matcher.match(["logs*"]) == [
+        "logs",
+        "logs-2024.01",
+        "logs-2024.02",
+        "logs_archive",
+    ]
+    assert matcher.match(["*-logs-*"]) == ["app-logs-prod"]
+    assert matcher.match(["logs-*.02", "metrics-*"]) == ["logs-2024.02", "metrics-app"]
+
+
+def test_match_exact_names_and_comma_separated_patterns():
+    matcher = IndexPatternMatcher(INDICES)
+
+    assert matcher.match("logs,metrics-app,missing") == ["logs", "metrics-app"]
+    assert matcher.match("log") == []
+
+
+def test_wildcards_skip_dot_indices_unless_pattern_starts_with_dot():
+    matcher = IndexPatternMatcher(INDICES)
+
+    assert ".ds-logs-2024.01-000001" not in matcher.match(["*"])
+    assert matcher.match([".ds-*"]) == [".ds-logs-2024.01-000001"]
+
+
+def test_regex_characters_are_literals():
+    matcher = IndexPatternMatcher(["logs-2024.01", "logs-2024x01"])
+
+    assert matcher.match(["logs-2024.*"]) == ["logs-2024.01"]
+
+
+def test_data_streams_and_aliases_are_expanded_to_their_indices():
+    data_streams = [
+        {
+            "name": "logs-app",
+            "indices": [
+                {"index_name": ".ds-logs-app-2024.01.01-000001"},
+                {"index_name": ".ds-logs-app-2024.01.02-000002"},
+            ],
+        }
+    ]
+    matcher = IndexPatternMatcher(
+        [*INDICES, ".ds-logs-app-2024.01.01-000001", ".ds-logs-app-2024.01.02-000002"],
+        data_streams,
+        {"current-metrics": ["metrics-app"]},
+    )
+
+    assert matcher.match(["logs-app*"]) == [
+        ".ds-logs-app-2024.01.01-000001",
+        ".ds-logs-app-2024.01.02-000002",
+    ]
+    assert matcher.match("logs-app") == [
+        ".ds-logs-app-2024.01.01-000001",
+        ".ds-logs-app-2024.01.02-000002",
+    ]
+    assert matcher.match(["current-*"]) == ["metrics-app"]
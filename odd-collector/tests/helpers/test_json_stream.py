@@ -0,0 +1,53 @@
+import io
+import json
+
+import pytest
+from odd_collector.helpers.json_stream import JsonStream, iter_sections
+
+DOCUMENT = {
+    "metadata": {"generated_at": "2023-01-01T00:00:00Z"},
+    "nodes": {
+        "model.a": {"name": "a", "columns": {"id": {"type": "INT"}}},
+        "model.b": {"name": 'b \\u00e9 " {', "rows": 12345678901234567890},
+    },
+    "empty": {},
+    "parent_map": {"model.b": ["model.a"]},
+    "version": 7,
+    "ratio": 1.5e-3,
+    "tags": [1.5, True, None],
+}
+
+
+def test_sections_are_iterated_member_by_member():
+    stream = io.StringIO(json.dumps(DOCUMENT, indent=2))
+
+    assert list(iter_sections(stream, {"nodes", "parent_map", "empty"})) == [
+        ("metadata", None, DOCUMENT["metadata"]),
+        ("nodes", "model.a", DOCUMENT["nodes"]["model.a"]),
+        ("nodes", "model.b", DOCUMENT["nodes"]["model.b"]),
+        ("parent_map", "model.b", ["model.a"]),
+        ("version", None, 7),
+        ("ratio", None, 1.5e-3),
+        ("tags", None, [1.5, True, None]),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64])
+def test_values_split_between_chunks_are_decoded(chunk_size):
+    stream = io.StringIO(json.dumps(DOCUMENT))
+    reader = JsonStream(stream, chunk_size=chunk_size)
+
+    assert {key: reader.value() for key in reader.members()} == DOCUMENT
+
+
+def test_top_level_float_split_between_chunks_is_decoded():
+    reader = JsonStream(io.StringIO('{"a": 1.5, "b": 2}'), chunk_size=8)
+
+    assert {key: reader.value() for key in reader.members()} == {"a": 1.5, "b": 2}
+
+
+def test_truncated_document_raises():
+    stream = io.StringIO(json.dumps(DOCUMENT)[:-20])
+
+    with pytest.raises(ValueError):
+        list(iter_sections(stream, {"nodes"}))